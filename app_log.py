@@ -0,0 +1,39 @@
+import logging
+import logging.handlers
+
+LOG_FILE = "git_app.log"
+LOG_MAX_BYTES = 2 * 1024 * 1024
+LOG_BACKUPS = 3
+
+logger = logging.getLogger("git_app")
+logger.setLevel(logging.DEBUG)
+logger.propagate = False
+
+
+def setup_logging(path=LOG_FILE, console_level=logging.INFO):
+    """Konsola və fırlanan fayla səviyyəli jurnal yazmağı qurur; təkrar çağırış təsirsizdir."""
+    if logger.handlers: return
+    console = logging.StreamHandler()
+    console.setLevel(console_level)
+    console.setFormatter(logging.Formatter("[LOG] %(message)s"))
+    logger.addHandler(console)
+    try:
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+    except OSError as e:
+        logger.warning(f"!!! JURNAL FAYLI AÇILMADI: {e}")
+        return
+    handler.setLevel(logging.DEBUG)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(threadName)s] %(message)s"))
+    logger.addHandler(handler)
+
+
+def log(message, level=None, **fields):
+    """Jurnala yazır. Səviyyə verilməyibsə "!!!" ilə başlayan mesajlar xəbərdarlıq sayılır;
+    əlavə sahələr mesajın sonuna `açar=dəyər` şəklində qoşulur."""
+    if level is None: level = logging.WARNING if message.startswith("!!!") else logging.INFO
+    if fields: message = f"{message} " + " ".join(f"{key}={value}" for key, value in fields.items())
+    if logger.handlers:
+        logger.log(level, message)
+    elif level >= logging.INFO:
+        # Jurnal qurulmayıbsa (skriptlər, yoxlamalar) əvvəlki kimi konsola yazılır
+        print(f"[LOG] {message}")
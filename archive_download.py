@@ -0,0 +1,229 @@
+import os
+import json
+import time
+import threading
+import subprocess
+from app_log import log
+from lazy_import import lazy_module
+from instrumentation import span
+
+requests = lazy_module("requests")
+urllib3 = lazy_module("urllib3")
+git = lazy_module("git")
+
+MIN_CHUNK = 16 * 1024
+MAX_CHUNK = 4 * 1024 * 1024
+TARGET_CHUNK_SECONDS = 0.1
+PROGRESS_INTERVAL = 0.25
+MAX_RETRIES = 5
+
+
+class DownloadCancelled(Exception):
+    pass
+
+
+def format_bytes(count):
+    for unit in ("B", "KB", "MB", "GB"):
+        if count < 1024 or unit == "GB": break
+        count /= 1024
+    return f"{count:.1f} {unit}" if unit != "B" else f"{int(count)} B"
+
+
+class ResumableDownload:
+    """Yarımçıq `.part` faylına HTTP Range ilə davam edən, ləğv edilə bilən arxiv endirməsi.
+
+    Bitdikdə `.part` faylı atomik olaraq hədəf adına köçürülür. Bağlantı qırılarsa,
+    artıq endirilmiş baytlar saxlanılır və endirmə həmin yerdən davam edir."""
+
+    def __init__(self, client, url, dest_path, on_progress=None, max_retries=MAX_RETRIES):
+        self.client = client
+        self.url = url
+        self.dest_path = dest_path
+        self.part_path = f"{dest_path}.part"
+        self.meta_path = f"{dest_path}.part.json"
+        self.on_progress = on_progress
+        self.max_retries = max_retries
+        self.chunk_size = MIN_CHUNK * 4
+        self.done = 0
+        self.total = None
+        self.rate = 0.0
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def run(self):
+        attempt = 0
+        while True:
+            try:
+                self._download_once()
+                break
+            except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError,
+                    requests.exceptions.Timeout, urllib3.exceptions.HTTPError) as e:
+                attempt += 1
+                if attempt > self.max_retries: raise
+                delay = min(2 ** (attempt - 1), 30)
+                log(f"Endirmə kəsildi ({e}), {delay} san. sonra {format_bytes(self.done)}-dan davam ediləcək...")
+                if self._cancel.wait(delay): raise DownloadCancelled()
+        os.replace(self.part_path, self.dest_path)
+        if os.path.exists(self.meta_path): os.remove(self.meta_path)
+
+    def _read_meta(self):
+        try:
+            with open(self.meta_path, "r") as f:
+                meta = json.load(f)
+            return meta if meta.get("url") == self.url else {}
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _matches_server(response, meta, size):
+        """416 cavabındakı `Content-Range: bytes */ümumi` və ETag (varsa) saxlanılmış fayla uyğundurmu."""
+        total = response.headers.get("Content-Range", "").rpartition("/")[2]
+        if total.isdigit() and int(total) != size: return False
+        etag = response.headers.get("ETag")
+        return not (etag and meta.get("etag") and etag != meta["etag"])
+
+    def _discard_partial(self):
+        for path in (self.part_path, self.meta_path):
+            if os.path.exists(path): os.remove(path)
+
+    def _download_once(self):
+        meta = self._read_meta()
+        offset = os.path.getsize(self.part_path) if meta and os.path.exists(self.part_path) else 0
+        headers = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            # Server tərəfdə fayl dəyişibsə, Range nəzərə alınmır və tam cavab gəlir
+            if meta.get("etag"): headers["If-Range"] = meta["etag"]
+
+        with self.client.stream(self.url, headers=headers) as response:
+            if response.status_code == 416 and offset:
+                # .part faylı yalnız həcmi gözlənilən ümumi həcmə bərabərdirsə tamdır; əks halda (arxiv
+                # serverdə dəyişib və ya metadata köhnədir) yarımçıq fayl atılır və endirmə sıfırdan başlayır
+                if meta.get("total") == offset and self._matches_server(response, meta, offset):
+                    self.done = self.total = offset
+                    return
+                log("Yarımçıq endirmə serverdəki arxivə uyğun gəlmir, endirmə əvvəldən başlayır.")
+                self._discard_partial()
+                response.close()
+                return self._download_once()
+            response.raise_for_status()
+            if offset and response.status_code != 206:
+                log("Server Range sorğusunu dəstəkləmir, endirmə əvvəldən başlayır.")
+                offset = 0
+            length = response.headers.get("Content-Length")
+            self.total = offset + int(length) if length and length.isdigit() else None
+            with open(self.meta_path, "w") as f:
+                json.dump({"url": self.url, "etag": response.headers.get("ETag"), "total": self.total}, f)
+
+            self.done = offset
+            with open(self.part_path, "ab" if offset else "wb") as f:
+                last_report = 0.0
+                while True:
+                    if self._cancel.is_set(): raise DownloadCancelled()
+                    started = time.perf_counter()
+                    chunk = response.raw.read(self.chunk_size, decode_content=True)
+                    if not chunk: break
+                    f.write(chunk)
+                    self.done += len(chunk)
+                    self._adapt(len(chunk), time.perf_counter() - started)
+                    now = time.perf_counter()
+                    if self.on_progress and now - last_report >= PROGRESS_INTERVAL:
+                        last_report = now
+                        self.on_progress(self)
+        if self.on_progress: self.on_progress(self)
+
+    def _adapt(self, size, seconds):
+        # Sürət EWMA ilə hamarlanır; blok ölçüsü ~0.1 san.-lik məlumata uyğunlaşdırılır
+        if seconds <= 0: return
+        sample = size / seconds
+        self.rate = sample if not self.rate else self.rate * 0.8 + sample * 0.2
+        target = int(self.rate * TARGET_CHUNK_SECONDS)
+        self.chunk_size = max(MIN_CHUNK, min(MAX_CHUNK, 1 << max(0, target.bit_length() - 1)))
+
+    def eta(self):
+        if not self.total or not self.rate: return None
+        return max(0.0, (self.total - self.done) / self.rate)
+
+    def describe(self):
+        text = f"{format_bytes(self.done)}"
+        if self.total: text += f" / {format_bytes(self.total)}"
+        text += f" - {format_bytes(self.rate)}/s"
+        eta = self.eta()
+        if eta is not None: text += f", qalıb ~{int(eta)} san."
+        return text
+
+
+class LocalArchiveExport:
+    """Lokal anbarda olan commit üçün `git archive` çıxışını birbaşa `.part` faylına axıdır.
+
+    ResumableDownload ilə eyni interfeysə (run/cancel/describe) malikdir; şəbəkə istifadə olunmur."""
+
+    def __init__(self, repo_path, sha, dest_path, prefix="", on_progress=None):
+        self.repo_path = repo_path
+        self.sha = sha
+        self.dest_path = dest_path
+        self.part_path = f"{dest_path}.part"
+        self.prefix = prefix
+        self.on_progress = on_progress
+        self.done = 0
+        self.total = None
+        self.rate = 0.0
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def run(self):
+        with span("git", "archive") as fields:
+            try:
+                self._export()
+            finally:
+                fields["bytes"] = self.done
+
+    def _export(self):
+        args = [git.Git.GIT_PYTHON_GIT_EXECUTABLE or "git", "-C", self.repo_path, "archive", "--format=zip"]
+        if self.prefix: args.append(f"--prefix={self.prefix}")
+        args.append(self.sha)
+        process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.DEVNULL,
+                                   creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+        started = last_report = time.perf_counter()
+        try:
+            with open(self.part_path, "wb") as f:
+                while True:
+                    if self._cancel.is_set(): raise DownloadCancelled()
+                    chunk = process.stdout.read1(MAX_CHUNK)
+                    if not chunk: break
+                    f.write(chunk)
+                    self.done += len(chunk)
+                    now = time.perf_counter()
+                    self.rate = self.done / max(now - started, 1e-6)
+                    if self.on_progress and now - last_report >= PROGRESS_INTERVAL:
+                        last_report = now
+                        self.on_progress(self)
+            status = process.wait()
+            if status != 0:
+                raise git.exc.GitCommandError(args, status, process.stderr.read())
+        except BaseException:
+            if os.path.exists(self.part_path): os.remove(self.part_path)
+            raise
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            process.stderr.close()
+        os.replace(self.part_path, self.dest_path)
+        if self.on_progress: self.on_progress(self)
+
+    def describe(self):
+        return f"{format_bytes(self.done)} - {format_bytes(self.rate)}/s"
@@ -0,0 +1,129 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from app_log import log
+from lazy_import import lazy_module
+from pull_options import DEFAULT_PULL_OPTIONS, fetch_kwargs, is_first_sync, pull_with_options
+
+git = lazy_module("git")
+
+REMOTE_NAME = "hədəf_depo"
+BATCH_WORKERS = 8
+
+ACTION_PULL = "pull"
+ACTION_PUSH = "push"
+ACTION_FETCH = "fetch"
+ACTION_TITLES = {ACTION_PULL: "Pull", ACTION_PUSH: "Commit + Push", ACTION_FETCH: "Fetch"}
+
+STATE_WAITING = "Gözləyir"
+STATE_RUNNING = "İcrada"
+STATE_OK = "Uğurlu"
+STATE_SKIPPED = "Ötürüldü"
+STATE_FAILED = "Xəta"
+
+
+def make_mapping(path, repo_data):
+    """Lokal qovluq ↔ GitHub deposu cütü (konfiqurasiyada saxlanılan forma)."""
+    return {"path": os.path.abspath(path), "full_name": repo_data['full_name'], "clone_url": repo_data['clone_url'],
+            "branch": repo_data.get('default_branch') or "main"}
+
+
+def ensure_remote(repo, url, name=REMOTE_NAME):
+    """Hədəf remote-u yaradır və ya URL-ni yeniləyir."""
+    if name in [r.name for r in repo.remotes]:
+        remote = repo.remote(name=name)
+        if remote.url != url: remote.set_url(url)
+        return remote
+    return repo.create_remote(name, url)
+
+
+def run_mapping_action(mapping, action, message="", options=None, identity=None):
+    """Bir cüt üzərində əməliyyatı icra edir; (vəziyyət, izah) qaytarır. İstisnaları çağırana ötürür.
+
+    `options` - deponun pull ayarları (bax: pull_options); `identity` - commit üçün (ad, e-poçt)."""
+    options = options or DEFAULT_PULL_OPTIONS
+    repo = git.Repo(mapping['path'])
+    try:
+        remote = ensure_remote(repo, mapping['clone_url'])
+        branch = mapping.get('branch') or "main"
+        if action == ACTION_FETCH:
+            remote.fetch(branch, **fetch_kwargs(options, is_first_sync(repo)))
+            behind = repo.git.rev_list('--count', f"HEAD..{REMOTE_NAME}/{branch}")
+            return STATE_OK, f"{behind} yeni commit" if behind != "0" else "Yenidir"
+        if action == ACTION_PULL:
+            before, after = pull_with_options(repo, remote, branch, options)
+            return STATE_OK, "Yenidir" if before == after else f"{before[:8] if before else '∅'} → {after[:8]}"
+        if action == ACTION_PUSH:
+            repo.git.add(A=True)
+            committed = False
+            if not repo.head.is_valid() or repo.is_dirty(index=True, working_tree=False):
+                if not message: return STATE_SKIPPED, "Commit mesajı yoxdur"
+                user_name, user_email = identity or ("", "")
+                if not user_name or not user_email:
+                    return STATE_FAILED, "Git istifadəçi adı və e-poçtu təyin edilməyib"
+                # Əsas pəncərədəki commit kimi: istifadəçi məlumatları deponun konfiqurasiyasına yazılır
+                with repo.config_writer() as cw:
+                    cw.set_value("user", "name", user_name)
+                    cw.set_value("user", "email", user_email)
+                repo.index.commit(message)
+                committed = True
+            for info in remote.push(refspec=f"HEAD:{branch}", set_upstream=True):
+                if info.flags & (info.ERROR | info.REJECTED):
+                    return STATE_FAILED, f"Rədd edildi: {info.summary.strip()}"
+            return STATE_OK, "Commit edildi və göndərildi" if committed else "Göndərildi (yeni commit yoxdur)"
+        raise ValueError(f"Naməlum əməliyyat: {action}")
+    finally:
+        repo.close()
+
+
+class BatchRun:
+    """Cütlər üzərində eyni əməliyyatı məhdud işçi hovuzunda paralel icra edir.
+
+    Hər depo üçün `on_update(mapping, vəziyyət, izah)`, sonda `on_done(xülasə)` çağırılır;
+    hər ikisi işçi thread-lərindən çağırılır."""
+
+    def __init__(self, mappings, action, message="", on_update=None, on_done=None, max_workers=BATCH_WORKERS,
+                 options_for=None, identity=None):
+        self.mappings = list(mappings)
+        self.action = action
+        self.message = message
+        self.on_update = on_update
+        self.on_done = on_done
+        self.max_workers = max_workers
+        self.options_for = options_for
+        self.identity = identity
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _notify(self, mapping, state, detail=""):
+        if self.on_update: self.on_update(mapping, state, detail)
+
+    def _run_one(self, mapping):
+        if self._cancel.is_set():
+            return STATE_SKIPPED, "Ləğv edildi"
+        self._notify(mapping, STATE_RUNNING)
+        try:
+            options = self.options_for(mapping['full_name']) if self.options_for else None
+            return run_mapping_action(mapping, self.action, self.message, options, self.identity)
+        except git.exc.GitCommandError as e:
+            detail = (e.stderr or str(e)).strip().splitlines()
+            return STATE_FAILED, detail[-1] if detail else str(e)
+        except Exception as e:
+            return STATE_FAILED, f"{type(e).__name__}: {e}"
+
+    def run(self):
+        summary = {STATE_OK: 0, STATE_SKIPPED: 0, STATE_FAILED: 0}
+        for mapping in self.mappings:
+            self._notify(mapping, STATE_WAITING)
+        # Hər depo öz git prosesini işlədir - ümumi müddət ən yavaş depo qədər olur
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, max(1, len(self.mappings)))) as pool:
+            futures = {pool.submit(self._run_one, mapping): mapping for mapping in self.mappings}
+            for future in as_completed(futures):
+                state, detail = future.result()
+                summary[state] += 1
+                log(f"Toplu {self.action}: {futures[future]['full_name']} -> {state} ({detail})")
+                self._notify(futures[future], state, detail)
+        if self.on_done: self.on_done(summary)
+        return summary
@@ -0,0 +1,131 @@
+import os
+import customtkinter as ctk
+from tkinter import filedialog, messagebox, ttk
+from batch_sync import ACTION_PULL, ACTION_PUSH, ACTION_FETCH, ACTION_TITLES, STATE_OK, STATE_SKIPPED, STATE_FAILED
+
+
+class BatchSyncWindow(ctk.CTkToplevel):
+    """Lokal qovluq ↔ GitHub deposu cütlərini idarə edən və toplu əməliyyatın gedişini göstərən pəncərə."""
+
+    def __init__(self, master, functions):
+        super().__init__(master)
+        self.functions = functions
+        self.title("Toplu Sinxronizasiya")
+        self.geometry("900x520")
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        add_frame = ctk.CTkFrame(self)
+        add_frame.grid(row=0, column=0, padx=15, pady=(15, 5), sticky="ew")
+        add_frame.grid_columnconfigure(1, weight=1)
+        ctk.CTkLabel(add_frame, text="GitHub deposu:").grid(row=0, column=0, padx=(10, 5), pady=10)
+        self.repo_combo = ctk.CTkComboBox(add_frame, values=sorted(functions._shown_repos))
+        self.repo_combo.set("")
+        self.repo_combo.grid(row=0, column=1, sticky="ew", pady=10)
+        ctk.CTkButton(add_frame, text="Qovluq Seç və Əlavə Et...", command=self._add_mapping).grid(row=0, column=2, padx=10)
+        ctk.CTkButton(add_frame, text="Seçilənləri Sil", command=self._remove_selected).grid(row=0, column=3, padx=(0, 10))
+
+        table_frame = ctk.CTkFrame(self, fg_color="transparent")
+        table_frame.grid(row=1, column=0, padx=15, pady=5, sticky="nsew")
+        table_frame.grid_columnconfigure(0, weight=1)
+        table_frame.grid_rowconfigure(0, weight=1)
+        columns = ("path", "repo", "branch", "state", "detail")
+        self.table = ttk.Treeview(table_frame, columns=columns, show="headings", selectmode="extended")
+        for column, text, width, stretch in (("path", "Lokal Qovluq", 220, True), ("repo", "GitHub Deposu", 180, False),
+                                             ("branch", "Filial", 70, False), ("state", "Vəziyyət", 80, False),
+                                             ("detail", "Nəticə", 250, True)):
+            self.table.heading(column, text=text)
+            self.table.column(column, width=width, stretch=stretch)
+        self.table.grid(row=0, column=0, sticky="nsew")
+        scrollbar = ctk.CTkScrollbar(table_frame, command=self.table.yview)
+        scrollbar.grid(row=0, column=1, sticky="ns")
+        self.table.configure(yscrollcommand=scrollbar.set)
+        self.table.tag_configure(STATE_OK, foreground="lightgreen")
+        self.table.tag_configure(STATE_SKIPPED, foreground="orange")
+        self.table.tag_configure(STATE_FAILED, foreground="tomato")
+
+        action_frame = ctk.CTkFrame(self)
+        action_frame.grid(row=2, column=0, padx=15, pady=(5, 15), sticky="ew")
+        action_frame.grid_columnconfigure(0, weight=1)
+        self.message_entry = ctk.CTkEntry(action_frame, placeholder_text="Commit + Push üçün ümumi commit mesajı...")
+        self.message_entry.grid(row=0, column=0, columnspan=4, sticky="ew", padx=10, pady=(10, 5))
+        self.summary_label = ctk.CTkLabel(action_frame, text="Əməliyyat seçilmiş cütlərə (seçim yoxdursa, hamısına) tətbiq olunur.",
+                                          text_color="gray", anchor="w")
+        self.summary_label.grid(row=1, column=0, sticky="ew", padx=10, pady=(0, 10))
+        self.action_buttons = []
+        for column, action in enumerate((ACTION_FETCH, ACTION_PULL, ACTION_PUSH), start=1):
+            button = ctk.CTkButton(action_frame, text=ACTION_TITLES[action], width=120, command=lambda a=action: self._start(a))
+            button.grid(row=1, column=column, padx=(0, 10), pady=(0, 10))
+            self.action_buttons.append(button)
+
+        for mapping in functions.config.get("batch_mappings", []):
+            self._insert(mapping)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _on_close(self):
+        # Pəncərə bağlananda hələ başlamamış depolar ötürülür, icrada olanlar tamamlanır
+        self.functions.cancel_batch()
+        self.destroy()
+
+    def _insert(self, mapping):
+        if self.table.exists(mapping['path']): return
+        self.table.insert("", "end", iid=mapping['path'],
+                          values=(mapping['path'], mapping['full_name'], mapping.get('branch', "main"), "", ""))
+
+    def _mappings(self, selected_only=False):
+        paths = self.table.selection() if selected_only else ()
+        paths = paths or self.table.get_children()
+        known = {m['path']: m for m in self.functions.config.get("batch_mappings", [])}
+        return [known[path] for path in paths if path in known]
+
+    def _add_mapping(self):
+        path = filedialog.askdirectory(parent=self, title="Lokal Git Anbarını Seçin")
+        if not path: return
+        if not os.path.isdir(os.path.join(path, ".git")):
+            messagebox.showerror("Xəta", "Seçilmiş qovluq Git anbarı deyil.", parent=self)
+            return
+        full_name = self.repo_combo.get().strip()
+        if not full_name:
+            # Depo seçilməyibsə qovluq adı ilə eyni adlı depo axtarılır
+            name = os.path.basename(os.path.normpath(path)).lower()
+            full_name = next((fn for fn, r in self.functions._shown_repos.items() if r['name'].lower() == name), "")
+        repo_data = self.functions._shown_repos.get(full_name)
+        if not repo_data:
+            messagebox.showwarning("Depo Tapılmadı", "Siyahıdan bir GitHub deposu seçin.", parent=self)
+            return
+        self._insert(self.functions.add_batch_mapping(path, repo_data))
+
+    def _remove_selected(self):
+        paths = self.table.selection()
+        if not paths: return
+        self.functions.remove_batch_mappings(paths)
+        self.table.delete(*paths)
+
+    def _start(self, action):
+        mappings = self._mappings(selected_only=True)
+        if not mappings:
+            messagebox.showwarning("Cüt Yoxdur", "Əvvəlcə ən azı bir qovluq ↔ depo cütü əlavə edin.", parent=self)
+            return
+        message = self.message_entry.get().strip()
+        if action == ACTION_PUSH and not message:
+            messagebox.showwarning("Mesaj Yoxdur", "Commit + Push üçün commit mesajı yazın.", parent=self)
+            return
+        for button in self.action_buttons:
+            button.configure(state="disabled")
+        self.summary_label.configure(text=f"{ACTION_TITLES[action]}: {len(mappings)} depo icra olunur...", text_color="yellow")
+        self.functions.start_batch(mappings, action, message)
+
+    # --- GitFunctions-un UI növbəsindən çağırılır ---
+    def update_row(self, mapping, state, detail):
+        if not self.winfo_exists() or not self.table.exists(mapping['path']): return
+        values = (mapping['path'], mapping['full_name'], mapping.get('branch', "main"), state, detail)
+        self.table.item(mapping['path'], values=values, tags=(state,))
+
+    def show_summary(self, action, summary, seconds):
+        if not self.winfo_exists(): return
+        for button in self.action_buttons:
+            button.configure(state="normal")
+        color = "tomato" if summary[STATE_FAILED] else "lightgreen"
+        self.summary_label.configure(
+            text=f"{ACTION_TITLES[action]} bitdi ({seconds:.1f} san.): {summary[STATE_OK]} uğurlu, "
+                 f"{summary[STATE_SKIPPED]} ötürüldü, {summary[STATE_FAILED]} xəta", text_color=color)
@@ -0,0 +1,176 @@
+import re
+import json
+import time
+import hashlib
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# Həqiqi API cavablarının ölçüsünə yaxınlaşmaq üçün əlavə URL sahələri
+_REPO_URL_FIELDS = ("archive", "assignees", "blobs", "branches", "collaborators", "comments", "commits", "compare",
+                    "contents", "contributors", "deployments", "downloads", "events", "forks", "git_commits", "git_refs",
+                    "git_tags", "hooks", "issue_comment", "issue_events", "issues", "keys", "labels", "languages",
+                    "merges", "milestones", "notifications", "pulls", "releases", "stargazers", "statuses",
+                    "subscribers", "subscription", "tags", "teams", "trees")
+
+_COMMITS_RE = re.compile(r"^/repos/([^/]+)/([^/]+)/commits$")
+_ZIPBALL_RE = re.compile(r"^/repos/([^/]+)/([^/]+)/zipball/([^/]+)$")
+
+
+def commit_sha(repo_name, index):
+    return hashlib.sha1(f"{repo_name}:{index}".encode()).hexdigest()
+
+
+class FakeGitHub:
+    """`/user/repos`, `/repos/{o}/{r}/commits` və `/repos/{o}/{r}/zipball/{sha}` cavablarını təqlid edən yerli server.
+
+    Ölçülər (depo sayı, commit sayı, arxiv ölçüsü) və hər sorğunun gecikməsi konfiqurasiya olunur;
+    ETag/304, `Link` səhifələməsi, Range və `X-RateLimit-*` başlıqları dəstəklənir."""
+
+    def __init__(self, repos=100, commits=1000, zip_bytes=1024 * 1024, latency_ms=0, owner="bench", port=0):
+        self.port = port
+        self.repo_count = repos
+        self.commit_count = commits
+        self.zip_bytes = zip_bytes
+        self.latency = latency_ms / 1000
+        self.owner = owner
+        self.request_count = 0
+        self._sha_index = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self.url = None
+
+    def __enter__(self):
+        handler = type("Handler", (_Handler,), {"fake": self})
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, name="fake-github", daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    # --- Məlumat ---
+    def repo(self, index):
+        name = f"repo-{index:05d}"
+        full_name = f"{self.owner}/{name}"
+        base = f"{self.url}/repos/{full_name}"
+        data = {
+            "id": index, "name": name, "full_name": full_name, "private": index % 3 == 0,
+            "owner": {"login": self.owner, "id": 1, "url": f"{self.url}/users/{self.owner}"},
+            "html_url": f"https://github.com/{full_name}", "clone_url": f"https://github.com/{full_name}.git",
+            "commits_url": f"{base}/commits{{/sha}}", "default_branch": "main",
+            "pushed_at": "2024-01-01T00:00:00Z", "updated_at": "2024-01-01T00:00:00Z",
+            "description": f"Benchmark deposu {index}", "size": 1024, "stargazers_count": index % 50,
+        }
+        for field in _REPO_URL_FIELDS:
+            data[f"{field}_url"] = f"{base}/{field}"
+        return data
+
+    def commit(self, repo_name, index):
+        sha = commit_sha(repo_name, index)
+        parents = [{"sha": commit_sha(repo_name, index + 1)}] if index + 1 < self.commit_count else []
+        date = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(1_700_000_000 - index * 600))
+        person = {"name": f"Müəllif {index % 17}", "email": f"author{index % 17}@example.com", "date": date}
+        return {"sha": sha, "url": f"{self.url}/repos/{self.owner}/{repo_name}/commits/{sha}",
+                "commit": {"message": f"Commit {index}: dəyişiklik\n\nƏtraflı təsvir {index}", "author": person,
+                           "committer": person, "comment_count": 0},
+                "author": {"login": f"author{index % 17}"}, "parents": parents}
+
+    def commit_index(self, repo_name, sha):
+        with self._lock:
+            index = self._sha_index.get(repo_name)
+            if index is None:
+                index = self._sha_index[repo_name] = {commit_sha(repo_name, i): i for i in range(self.commit_count)}
+        return index.get(sha)
+
+    def zip_body(self, sha):
+        block = hashlib.sha256(sha.encode()).digest() * 2048
+        return (block * (self.zip_bytes // len(block) + 1))[:self.zip_bytes]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    fake = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b"", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-RateLimit-Limit", "5000")
+        self.send_header("X-RateLimit-Remaining", "4999")
+        self.send_header("X-RateLimit-Reset", str(int(time.time()) + 3600))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, data, links=None, status=200):
+        body = json.dumps(data).encode()
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, headers={"ETag": etag})
+            return
+        headers = {"Content-Type": "application/json", "ETag": etag}
+        if links: headers["Link"] = ", ".join(f'<{url}>; rel="{rel}"' for rel, url in links.items())
+        self._send(status, body, headers)
+
+    def _page_links(self, path, params, page, last_page):
+        query = "&".join(f"{k}={v}" for k, v in params.items() if k != "page")
+        make = lambda p: f"{self.fake.url}{path}?{query}&page={p}"
+        links = {}
+        if page < last_page: links.update(next=make(page + 1), last=make(last_page))
+        if page > 1: links.update(prev=make(page - 1), first=make(1))
+        return links
+
+    def do_GET(self):
+        fake = self.fake
+        with fake._lock:
+            fake.request_count += 1
+        if fake.latency: time.sleep(fake.latency)
+        parsed = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        page = int(params.get("page", 1))
+        per_page = min(100, int(params.get("per_page", 30)))
+
+        if parsed.path == "/user/repos":
+            last_page = max(1, -(-fake.repo_count // per_page))
+            start = (page - 1) * per_page
+            repos = [fake.repo(i) for i in range(start, min(start + per_page, fake.repo_count))]
+            self._send_json(repos, self._page_links(parsed.path, params, page, last_page))
+            return
+
+        match = _COMMITS_RE.match(parsed.path)
+        if match:
+            repo_name = match.group(2)
+            first = 0
+            if params.get("sha"):
+                first = fake.commit_index(repo_name, params["sha"])
+                if first is None:
+                    self._send_json({"message": "No commit found for SHA"}, status=422)
+                    return
+            start = first + (page - 1) * per_page
+            end = min(start + per_page, fake.commit_count)
+            last_page = max(1, -(-(fake.commit_count - first) // per_page))
+            commits = [fake.commit(repo_name, i) for i in range(start, end)]
+            self._send_json(commits, self._page_links(parsed.path, params, page, last_page))
+            return
+
+        match = _ZIPBALL_RE.match(parsed.path)
+        if match:
+            body = fake.zip_body(match.group(3))
+            etag = f'"{match.group(3)}"'
+            range_header = self.headers.get("Range")
+            if range_header and self.headers.get("If-Range", etag) == etag:
+                start = int(range_header.split("=")[1].split("-")[0])
+                self._send(206, body[start:], {"ETag": etag, "Content-Type": "application/zip",
+                                               "Content-Range": f"bytes {start}-{len(body) - 1}/{len(body)}"})
+            else:
+                self._send(200, body, {"ETag": etag, "Content-Type": "application/zip"})
+            return
+
+        self._send_json({"message": "Not Found"}, status=404)
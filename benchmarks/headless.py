@@ -0,0 +1,140 @@
+import time
+from types import SimpleNamespace
+from history_view import VirtualHistoryTable
+from repo_sidebar import RepoSearchIndex
+
+TABLE_HEIGHT = 600
+
+
+class NullWidget:
+    """Çağırılan hər metodu qəbul edən, heç nə çəkməyən vidcet."""
+
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class HeadlessTree:
+    """VirtualHistoryTable-ın istifadə etdiyi Treeview metodlarının yaddaşdakı əvəzi."""
+
+    def __init__(self):
+        self.items = {}
+        self.attached = set()
+        self._selection = ()
+
+    def insert(self, parent, index, iid, values=()):
+        self.items[iid] = values
+        self.attached.add(iid)
+        return iid
+
+    def item(self, iid, values=None):
+        if values is not None: self.items[iid] = values
+        return {"values": self.items[iid]}
+
+    def reattach(self, iid, parent, index):
+        self.attached.add(iid)
+
+    def detach(self, iid):
+        self.attached.discard(iid)
+
+    def delete(self, *iids):
+        for iid in iids:
+            self.items.pop(iid, None)
+            self.attached.discard(iid)
+
+    def selection(self):
+        return self._selection
+
+    def selection_set(self, items):
+        self._selection = (items,) if isinstance(items, str) else tuple(items)
+
+    def focus(self, iid=None):
+        return iid
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def configure(self, **kwargs):
+        pass
+
+
+class HeadlessRepoList:
+    """VirtualRepoList-in məlumat hissəsi (indeks və süzgəc) - düymələr çəkilmir."""
+
+    def __init__(self):
+        self.index = RepoSearchIndex()
+        self.visible_ids = []
+        self.on_select = None
+        self.filter_text = ""
+
+    def set_repos(self, repos):
+        self.index.clear()
+        self.add_repos(repos)
+
+    def add_repos(self, repos):
+        self.index.add(repos)
+        self.apply_filter()
+
+    def apply_filter(self, keep_offset=False):
+        self.visible_ids = self.index.search(self.filter_text)
+
+
+class HeadlessApp:
+    """GitFunctions üçün ekransız tətbiq: vidcetlər boşdur, UI növbəsi `UILoop` tərəfindən boşaldılır."""
+
+    WIDGETS = ("status_bar", "queue_label", "rate_label", "connect_button", "source_label", "target_label",
+               "source_path_label", "selected_commit_label", "commit_message_entry", "user_name_entry",
+               "user_email_entry", "cancel_download_button", "graphql_checkbox", "worktree_panel", "push_state_label",
+               "commit_detail_pane", "detail_tabs", "history_search_label")
+
+    def __init__(self, token="bench-token"):
+        for name in self.WIDGETS:
+            setattr(self, name, NullWidget())
+        self.token_entry = NullWidget(token)
+        self.repo_list = HeadlessRepoList()
+        self.history_view = VirtualHistoryTable(HeadlessTree(), NullWidget())
+        self.history_view._on_configure(SimpleNamespace(height=TABLE_HEIGHT))
+
+    def after(self, ms, func=None, *args):
+        return None
+
+    def winfo_exists(self):
+        return True
+
+
+class UILoop:
+    """UI thread-ini təqlid edir: UIUpdatePump-ı dövri boşaldır və hər kadrın müddətini ölçür."""
+
+    def __init__(self, pump, interval=0.02):
+        self.pump = pump
+        self.interval = interval
+        self.frames = []
+        pump._running = True
+
+    def frame(self, each_frame=None):
+        started = time.perf_counter()
+        self.pump._drain()
+        if each_frame: each_frame()
+        self.frames.append(time.perf_counter() - started)
+
+    def run_until(self, is_done, each_frame=None, timeout=600):
+        """`is_done()` True olana və növbə boşalana qədər kadrları işlədir.
+
+        `each_frame` hər kadrdan sonra UI thread-də çağırılır (məs. istifadəçinin sürüşdürməsi)."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            self.frame(each_frame)
+            if is_done() and not self.pump.pending_count(): return True
+            time.sleep(self.interval)
+        return False
+
+    def blocking(self):
+        """(ümumi, maksimum) bloklanma ms ilə və 16 ms-dən uzun kadrların sayı."""
+        total = sum(self.frames) * 1000
+        longest = max(self.frames, default=0) * 1000
+        return total, longest, sum(1 for frame in self.frames if frame > 0.016)
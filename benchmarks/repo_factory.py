@@ -0,0 +1,33 @@
+import os
+import subprocess
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+
+def _fast_import_stream(commits):
+    """`git fast-import` üçün N commitlik xətti tarixçə (hər commit bir faylı dəyişir)."""
+    for index in range(1, commits + 1):
+        message = f"Commit {index}: dəyişiklik\n".encode()
+        content = f"sətir {index}\n".encode()
+        lines = [b"commit refs/heads/main", f"mark :{index}".encode(),
+                 f"committer Bench Müəllif <bench@example.com> {1_600_000_000 + index * 60} +0000".encode(),
+                 f"data {len(message)}".encode(), message]
+        if index > 1: lines.append(f"from :{index - 1}".encode())
+        lines += [f"M 644 inline fayl{index % 50}.txt".encode(), f"data {len(content)}".encode(), content, b""]
+        yield b"\n".join(lines)
+
+
+def make_repo(commits, cache_dir=CACHE_DIR):
+    """N commitlik lokal anbarı yaradır (və ya keşdən qaytarır); yolu qaytarır."""
+    path = os.path.join(cache_dir, f"repo-{commits}")
+    if os.path.isdir(os.path.join(path, ".git")): return path
+    os.makedirs(path, exist_ok=True)
+    subprocess.run(["git", "init", "-q", "-b", "main", path], check=True)
+    process = subprocess.Popen(["git", "-C", path, "fast-import", "--quiet"], stdin=subprocess.PIPE)
+    for chunk in _fast_import_stream(commits):
+        process.stdin.write(chunk)
+    process.stdin.close()
+    if process.wait() != 0:
+        raise RuntimeError(f"git fast-import uğursuz oldu: {path}")
+    subprocess.run(["git", "-C", path, "reset", "-q", "--hard", "main"], check=True)
+    return path
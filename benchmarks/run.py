@@ -0,0 +1,345 @@
+"""Ekransız performans ölçmələri.
+
+İstifadə (layihə qovluğundan):
+    python -m benchmarks.run                      # standart ölçülər
+    python -m benchmarks.run --preset quick       # tez yoxlama
+    python -m benchmarks.run --only local_history --preset full
+    python -m benchmarks.run --compare benchmarks/results/baseline.json
+
+Hər ssenari üçün divar vaxtı, tracemalloc ilə pik yaddaş və UI thread-inin bloklanma
+müddəti (UIUpdatePump kadrları) ölçülür; nəticələr JSON faylına yazılır."""
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# API ünvanı github_client idxal olunmazdan əvvəl yerli serverə yönləndirilir
+PORT = _free_port()
+os.environ["GITHUB_API_URL"] = f"http://127.0.0.1:{PORT}"
+
+import git
+from app_log import logger, setup_logging
+from git_functions import GitFunctions
+from history_view import CommitRow
+from commit_graph import CommitGraph, SIDE_LOCAL, SIDE_REMOTE
+from history_search import CommitSearchIndex
+from state_snapshot import compact_repo
+from benchmarks.fake_github import FakeGitHub
+from benchmarks.headless import HeadlessApp, UILoop
+from benchmarks.repo_factory import make_repo
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+PRESETS = {
+    "quick": {"connect_account": [500], "repo_list_ui": [5000], "commit_history_ui": [10000],
+              "local_history": [1000], "local_history_warm": [1000], "online_history": [500], "zip_download": [5],
+              "commit_graph": [10000], "history_search": [10000]},
+    "default": {"connect_account": [1000, 5000], "repo_list_ui": [5000, 20000], "commit_history_ui": [10000, 100000],
+                "local_history": [1000, 10000], "local_history_warm": [10000], "online_history": [1000, 5000],
+                "zip_download": [20], "commit_graph": [100000], "history_search": [50000]},
+    "full": {"connect_account": [1000, 5000, 10000], "repo_list_ui": [5000, 20000, 50000],
+             "commit_history_ui": [10000, 100000], "local_history": [1000, 10000, 100000],
+             "local_history_warm": [100000], "online_history": [1000, 10000], "zip_download": [20, 200],
+             "commit_graph": [100000, 500000], "history_search": [50000, 200000]},
+}
+
+# Müqayisədə reqressiya sayılmaq üçün minimal mütləq fərq (kiçik səs-küy nəzərə alınmır)
+COMPARED_METRICS = {"wall_s": 0.02, "peak_mb": 1.0, "ui_block_max_ms": 5.0, "ui_block_total_ms": 10.0}
+
+
+# --- Ssenarilər: setup(functions, app, loop, ölçü, latency) -> run() ---
+def _idle(functions):
+    return lambda: functions.scheduler.queue_depth() == (0, 0)
+
+
+def connect_account(functions, app, loop, size, latency):
+    server = FakeGitHub(repos=size, latency_ms=latency, port=PORT).__enter__()
+
+    def run():
+        try:
+            functions.handle_connect_account()
+            loop.run_until(_idle(functions))
+            assert len(app.repo_list.index) == size, len(app.repo_list.index)
+            return {"requests": server.request_count}
+        finally:
+            server.__exit__(None, None, None)
+    return run
+
+
+def repo_list_ui(functions, app, loop, size, latency):
+    fake = FakeGitHub(repos=size)
+    repos = [compact_repo(fake.repo(i)) for i in range(size)]
+
+    def run():
+        functions._post_repo_list(functions._update_repo_list_ui, repos)
+        loop.run_until(lambda: True)
+        # Süzgəcə hərf-hərf yazılan sorğu
+        for query in ("r", "re", "rep", "repo-0", "repo-00", "repo-001"):
+            app.repo_list.filter_text = query
+            functions.ui.post(app.repo_list.apply_filter)
+            loop.frame()
+        return {"visible": len(app.repo_list.visible_ids)}
+    return run
+
+
+def commit_history_ui(functions, app, loop, size, latency):
+    rows = [CommitRow(f"{i:040x}", f"Commit {i}", f"Müəllif {i % 17}", 1_600_000_000 - i * 60, (f"{i + 1:040x}",))
+            for i in range(size)]
+    view = app.history_view
+
+    def run():
+        functions._post_history(functions._update_commit_history_ui, rows, False, functions._history_generation)
+        loop.run_until(lambda: True)
+        # Cədvəlin sonuna qədər səhifə-səhifə sürüşdürmə (hər addım bir kadr)
+        step = max(view.visible_count, size // 200)
+        while view.offset < view._max_offset():
+            loop.frame(lambda: view.scroll_by(step))
+        return {"rows": len(view.rows)}
+    return run
+
+
+def _local_setup(functions, size):
+    path = make_repo(size)
+    functions.repo_object = git.Repo(path)
+    functions.source_repo_path = path
+    return path
+
+
+def _local_run(functions, app, loop):
+    def run():
+        functions.run_in_thread(functions.populate_local_commit_history, key="history")()
+        loop.run_until(_idle(functions))
+        return {"rows": len(app.history_view.rows)}
+    return run
+
+
+def local_history(functions, app, loop, size, latency):
+    _local_setup(functions, size)
+    return _local_run(functions, app, loop)
+
+
+def local_history_warm(functions, app, loop, size, latency):
+    _local_setup(functions, size)
+    # Anbar əvvəlcədən doldurulur - ölçülən yalnız təkrar açılışdır
+    functions.populate_local_commit_history()
+    loop.run_until(lambda: True)
+    return _local_run(functions, app, loop)
+
+
+def online_history(functions, app, loop, size, latency):
+    server = FakeGitHub(repos=1, commits=size, latency_ms=latency, port=PORT).__enter__()
+    repo = compact_repo(server.repo(0))
+    view = app.history_view
+    view.on_need_more = functions.handle_load_more_history
+
+    def run():
+        try:
+            functions.handle_select_target_repo(repo)
+            # İstifadəçi cədvəlin sonuna qədər sürüşdürür, hər dəfə növbəti səhifə yüklənir
+            loop.run_until(lambda: _idle(functions)() and view.rows and not view.has_more,
+                           each_frame=lambda: view.scroll_to(len(view.rows)))
+            assert len(view.rows) == size, len(view.rows)
+            return {"requests": server.request_count, "rows": len(view.rows)}
+        finally:
+            server.__exit__(None, None, None)
+    return run
+
+
+def zip_download(functions, app, loop, size, latency):
+    server = FakeGitHub(repos=1, zip_bytes=size * 1024 * 1024, latency_ms=latency, port=PORT).__enter__()
+    repo = compact_repo(server.repo(0))
+    zip_path = os.path.abspath("arxiv.zip")
+
+    def run():
+        try:
+            started = time.perf_counter()
+            functions.run_in_thread(functions._download_commit_zip_task, zip_path, repo, "f" * 40)()
+            loop.run_until(_idle(functions))
+            assert os.path.getsize(zip_path) == size * 1024 * 1024
+            return {"mb_per_s": round(size / (time.perf_counter() - started), 1)}
+        finally:
+            server.__exit__(None, None, None)
+    return run
+
+
+def _linear_rows(prefix, parent, count, start_time):
+    rows = []
+    for i in range(count):
+        sha = f"{prefix}{i:038x}"
+        rows.append(CommitRow(sha, f"Commit {i}", "Bench", start_time + i * 60, (parent,) if parent else ()))
+        parent = sha
+    return rows[::-1]
+
+
+def commit_graph(functions, app, loop, size, latency):
+    # İki N commitlik tarixçə: 90% ortaq, qalanı hər tərəfdə ayrı
+    shared = _linear_rows("aa", None, size * 9 // 10, 0)
+    local = _linear_rows("bb", shared[0].sha, size // 10, shared[0].timestamp + 60)
+    remote = _linear_rows("cc", shared[0].sha, size // 10, shared[0].timestamp + 60)
+
+    def run():
+        graph = CommitGraph()
+        graph.add_rows(local + shared)
+        graph.add_rows(remote + shared)
+        graph.set_tip(SIDE_LOCAL, local[0].sha)
+        graph.set_tip(SIDE_REMOTE, remote[0].sha)
+        started = time.perf_counter()
+        graph.ahead_behind(SIDE_LOCAL, SIDE_REMOTE)
+        built = time.perf_counter()
+        ahead, behind = graph.ahead_behind(SIDE_LOCAL, SIDE_REMOTE)
+        assert graph.merge_base(SIDE_LOCAL, SIDE_REMOTE) == shared[0].sha
+        queried = time.perf_counter()
+        rows = graph.merged_rows()
+        assert (ahead, behind) == (len(local), len(remote)) and len(rows) == len(shared) + len(local) + len(remote)
+        return {"build_ms": round((built - started) * 1000, 1), "query_ms": round((queried - built) * 1000, 3)}
+    return run
+
+
+def history_search(functions, app, loop, size, latency):
+    # Paketlərlə doldurulan indeks və bir neçə tipik sorğu (söz, qısa prefiks, müəllif, SHA)
+    words = ("fix", "feature", "refactor", "update", "docs", "test", "merge", "release")
+    rows = [CommitRow(f"{i:040x}", f"{words[i % len(words)]} module{i % 997} item {i}", f"Author {i % 50}", i * 60, ())
+            for i in range(size, 0, -1)]
+    queries = ("fix", "m", "module42", "author 7", "refactor item", f"{size // 2:040x}"[:12])
+
+    def run():
+        index = CommitSearchIndex()
+        started = time.perf_counter()
+        for start in range(0, len(rows), 250):
+            index.add(rows[start:start + 250])
+        built = time.perf_counter()
+        slowest = 0.0
+        for query in queries:
+            query_started = time.perf_counter()
+            assert index.search(query)
+            slowest = max(slowest, time.perf_counter() - query_started)
+        return {"build_ms": round((built - started) * 1000, 1), "query_max_ms": round(slowest * 1000, 2)}
+    return run
+
+
+SCENARIOS = {func.__name__: func for func in (connect_account, repo_list_ui, commit_history_ui, local_history,
+                                              local_history_warm, online_history, zip_download, commit_graph,
+                                              history_search)}
+
+
+# --- İcra ---
+def run_scenario(name, size, latency, memory):
+    origin = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix="git-app-bench-")
+    os.chdir(workdir)
+    app = HeadlessApp()
+    functions = GitFunctions(app)
+    loop = UILoop(functions.ui)
+    try:
+        run = SCENARIOS[name](functions, app, loop, size, latency)
+        loop.frames.clear()
+        if memory: tracemalloc.start()
+        started = time.perf_counter()
+        extra = run() or {}
+        wall = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024) if memory else None
+        total, longest, long_frames = loop.blocking()
+        return {"wall_s": round(wall, 4), "peak_mb": round(peak, 2) if peak is not None else None,
+                "ui_block_total_ms": round(total, 1), "ui_block_max_ms": round(longest, 1),
+                "long_frames": long_frames, **extra}
+    finally:
+        if memory: tracemalloc.stop()
+        functions.scheduler.shutdown()
+        functions.ui.stop()
+        functions.commit_store.close()
+        # Gecikdirilmiş konfiqurasiya yazması müvəqqəti qovluqda bitməlidir, işçi qovluqda deyil
+        functions.config.flush()
+        os.chdir(origin)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _meta(args):
+    try:
+        revision = subprocess.run(["git", "-C", ROOT, "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        revision = None
+    return {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "revision": revision, "preset": args.preset,
+            "latency_ms": args.latency_ms, "memory": not args.no_memory, "python": platform.python_version(),
+            "platform": platform.platform(), "git": git.Git().version()}
+
+
+def compare(current, baseline, threshold):
+    """Nəticələri əsasla müqayisə edir, cədvəli çap edir və reqressiyaların sayını qaytarır."""
+    regressions = 0
+    print(f"\n{'Ssenari':<32}{'Metrik':<20}{'Əsas':>12}{'İndi':>12}{'Fərq':>9}")
+    for key, result in current["results"].items():
+        old = baseline.get("results", {}).get(key)
+        if not old: continue
+        for metric, min_delta in COMPARED_METRICS.items():
+            new_value, old_value = result.get(metric), old.get(metric)
+            if new_value is None or old_value is None: continue
+            ratio = (new_value / old_value - 1) if old_value else 0.0
+            regressed = ratio > threshold and new_value - old_value > min_delta
+            regressions += regressed
+            flag = "  << REQRESSİYA" if regressed else ""
+            print(f"{key:<32}{metric:<20}{old_value:>12}{new_value:>12}{ratio:>+9.0%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Git İdarəetmə Paneli üçün ekransız performans ölçmələri")
+    parser.add_argument("--preset", choices=PRESETS, default="default")
+    parser.add_argument("--only", action="append", choices=SCENARIOS, help="yalnız bu ssenari(lər)")
+    parser.add_argument("--latency-ms", type=float, default=20, help="saxta API-nin hər sorğu gecikməsi")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc ilə yaddaş ölçməsini söndür")
+    parser.add_argument("--output", help="nəticə faylı (standart: benchmarks/results/<vaxt>.json)")
+    parser.add_argument("--compare", help="müqayisə üçün əvvəlki nəticə faylı")
+    parser.add_argument("--threshold", type=float, default=0.15, help="reqressiya həddi (0.15 = 15%%)")
+    parser.add_argument("--verbose", action="store_true", help="tətbiq jurnalını konsola yaz")
+    args = parser.parse_args(argv)
+
+    if args.verbose:
+        setup_logging(os.path.join(tempfile.gettempdir(), "git-app-bench.log"))
+    else:
+        logger.addHandler(logging.NullHandler())
+
+    report = {"schema": 1, "meta": _meta(args), "results": {}}
+    for name, sizes in PRESETS[args.preset].items():
+        if args.only and name not in args.only: continue
+        for size in sizes:
+            key = f"{name}[{size}]"
+            print(f"{key} ...", end=" ", flush=True)
+            # Vaxt ölçməsi tracemalloc-suz aparılır (o, icranı bir neçə dəfə ləngidir), yaddaş ayrıca keçiddə
+            result = run_scenario(name, size, args.latency_ms, memory=False)
+            if not args.no_memory:
+                result["peak_mb"] = run_scenario(name, size, args.latency_ms, memory=True)["peak_mb"]
+            report["results"][key] = result
+            print(", ".join(f"{k}={v}" for k, v in result.items()))
+
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nNəticələr yazıldı: {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        print(f"\n{regressions} reqressiya tapıldı." if regressions else "\nReqressiya yoxdur.")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+import customtkinter as ctk
+from tkinter import ttk
+from history_view import format_timestamp
+
+# Böyük diff bir dəfəyə deyil, hər kadrda bu qədər simvol olmaqla çəkilir
+RENDER_CHUNK_CHARS = 32 * 1024
+
+_STATUS_TITLES = {"A": "Əlavə", "D": "Silinib", "M": "Dəyişib", "R": "Ad dəyişib", "C": "Kopyalanıb", "T": "Növ dəyişib"}
+
+
+def _line_tag(line):
+    if line.startswith("diff --git"): return "file"
+    if line.startswith("@@"): return "hunk"
+    if line.startswith(("+++", "---")): return "meta"
+    if line.startswith("+"): return "added"
+    if line.startswith("-"): return "removed"
+    return None
+
+
+class CommitDetailPane(ctk.CTkFrame):
+    """Seçilmiş commit-in dəyişmiş faylları və diff-i. Diff hissə-hissə gəlir və kadrlara bölünərək çəkilir;
+    başqa commit seçildikdən sonra gələn köhnə hissələr (sha-ya görə) atılır."""
+
+    def __init__(self, master, height=6, **kwargs):
+        super().__init__(master, **kwargs)
+        self.grid_columnconfigure(2, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+        self.header_label = ctk.CTkLabel(self, text="Commit seçilməyib", anchor="w", text_color="gray")
+        self.header_label.grid(row=0, column=0, columnspan=3, sticky="ew", padx=10, pady=(5, 0))
+        self.files_tree = ttk.Treeview(self, columns=("status", "path", "changes"), show="headings", selectmode="browse", height=height)
+        self.files_tree.heading("status", text="Vəziyyət")
+        self.files_tree.heading("path", text="Fayl")
+        self.files_tree.heading("changes", text="+/−")
+        self.files_tree.column("status", width=90, stretch=False)
+        self.files_tree.column("path", width=220, stretch=True)
+        self.files_tree.column("changes", width=80, stretch=False)
+        self.files_tree.grid(row=1, column=0, sticky="nsew", padx=(10, 0), pady=(5, 10))
+        scrollbar = ctk.CTkScrollbar(self, command=self.files_tree.yview)
+        scrollbar.grid(row=1, column=1, sticky="ns", pady=(5, 10))
+        self.files_tree.configure(yscrollcommand=scrollbar.set)
+        self.files_tree.bind("<<TreeviewSelect>>", self._on_file_select, add="+")
+        self.diff_text = ctk.CTkTextbox(self, wrap="none", font=ctk.CTkFont(family="Courier", size=12), height=height * 25)
+        self.diff_text.grid(row=1, column=2, sticky="nsew", padx=10, pady=(5, 10))
+        self.diff_text.tag_config("added", foreground="lightgreen")
+        self.diff_text.tag_config("removed", foreground="tomato")
+        self.diff_text.tag_config("hunk", foreground="cyan")
+        self.diff_text.tag_config("file", foreground="orange")
+        self.diff_text.tag_config("meta", foreground="gray")
+        self.diff_text.configure(state="disabled")
+        self.sha = None
+        self._pending = []
+        self._partial = ""
+        self._file_marks = []
+        self._finished = None
+        self._render_job = None
+
+    def clear(self, text="Commit seçilməyib"):
+        self.sha = None
+        self._pending.clear()
+        self._partial = ""
+        self._file_marks = []
+        self._finished = None
+        if self._render_job is not None:
+            self.after_cancel(self._render_job)
+            self._render_job = None
+        self.files_tree.delete(*self.files_tree.get_children())
+        self.diff_text.configure(state="normal")
+        self.diff_text.delete("1.0", "end")
+        self.diff_text.configure(state="disabled")
+        self.header_label.configure(text=text, text_color="gray")
+
+    def show_loading(self, row):
+        self.clear()
+        self.sha = row.sha
+        self.header_label.configure(text=f"{row.sha[:8]} - {row.message} ({row.author}, {format_timestamp(row.timestamp)}) - yüklənir...",
+                                    text_color="yellow")
+
+    def show_detail(self, row, detail):
+        """Keşdəki nəticə: fayllar dərhal, diff isə kadrlara bölünərək çəkilir."""
+        self.show_loading(row)
+        self.set_files(row.sha, detail.files)
+        self.append_diff(row.sha, detail.diff)
+        self.finish(row.sha, detail.truncated)
+
+    def set_files(self, sha, files):
+        if sha != self.sha: return
+        for index, changed in enumerate(files):
+            counts = "ikili" if changed.additions is None else f"+{changed.additions} −{changed.deletions}"
+            self.files_tree.insert("", "end", iid=str(index),
+                                   values=(_STATUS_TITLES.get(changed.status, changed.status), changed.path, counts))
+        text = self.header_label.cget("text").replace(" - yüklənir...", "")
+        self.header_label.configure(text=f"{text} - {len(files)} fayl", text_color="white")
+
+    def append_diff(self, sha, text):
+        if sha != self.sha or not text: return
+        self._pending.append(text)
+        if self._render_job is None: self._render_step()
+
+    def finish(self, sha, truncated=False):
+        if sha != self.sha: return
+        self._finished = truncated
+        if self._render_job is None: self._render_step()
+
+    def show_error(self, sha, text):
+        if sha != self.sha: return
+        self.header_label.configure(text=text, text_color="orange")
+
+    # --- Çəkmə ---
+    def _render_step(self):
+        self._render_job = None
+        budget, parts = RENDER_CHUNK_CHARS, []
+        while self._pending and budget > 0:
+            text = self._pending.pop(0)
+            if len(text) > budget:
+                self._pending.insert(0, text[budget:])
+                text = text[:budget]
+            parts.append(text)
+            budget -= len(text)
+        text = self._partial + "".join(parts)
+        # Yarımçıq sətir növbəti hissə ilə birlikdə çəkilir ki, rəngi düzgün təyin olunsun
+        if self._pending or self._finished is None:
+            text, newline, self._partial = text.rpartition("\n")
+            text += newline
+        else:
+            self._partial = ""
+        self.diff_text.configure(state="normal")
+        for line in text.splitlines(keepends=True):
+            tag = _line_tag(line)
+            if tag == "file": self._file_marks.append(self.diff_text.index("end-1c"))
+            self.diff_text.insert("end", line, tag or "")
+        if not self._pending and self._finished:
+            self.diff_text.insert("end", "\n... diff çox böyükdür, qalan hissə göstərilmir ...\n", "meta")
+            self._finished = False
+        self.diff_text.configure(state="disabled")
+        if self._pending: self._render_job = self.after(1, self._render_step)
+
+    def _on_file_select(self, event):
+        selection = self.files_tree.selection()
+        if not selection: return
+        # Fayllar diff-dəki sıra ilə göstərilir - n-ci fayl n-ci "diff --git" başlığıdır
+        index = int(selection[0])
+        if index < len(self._file_marks): self.diff_text.see(self._file_marks[index])
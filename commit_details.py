@@ -0,0 +1,146 @@
+import codecs
+import subprocess
+import threading
+from collections import OrderedDict, namedtuple
+from lazy_import import lazy_module
+from instrumentation import span
+
+git = lazy_module("git")
+
+# Bir commit-in diff-i bu həcmdən böyükdürsə, kəsilir (həm keşdə, həm ekranda)
+MAX_DIFF_BYTES = 2 * 1024 * 1024
+DIFF_CHUNK_BYTES = 32 * 1024
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+CACHE_MAX_ENTRIES = 500
+# Kök commit-in valideyni yoxdur - boş ağacla müqayisə edilir
+EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+# files: [(vəziyyət hərfi, yol, əlavə, silinmə)] - ikili fayllarda say None-dur
+CommitDetail = namedtuple("CommitDetail", "sha files diff truncated")
+ChangedFile = namedtuple("ChangedFile", "status path additions deletions")
+
+_ONLINE_STATUS = {"added": "A", "removed": "D", "modified": "M", "renamed": "R", "copied": "C", "changed": "T"}
+
+
+class DetailCache:
+    """Həcmə görə məhdud LRU keş: ən çox (sha -> CommitDetail) `max_bytes` qədər diff saxlanılır."""
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES, max_entries=CACHE_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _size(detail):
+        return len(detail.diff) + 100 * len(detail.files)
+
+    def get(self, key):
+        with self._lock:
+            detail = self._entries.get(key)
+            if detail is not None: self._entries.move_to_end(key)
+            return detail
+
+    def put(self, key, detail):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None: self._bytes -= self._size(previous)
+            self._entries[key] = detail
+            self._bytes += self._size(detail)
+            while self._entries and (self._bytes > self.max_bytes or len(self._entries) > self.max_entries):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= self._size(evicted)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+# --- Lokal (git) ---
+def _parse_name_status(output):
+    statuses, tokens = {}, iter(output.split("\0"))
+    for token in tokens:
+        if not token: continue
+        # Ad dəyişmə/kopyalamada iki yol gəlir: köhnə və yeni
+        if token[0] in "RC": next(tokens, None)
+        path = next(tokens, None)
+        if path is not None: statuses[path] = token[0]
+    return statuses
+
+
+def _parse_numstat(output):
+    counts, tokens = {}, iter(output.split("\0"))
+    for token in tokens:
+        if not token: continue
+        additions, deletions, path = token.split("\t", 2)
+        if not path:
+            next(tokens, None)
+            path = next(tokens, "")
+        counts[path] = (None if additions == "-" else int(additions), None if deletions == "-" else int(deletions))
+    return counts
+
+
+def local_changed_files(repo, sha, parents):
+    base = parents[0] if parents else EMPTY_TREE
+    statuses = _parse_name_status(repo.git.diff("--name-status", "-z", "-M", base, sha))
+    counts = _parse_numstat(repo.git.diff("--numstat", "-z", "-M", base, sha))
+    return [ChangedFile(status, path, *counts.get(path, (None, None))) for path, status in statuses.items()]
+
+
+def iter_local_diff(repo_path, sha, parents, chunk_bytes=DIFF_CHUNK_BYTES, max_bytes=MAX_DIFF_BYTES):
+    """Commit-in (birinci valideynə görə) diff-ini axınla oxuyur; `max_bytes`-dan sonra prosesi dayandırır.
+
+    Mətn hissələri qaytarır; diff kəsilibsə, sonda None gəlir."""
+    base = parents[0] if parents else EMPTY_TREE
+    args = [git.Git.GIT_PYTHON_GIT_EXECUTABLE or "git", "-C", repo_path, "diff", "-M", "--no-color", "--no-ext-diff", base, sha]
+    process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL,
+                               creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+    # Çoxbaytlı UTF-8 simvolu iki hissə arasında bölünə bilər
+    decoder = codecs.getincrementaldecoder("utf-8")("replace")
+    with span("git", "diff") as fields:
+        try:
+            read = 0
+            while read < max_bytes:
+                chunk = process.stdout.read1(min(chunk_bytes, max_bytes - read))
+                if not chunk: break
+                read += len(chunk)
+                fields["bytes"] = read
+                yield decoder.decode(chunk)
+            tail = decoder.decode(b"", final=True)
+            if tail: yield tail
+            if read >= max_bytes and process.stdout.read1(1):
+                fields["truncated"] = True
+                yield None
+        finally:
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+            process.stdout.close()
+
+
+# --- Onlayn (GitHub API) ---
+def online_detail(client, repo_data, sha, max_bytes=MAX_DIFF_BYTES):
+    """`GET /repos/{o}/{r}/commits/{sha}` - fayl siyahısı və hər faylın patch-ı (API ilk 300 faylı qaytarır)."""
+    response = client.get(repo_data['commits_url'].replace('{/sha}', f'/{sha}'))
+    response.raise_for_status()
+    files, parts, size, truncated = [], [], 0, False
+    for item in response.json().get('files', []):
+        status = _ONLINE_STATUS.get(item.get('status'), "M")
+        files.append(ChangedFile(status, item['filename'], item.get('additions'), item.get('deletions')))
+        old = item.get('previous_filename') or item['filename']
+        header = f"diff --git a/{old} b/{item['filename']}\n"
+        if truncated: continue
+        patch = item.get('patch')
+        text = header + (patch + "\n" if patch else "(ikili və ya çox böyük fayl - patch yoxdur)\n")
+        # Sonrakı kiçik patch-lar da buraxılır ki, fayl siyahısı ilə diff-dəki sıra uyğun qalsın
+        if size + len(text) > max_bytes:
+            truncated = True
+            continue
+        parts.append(text)
+        size += len(text)
+    return CommitDetail(sha, files, "".join(parts), truncated)
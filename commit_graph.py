@@ -0,0 +1,174 @@
+from instrumentation import span
+
+SIDE_LOCAL = "local"
+SIDE_REMOTE = "online"
+
+# Birləşmiş tarixçədə sətrin hansı tərəfdə olduğunu göstərən işarələr
+MARK_LOCAL_ONLY = "↑"
+MARK_REMOTE_ONLY = "↓"
+MARK_SHARED = "="
+
+
+class CommitGraph:
+    """Lokal və onlayn tarixçələrin birləşmiş commit qrafı.
+
+    Commitlər topoloji sıra ilə nömrələnir (valideyn həmişə övladdan kiçik nömrə alır) və hər birinin
+    nəsil nömrəsi (generation) saxlanılır. Hər ucdan (tip) əlçatan commitlər Python `int` bit-massivi kimi
+    bir dəfə hesablanır; bundan sonra ahead/behind bir `&`/`bit_count`, merge-base isə ortaq bitlərin
+    ən böyüyüdür - heç bir qraf gəzintisi tələb olunmur.
+
+    Tarixçə natamamdırsa (səhifələnmiş onlayn siyahı), naməlum valideynlər sadəcə buraxılır."""
+
+    def __init__(self):
+        self._rows = {}
+        self._tips = {}
+        self._dirty = True
+        self.shas = []
+        self.ids = {}
+        self.parents = []
+        self.generation = []
+        self._reach = {}
+        self._flags = {}
+
+    # --- Doldurma ---
+    def add_rows(self, rows):
+        for row in rows:
+            self._rows.setdefault(row.sha, row)
+        self._dirty = True
+
+    def set_tip(self, name, sha):
+        self._tips[name] = sha
+        self._reach.pop(name, None)
+        self._flags.pop(name, None)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _build(self):
+        """Valideynlər-əvvəl sıralama; nömrələr və nəsillər bu sıraya görə verilir."""
+        if not self._dirty: return
+        with span("graph", "build") as fields:
+            # Tarixə görə sıralama demək olar ki, həmişə artıq topolojidir - yoxlanılır və yalnız
+            # pozulduqda (məs. rebase olunmuş köhnə tarixli commitlər) tam gəzintiyə keçilir
+            shas = sorted(self._rows, key=lambda sha: self._rows[sha].timestamp)
+            temp = {sha: index for index, sha in enumerate(shas)}
+            temp_parents = [[temp[p] for p in self._rows[sha].parents if p in temp] for sha in shas]
+            if all(parent < node for node, parents in enumerate(temp_parents) for parent in parents):
+                self.shas, self.ids, self.parents = shas, temp, temp_parents
+            else:
+                order = self._topological_order(temp_parents)
+                new_id = [0] * len(shas)
+                for position, node in enumerate(order):
+                    new_id[node] = position
+                self.shas = [shas[node] for node in order]
+                self.ids = {sha: position for position, sha in enumerate(self.shas)}
+                self.parents = [[new_id[p] for p in temp_parents[node]] for node in order]
+                fields["walk"] = True
+            generation = [1] * len(self.shas)
+            for node, parents in enumerate(self.parents):
+                if len(parents) == 1:
+                    generation[node] = generation[parents[0]] + 1
+                elif parents:
+                    generation[node] = 1 + max(generation[p] for p in parents)
+            self.generation = generation
+            self._reach.clear()
+            self._flags.clear()
+            self._dirty = False
+            fields["commits"] = len(self.shas)
+
+    @staticmethod
+    def _topological_order(parents):
+        """Dərinə-ilk gəzinti ilə valideynlər-əvvəl sıra."""
+        order, visited = [], bytearray(len(parents))
+        for start in range(len(parents)):
+            if visited[start]: continue
+            visited[start] = 1
+            stack = [(start, iter(parents[start]))]
+            while stack:
+                node, pending = stack[-1]
+                for parent in pending:
+                    if not visited[parent]:
+                        visited[parent] = 1
+                        stack.append((parent, iter(parents[parent])))
+                        break
+                else:
+                    stack.pop()
+                    order.append(node)
+        return order
+
+    # --- Sorğular ---
+    def reach(self, name):
+        """`name` ucundan əlçatan commitlərin bit-massivi (bit i - nömrəsi i olan commit)."""
+        self._build()
+        bits = self._reach.get(name)
+        if bits is not None: return bits
+        flags = bytearray(b"0") * len(self.shas)
+        tip = self.ids.get(self._tips.get(name))
+        if tip is not None:
+            flags[tip] = 0x31
+            stack = [tip]
+            while stack:
+                for parent in self.parents[stack.pop()]:
+                    if flags[parent] == 0x30:
+                        flags[parent] = 0x31
+                        stack.append(parent)
+        # Bayt bayraqları tək-tək yoxlamalar üçün saxlanılır; ikilik sətirdən int-ə çevirmə xəttidir
+        # (ən kiçik bit sətrin sonunda olmalıdır)
+        self._flags[name] = bytes(flags)
+        flags.reverse()
+        bits = self._reach[name] = int(flags, 2) if flags else 0
+        return bits
+
+    def _in(self, name, node):
+        self.reach(name)
+        return self._flags[name][node] == 0x31
+
+    def ahead_behind(self, name, other):
+        """(`name`-də olub `other`-də olmayan, `other`-də olub `name`-də olmayan) commit sayları."""
+        mine, theirs = self.reach(name), self.reach(other)
+        return (mine & ~theirs).bit_count(), (theirs & ~mine).bit_count()
+
+    def merge_base(self, name, other):
+        """Ən yaxın ortaq əcdad: ortaq commitlərin ən böyük nömrəlisi heç bir ortaq commit-in əcdadı ola bilməz."""
+        common = self.reach(name) & self.reach(other)
+        return self.shas[common.bit_length() - 1] if common else None
+
+    def contains(self, name, sha):
+        self._build()
+        node = self.ids.get(sha)
+        return node is not None and self._in(name, node)
+
+    def is_ancestor(self, ancestor, descendant):
+        """Nəsil nömrələri ilə budanmış gəzinti: nəsli `ancestor`-dan kiçik olan commitlərə enilmir."""
+        self._build()
+        target, start = self.ids.get(ancestor), self.ids.get(descendant)
+        if target is None or start is None: return False
+        floor = self.generation[target]
+        seen, stack = {start}, [start]
+        while stack:
+            node = stack.pop()
+            if node == target: return True
+            for parent in self.parents[node]:
+                if parent not in seen and self.generation[parent] >= floor:
+                    seen.add(parent)
+                    stack.append(parent)
+        return False
+
+    def mark(self, sha, first=SIDE_LOCAL, second=SIDE_REMOTE):
+        self._build()
+        node = self.ids.get(sha)
+        if node is None: return ""
+        in_first, in_second = self._in(first, node), self._in(second, node)
+        if in_first and in_second: return MARK_SHARED
+        return MARK_LOCAL_ONLY if in_first else MARK_REMOTE_ONLY if in_second else ""
+
+    def merged_rows(self, names=(SIDE_LOCAL, SIDE_REMOTE)):
+        """Uclardan hər hansı birindən əlçatan commitlər, tarixə (bərabərdirsə, topoloji sıraya) görə yenidən köhnəyə."""
+        union = 0
+        for name in names:
+            union |= self.reach(name)
+        # Bitlər bir dəfəlik ikilik sətrə çevrilir (hər bit üçün sürüşdürmə kvadratik olardı)
+        digits = format(union, "b")[::-1] if union else ""
+        rows = [self._rows[self.shas[node]] for node, digit in enumerate(digits) if digit == "1"]
+        rows.sort(key=lambda row: (row.timestamp, self.ids[row.sha]), reverse=True)
+        return rows
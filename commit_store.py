@@ -0,0 +1,139 @@
+import sqlite3
+import threading
+from history_view import CommitRow
+
+STORE_FILE = "commit_store.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS commits (
+    repo TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    author TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    parents TEXT NOT NULL,
+    PRIMARY KEY (repo, sha)
+);
+CREATE INDEX IF NOT EXISTS commits_by_seq ON commits (repo, seq);
+CREATE TABLE IF NOT EXISTS repo_state (
+    repo TEXT PRIMARY KEY,
+    complete INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+class CommitStore:
+    """Commit metadatasının SQLite anbarı.
+
+    Hər depo (`full_name` və ya lokal yol) üçün tarixçənin ən yeni commitdən başlayan
+    ardıcıl hissəsi saxlanılır; `seq` nə qədər böyükdürsə, commit o qədər yenidir."""
+
+    def __init__(self, path=STORE_FILE):
+        self._lock = threading.Lock()
+        # Yazmadan sonra çağırılır: on_change(repo, "replace"/"prepend"/"append"/"clear", yeni sətirlər)
+        self.on_change = None
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    @staticmethod
+    def _to_row(record):
+        sha, message, author, timestamp, parents = record
+        return CommitRow(sha, message, author, timestamp, tuple(parents.split()))
+
+    def _seq_bounds(self, repo):
+        return self._db.execute("SELECT MIN(seq), MAX(seq) FROM commits WHERE repo = ?", (repo,)).fetchone()
+
+    def _insert(self, repo, rows, seqs):
+        self._db.executemany(
+            "INSERT OR IGNORE INTO commits (repo, sha, seq, message, author, timestamp, parents) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((repo, row.sha, seq, row.message, row.author, row.timestamp, " ".join(row.parents)) for row, seq in zip(rows, seqs)))
+
+    def _new_rows(self, repo, rows):
+        shas = [row.sha for row in rows]
+        known = set()
+        for start in range(0, len(shas), 500):
+            chunk = shas[start:start + 500]
+            known.update(sha for (sha,) in self._db.execute(
+                f"SELECT sha FROM commits WHERE repo = ? AND sha IN ({','.join('?' * len(chunk))})", (repo, *chunk)))
+        return [row for row in rows if row.sha not in known]
+
+    # --- Oxuma ---
+    def head(self, repo):
+        with self._lock:
+            found = self._db.execute("SELECT sha FROM commits WHERE repo = ? ORDER BY seq DESC LIMIT 1", (repo,)).fetchone()
+        return found[0] if found else None
+
+    def oldest(self, repo):
+        with self._lock:
+            found = self._db.execute("SELECT sha FROM commits WHERE repo = ? ORDER BY seq ASC LIMIT 1", (repo,)).fetchone()
+        return found[0] if found else None
+
+    def count(self, repo):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM commits WHERE repo = ?", (repo,)).fetchone()[0]
+
+    def page(self, repo, offset, limit):
+        with self._lock:
+            records = self._db.execute(
+                "SELECT sha, message, author, timestamp, parents FROM commits WHERE repo = ? ORDER BY seq DESC LIMIT ? OFFSET ?",
+                (repo, limit, offset)).fetchall()
+        return [self._to_row(record) for record in records]
+
+    def is_complete(self, repo):
+        """Anbarda depo tarixçəsinin kökünə qədər bütün commitlər varsa True."""
+        with self._lock:
+            found = self._db.execute("SELECT complete FROM repo_state WHERE repo = ?", (repo,)).fetchone()
+        return bool(found and found[0])
+
+    # --- Yazma (sətirlər həmişə yenidən köhnəyə sıralanır) ---
+    def replace(self, repo, rows, complete=False):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM commits WHERE repo = ?", (repo,))
+            self._insert(repo, rows, range(len(rows), 0, -1))
+            self._set_complete(repo, complete)
+        self._notify(repo, "replace", rows)
+
+    def prepend(self, repo, rows):
+        """Mövcud ən yeni commitdən daha yeni commitləri əlavə edir."""
+        with self._lock, self._db:
+            rows = self._new_rows(repo, rows)
+            top = self._seq_bounds(repo)[1]
+            top = 0 if top is None else top
+            self._insert(repo, rows, range(top + len(rows), top, -1))
+        self._notify(repo, "prepend", rows)
+        return rows
+
+    def append(self, repo, rows, complete=False):
+        """Mövcud ən köhnə commitdən daha köhnə commitləri əlavə edir; yalnız yeni olanları qaytarır."""
+        with self._lock, self._db:
+            rows = self._new_rows(repo, rows)
+            bottom = self._seq_bounds(repo)[0]
+            bottom = 1 if bottom is None else bottom
+            self._insert(repo, rows, range(bottom - 1, bottom - 1 - len(rows), -1))
+            if complete: self._set_complete(repo, True)
+        self._notify(repo, "append", rows)
+        return rows
+
+    def mark_complete(self, repo):
+        with self._lock, self._db:
+            self._set_complete(repo, True)
+
+    def clear(self, repo):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM commits WHERE repo = ?", (repo,))
+            self._db.execute("DELETE FROM repo_state WHERE repo = ?", (repo,))
+        self._notify(repo, "clear", [])
+
+    def _notify(self, repo, kind, rows):
+        if self.on_change and (rows or kind in ("replace", "clear")): self.on_change(repo, kind, rows)
+
+    def _set_complete(self, repo, complete):
+        self._db.execute("INSERT INTO repo_state (repo, complete) VALUES (?, ?) "
+                         "ON CONFLICT(repo) DO UPDATE SET complete = excluded.complete", (repo, int(complete)))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
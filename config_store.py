@@ -0,0 +1,182 @@
+import os
+import copy
+import json
+import atexit
+import tempfile
+import threading
+from app_log import log
+
+CONFIG_FILE = "git_app_config.json"
+SCHEMA_VERSION = 2
+# Ardıcıl dəyişikliklər bu müddət ərzində toplanır və bir yazma ilə diskə köçürülür
+FLUSH_DELAY = 0.5
+DEFAULT_PROFILE = "default"
+
+# Profil - bir GitHub hesabı və onunla işləmək üçün ayarlar
+PROFILE_DEFAULTS = {
+    "token": "",
+    "last_source_path": "",
+    "user_name": "",
+    "user_email": "",
+    "use_graphql": False,
+    "batch_mappings": [],
+}
+
+
+def _empty_config():
+    return {"version": SCHEMA_VERSION, "active_profile": DEFAULT_PROFILE,
+            "profiles": {DEFAULT_PROFILE: copy.deepcopy(PROFILE_DEFAULTS)}, "repos": {}}
+
+
+def migrate(data):
+    """Köhnə sxemləri cari versiyaya çevirir. Versiya 1 (sahəsiz) - bütün açarlar bir səviyyədə idi."""
+    if not isinstance(data, dict): raise ValueError("konfiqurasiya JSON obyekti deyil")
+    version = data.get("version", 1)
+    if version > SCHEMA_VERSION: raise ValueError(f"naməlum sxem versiyası: {version}")
+    if version == 1:
+        config = _empty_config()
+        profile = config["profiles"][DEFAULT_PROFILE]
+        for key in PROFILE_DEFAULTS:
+            if data.get(key) is not None: profile[key] = data[key]
+        # Hər depo üçün ayrı pull ayarları artıq ümumi "repos" bölməsindədir
+        for full_name, options in data.get("pull_options", {}).items():
+            config["repos"].setdefault(full_name, {})["pull_options"] = options
+        log("Konfiqurasiya sxem 1-dən 2-yə köçürüldü.")
+        data = config
+    data.setdefault("profiles", {}).setdefault(DEFAULT_PROFILE, copy.deepcopy(PROFILE_DEFAULTS))
+    data.setdefault("repos", {})
+    if data.get("active_profile") not in data["profiles"]: data["active_profile"] = DEFAULT_PROFILE
+    return data
+
+
+class ConfigStore:
+    """Yaddaşda saxlanılan canlı konfiqurasiya və onun gecikdirilmiş (write-behind) diskə yazılması.
+
+    Dəyişikliklər dərhal yaddaşa düşür və heç bir tapşırığı bloklamır; `FLUSH_DELAY` ərzindəki bütün
+    dəyişikliklər bir yazmaya birləşir. Fayl kilid altında müvəqqəti fayla yazılıb `os.replace` ilə
+    dəyişdirilir - yarımçıq yazılmış konfiqurasiya heç vaxt oxunmur."""
+
+    def __init__(self, path=CONFIG_FILE, delay=FLUSH_DELAY):
+        self.path = path
+        self.delay = delay
+        self.data = _empty_config()
+        # Yazma xətası barədə UI-a xəbər vermək üçün: on_error(istisna)
+        self.on_error = None
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._timer = None
+        self._dirty = False
+        atexit.register(self.flush)
+
+    def load(self):
+        """Faylı oxuyur; fayl yoxdursa False. Zədəli fayl üzərinə yazılmır - kənara köçürülür."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            data = migrate(raw)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            log(f"!!! KONFİQURASİYA OXUNMADI: {e}")
+            try:
+                os.replace(self.path, f"{self.path}.corrupt")
+            except OSError:
+                pass
+            return False
+        with self._lock:
+            self.data = data
+            # Köçürülmüş konfiqurasiya yeni sxemdə yenidən yazılır
+            if raw.get("version", 1) != SCHEMA_VERSION: self._schedule()
+        return True
+
+    # --- Profil ---
+    @property
+    def profile_name(self):
+        return self.data["active_profile"]
+
+    def profiles(self):
+        with self._lock:
+            return sorted(self.data["profiles"])
+
+    def _profile(self):
+        return self.data["profiles"][self.data["active_profile"]]
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._profile().get(key, PROFILE_DEFAULTS.get(key, default))
+            # Çağıran tərəf siyahı/lüğəti dəyişsə belə canlı konfiqurasiya toxunulmaz qalır
+            return default if value is None else copy.deepcopy(value)
+
+    def set(self, **fields):
+        with self._lock:
+            profile = self._profile()
+            changed = {key: value for key, value in fields.items() if profile.get(key) != value}
+            if not changed: return
+            profile.update(changed)
+            self._schedule()
+
+    def switch_profile(self, name):
+        """Aktiv profili dəyişir; profil yoxdursa, standart dəyərlərlə yaradılır."""
+        with self._lock:
+            if name == self.data["active_profile"]: return
+            self.data["profiles"].setdefault(name, copy.deepcopy(PROFILE_DEFAULTS))
+            self.data["active_profile"] = name
+            self._schedule()
+
+    # --- Depo ayarları (full_name üzrə, bütün profillər üçün ortaq) ---
+    def repo_setting(self, full_name, key, default=None):
+        with self._lock:
+            return copy.deepcopy(self.data["repos"].get(full_name, {}).get(key, default))
+
+    def set_repo_setting(self, full_name, key, value):
+        """`value` None və ya boşdursa, ayar silinir (boş depo bölmələri saxlanılmır)."""
+        with self._lock:
+            repos = self.data["repos"]
+            settings = repos.get(full_name, {})
+            if settings.get(key) == value or (not value and key not in settings): return
+            if value:
+                repos.setdefault(full_name, settings)[key] = value
+            else:
+                settings.pop(key, None)
+                if not settings: repos.pop(full_name, None)
+            self._schedule()
+
+    # --- Diskə yazma ---
+    def _schedule(self):
+        self._dirty = True
+        if self._timer is not None: return
+        self._timer = threading.Timer(self.delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """Gözləyən dəyişiklikləri dərhal yazır (dəyişiklik yoxdursa heç nə etmir); uğursuzluqda False."""
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty: return True
+                text = json.dumps(self.data, indent=4, ensure_ascii=False)
+                self._dirty = False
+            directory = os.path.dirname(os.path.abspath(self.path))
+            try:
+                fd, tmp_path = tempfile.mkstemp(prefix=".config-", suffix=".tmp", dir=directory)
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        f.write(text)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, self.path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+            except OSError as e:
+                log(f"!!! KONFİQURASİYA SAXLANMA XƏTASI: {e}")
+                with self._lock:
+                    # Növbəti dəyişiklik (və ya proqramdan çıxış) yazmanı yenidən sınayacaq
+                    self._dirty = True
+                if self.on_error: self.on_error(e)
+                return False
+        log(f"Konfiqurasiya '{self.path}' faylına yazıldı.")
+        return True
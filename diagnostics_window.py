@@ -0,0 +1,70 @@
+import time
+import customtkinter as ctk
+from tkinter import ttk
+from app_log import LOG_FILE
+from instrumentation import SPANS
+
+REFRESH_MS = 2000
+RECENT_LIMIT = 200
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:.1f}"
+
+
+class DiagnosticsWindow(ctk.CTkToplevel):
+    """Əməliyyat növlərinə görə gecikmə faizləri (p50/p90/p99) və son ölçmələr."""
+
+    def __init__(self, master):
+        super().__init__(master)
+        self.title("Diaqnostika")
+        self.geometry("950x600")
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_rowconfigure(3, weight=1)
+
+        ctk.CTkLabel(self, text="Əməliyyatlar (ms)", font=ctk.CTkFont(weight="bold"), anchor="w").grid(
+            row=0, column=0, padx=15, pady=(15, 5), sticky="ew")
+        self.stats_table = self._make_table(1, (("kind", "Növ", 60), ("name", "Əməliyyat", 330), ("count", "Say", 60),
+                                                ("p50", "p50", 80), ("p90", "p90", 80), ("p99", "p99", 80), ("max", "Maks", 80)))
+        ctk.CTkLabel(self, text="Son ölçmələr", font=ctk.CTkFont(weight="bold"), anchor="w").grid(
+            row=2, column=0, padx=15, pady=(10, 5), sticky="ew")
+        self.recent_table = self._make_table(3, (("time", "Vaxt", 80), ("kind", "Növ", 60), ("name", "Əməliyyat", 300),
+                                                 ("ms", "ms", 80), ("fields", "Detallar", 330)))
+
+        bottom = ctk.CTkFrame(self, fg_color="transparent")
+        bottom.grid(row=4, column=0, padx=15, pady=(5, 15), sticky="ew")
+        ctk.CTkLabel(bottom, text=f"Ətraflı jurnal: {LOG_FILE}", text_color="gray").pack(side="left")
+        ctk.CTkButton(bottom, text="Sıfırla", width=90, command=self._clear).pack(side="right")
+        self.refresh()
+
+    def _make_table(self, row, columns):
+        frame = ctk.CTkFrame(self, fg_color="transparent")
+        frame.grid(row=row, column=0, padx=15, sticky="nsew")
+        frame.grid_columnconfigure(0, weight=1)
+        frame.grid_rowconfigure(0, weight=1)
+        table = ttk.Treeview(frame, columns=[c[0] for c in columns], show="headings", selectmode="none")
+        for column, text, width in columns:
+            table.heading(column, text=text)
+            table.column(column, width=width, stretch=column in ("name", "fields"))
+        table.grid(row=0, column=0, sticky="nsew")
+        scrollbar = ctk.CTkScrollbar(frame, command=table.yview)
+        scrollbar.grid(row=0, column=1, sticky="ns")
+        table.configure(yscrollcommand=scrollbar.set)
+        return table
+
+    def _clear(self):
+        SPANS.clear()
+        self.refresh(reschedule=False)
+
+    def refresh(self, reschedule=True):
+        if not self.winfo_exists(): return
+        self.stats_table.delete(*self.stats_table.get_children())
+        for kind, name, count, p50, p90, p99, maximum in SPANS.stats():
+            self.stats_table.insert("", "end", values=(kind, name, count, _ms(p50), _ms(p90), _ms(p99), _ms(maximum)))
+        self.recent_table.delete(*self.recent_table.get_children())
+        for when, kind, name, seconds, fields in SPANS.recent(RECENT_LIMIT):
+            details = " ".join(f"{key}={value}" for key, value in fields.items())
+            self.recent_table.insert("", "end", values=(time.strftime("%H:%M:%S", time.localtime(when)), kind, name,
+                                                        _ms(seconds), details))
+        if reschedule: self.after(REFRESH_MS, self.refresh)
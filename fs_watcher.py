@@ -0,0 +1,281 @@
+import os
+import sys
+import errno
+import select
+import tempfile
+import struct
+import ctypes
+import ctypes.util
+import threading
+from app_log import log
+from lazy_import import lazy_module
+from instrumentation import span
+
+git = lazy_module("git")
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_ONLYDIR)
+_EVENT = struct.Struct("iIII")
+READ_SIZE = 64 * 1024
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"): return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+_libc = _load_libc()
+
+
+def is_supported():
+    return _libc is not None
+
+
+class WatcherError(OSError):
+    pass
+
+
+class RepoWatcher:
+    """Anbarın işçi qovluğunu inotify ilə izləyir və dəyişmiş yolların canlı siyahısını saxlayır.
+
+    `.git` qovluğu və `.gitignore`-a düşən qovluqlar (node_modules, build nəticələri) izlənmir. Hadisə növbəsi daşanda (IN_Q_OVERFLOW) və ya izləmə limiti
+    (`max_user_watches`) çatmayanda `needs_rescan` qurulur - növbəti commit bütün ağacı yoxlayır.
+    İzləyici başlamazdan əvvəlki dəyişikliklər məlum olmadığından ilk commit də tam yoxlamadır."""
+
+    def __init__(self, root):
+        if _libc is None: raise WatcherError(errno.ENOSYS, "inotify bu sistemdə mövcud deyil")
+        self.root = os.path.abspath(root)
+        self._fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            code = ctypes.get_errno()
+            raise WatcherError(code, os.strerror(code))
+        self._dirs = {}
+        self._changed = set()
+        self._needs_rescan = True
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._stop_r, self._stop_w = os.pipe()
+        self._thread = None
+
+    # --- İzləmələr ---
+    def _add_watch(self, rel_dir):
+        path = os.path.join(self.root, rel_dir) if rel_dir else self.root
+        wd = _libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            # Qovluq artıq silinibsə, onu silmə hadisəsi onsuz da gələcək
+            if code in (errno.ENOENT, errno.ENOTDIR): return False
+            raise WatcherError(code, os.strerror(code))
+        self._dirs[wd] = rel_dir
+        return True
+
+    def _ignored_dirs(self, rel_dirs):
+        """Verilmiş qovluqlardan `.gitignore`-a düşənlər - bütün siyahı üçün bir `git check-ignore` çağırışı."""
+        if not rel_dirs: return set()
+        # Sondakı "/" ilə yalnız qovluqlara aid qaydalar da (`build/`) uyğunlaşır
+        with _paths_file([f"{rel_dir}/" for rel_dir in rel_dirs]) as stream:
+            try:
+                output = git.Git(self.root).check_ignore("--stdin", "-z", istream=stream, with_exceptions=False)
+            except git.exc.GitCommandNotFound:
+                return set()
+        return {path.rstrip("/") for path in output.split("\0") if path}
+
+    def _add_tree(self, rel_dir):
+        """Qovluğu və bütün alt qovluqlarını (`.git` və nəzərə alınmayanlar xaric) izləməyə əlavə edir.
+
+        Ağac səviyyə-səviyyə gəzilir ki, hər səviyyənin qovluqları bir çağırışla süzülsün."""
+        if rel_dir and self._ignored_dirs([rel_dir]): return
+        if not self._add_watch(rel_dir): return
+        level = [rel_dir]
+        while level:
+            children = []
+            for parent in level:
+                try:
+                    entries = os.scandir(os.path.join(self.root, parent) if parent else self.root)
+                except OSError:
+                    continue
+                with entries:
+                    children.extend(os.path.join(parent, entry.name) if parent else entry.name for entry in entries
+                                    if entry.name != ".git" and entry.is_dir(follow_symlinks=False))
+            ignored = self._ignored_dirs(children)
+            level = [child for child in children if child not in ignored and self._add_watch(child)]
+
+    def start(self):
+        with span("watch", "start", root=self.root) as fields:
+            try:
+                self._add_tree("")
+            except WatcherError as e:
+                for fd in (self._fd, self._stop_r, self._stop_w):
+                    os.close(fd)
+                raise e
+            fields["dirs"] = len(self._dirs)
+        self._thread = threading.Thread(target=self._run, name="repo-watcher", daemon=True)
+        self._thread.start()
+        log(f"Fayl izləyicisi başladı: {self.root} ({len(self._dirs)} qovluq)")
+        return self
+
+    def stop(self):
+        if self._thread is None: return
+        os.write(self._stop_w, b"x")
+        self._thread.join(timeout=2)
+        self._thread = None
+        for fd in (self._fd, self._stop_r, self._stop_w):
+            os.close(fd)
+        log(f"Fayl izləyicisi dayandırıldı: {self.root}")
+
+    # --- Hadisələr ---
+    def _run(self):
+        while True:
+            try:
+                readable, _, _ = select.select([self._fd, self._stop_r], [], [])
+            except (OSError, ValueError):
+                return
+            if self._stop_r in readable: return
+            try:
+                data = os.read(self._fd, READ_SIZE)
+            except BlockingIOError:
+                continue
+            except OSError as e:
+                log(f"!!! FAYL İZLƏYİCİSİ XƏTASI: {e}")
+                self._mark_rescan()
+                return
+            try:
+                self._handle(data)
+            except WatcherError as e:
+                log(f"!!! FAYL İZLƏYİCİSİ LİMİTİ: {e}. Növbəti commit tam yoxlama ilə olacaq.")
+                self._mark_rescan()
+                self._notify(None)
+
+    def _handle(self, data):
+        changed = set()
+        overflow = False
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size: offset + _EVENT.size + length].rstrip(b"\0")
+            offset += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                log("Fayl izləyicisinin hadisə növbəsi daşdı - tam yoxlama lazımdır.")
+                overflow = True
+                continue
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            rel_dir = self._dirs.get(wd)
+            if rel_dir is None or not name: continue
+            rel = os.path.join(rel_dir, os.fsdecode(name)) if rel_dir else os.fsdecode(name)
+            if rel == ".git" or rel.startswith(".git" + os.sep): continue
+            changed.add(rel)
+            # Yeni (və ya köçürülmüş) qovluq: izləmə əlavə olunur, içindəkilər qovluq yolu ilə əhatə olunur
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO): self._add_tree(rel)
+        if overflow:
+            # Daşma zamanı yaradılmış qovluqlar da izlənməlidir - ağac yenidən gəzilir
+            self._mark_rescan()
+            self._add_tree("")
+            self._notify(None)
+        elif changed:
+            with self._lock:
+                self._changed |= changed
+            self._notify(changed)
+
+    def add_listener(self, callback):
+        """`callback(yollar)` hər hadisə paketindən sonra izləyici thread-ində çağırılır;
+        `yollar` None-dursa, hadisələr itib və tam yoxlama lazımdır."""
+        self._listeners.append(callback)
+
+    def _notify(self, paths):
+        for callback in list(self._listeners):
+            try:
+                callback(paths)
+            except Exception as e:
+                log(f"!!! FAYL İZLƏYİCİSİ DİNLƏYİCİ XƏTASI: {e}")
+
+    def _mark_rescan(self):
+        with self._lock:
+            self._needs_rescan = True
+            self._changed.clear()
+
+    # --- İstehlak ---
+    def take_changes(self):
+        """(tam_yoxlama_lazımdır, yollar) qaytarır və siyahını sıfırlayır."""
+        with self._lock:
+            rescan, paths = self._needs_rescan, self._changed
+            self._needs_rescan, self._changed = False, set()
+        return rescan, paths
+
+    def restore_changes(self, rescan, paths):
+        """Uğursuz commit-dən sonra götürülmüş dəyişiklikləri geri qaytarır."""
+        with self._lock:
+            self._needs_rescan = self._needs_rescan or rescan
+            self._changed |= paths
+
+    @property
+    def pending(self):
+        with self._lock:
+            return len(self._changed)
+
+
+def start_watcher(path):
+    """Dəstəklənən sistemlərdə izləyicini başladır; əks halda None (tam `git add -A` istifadə olunur)."""
+    if _libc is None: return None
+    try:
+        return RepoWatcher(path).start()
+    except WatcherError as e:
+        log(f"Fayl izləyicisi başladıla bilmədi ({e}); commit-lər tam yoxlama ilə ediləcək.")
+        return None
+
+
+def _paths_file(paths):
+    """Yolları NUL ilə ayrılmış müvəqqəti fayla yazır (`--stdin -z` / `--pathspec-from-file=-` üçün)."""
+    stream = tempfile.TemporaryFile()
+    stream.write(b"\0".join(os.fsencode(path) for path in paths))
+    stream.seek(0)
+    return stream
+
+
+def stage_paths(repo, paths):
+    """Yalnız verilmiş yolları indeksə köçürür (əlavə, dəyişiklik, silinmə) - `git add -A -- <yollar>` kimi.
+
+    `.gitignore`-a düşən izlənməyən yollar süzülür; silinmiş yollar `git rm --cached --ignore-unmatch` ilə çıxarılır.
+    Yollar komanda sətrinə deyil, stdin-ə yazılır, ona görə onların sayı məhdud deyil."""
+    root = repo.working_tree_dir
+    env = {"GIT_LITERAL_PATHSPECS": "1"}
+    existing, missing = [], []
+    for path in sorted(paths):
+        (existing if os.path.lexists(os.path.join(root, path)) else missing).append(path)
+    if existing:
+        with _paths_file(existing) as stream:
+            output = repo.git.check_ignore("--stdin", "-z", istream=stream, with_exceptions=False)
+        ignored = set(output.split("\0"))
+        existing = [path for path in existing if path not in ignored]
+    if existing:
+        with _paths_file(existing) as stream:
+            repo.git.add("-A", "--pathspec-from-file=-", "--pathspec-file-nul", istream=stream, env=env)
+    if missing:
+        with _paths_file(missing) as stream:
+            repo.git.rm("--cached", "-r", "-q", "--ignore-unmatch", "--pathspec-from-file=-", "--pathspec-file-nul",
+                        istream=stream, env=env)
+    return len(existing), len(missing)
@@ -1,16 +1,81 @@
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 import os
-import json
 import threading
-import git
-import requests
-from datetime import datetime
+import time
+import calendar
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from app_log import log
+from lazy_import import lazy_module, when_imported
+from instrumentation import instrument_git
+from ui_pump import UIUpdatePump, concat_merge
+from task_scheduler import TaskScheduler, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+from github_client import GitHubClient, API_ROOT, parse_link_header, link_page_number
+from rate_budget import RateLimitError
+from github_graphql import iter_repository_pages, GraphQLError
+from history_view import CommitRow
+from local_history import iter_log_batches
+from commit_store import CommitStore
+from state_snapshot import StateSnapshot, compact_repo
+from batch_sync import BatchRun, make_mapping, ensure_remote, STATE_OK, STATE_FAILED
+from archive_download import ResumableDownload, LocalArchiveExport, DownloadCancelled
+from fs_watcher import start_watcher, stage_paths
+from pull_options import pull_options_for, set_pull_options, describe_options, pull_with_options
+from commit_graph import CommitGraph, SIDE_LOCAL, SIDE_REMOTE
+from push_preflight import check_push, will_be_rejected, describe_preflight, HISTORY_SCAN_LIMIT
+from worktree_status import WorktreeStatus
+from commit_details import CommitDetail, DetailCache, local_changed_files, iter_local_diff, online_detail
+from history_search import CommitSearchIndex
+from config_store import ConfigStore
 
-CONFIG_FILE = "git_app_config.json"
+# Ağır kitabxanalar ilk istifadəyə qədər yüklənmir (bax: lazy_import)
+git = lazy_module("git")
+requests = lazy_module("requests")
+# GitPython yükləndiyi anda bütün git əmrləri ölçülməyə başlayır
+when_imported("git", instrument_git)
 
-def log(message):
-    print(f"[LOG] {message}")
+REPO_PAGE_SIZE = 100
+REPO_PAGE_WORKERS = 6
+HISTORY_PAGE_SIZE = 100
+LOCAL_HISTORY_PAGE_SIZE = 2000
+LOCAL_HISTORY_BATCH_SIZE = 250
+TASK_WORKERS = 4
+# GraphQL ilə yenicə alınmış tarixçə bu müddət ərzində ayrıca REST sorğusu ilə yoxlanılmır
+GRAPHQL_FRESH_SECONDS = 120
+# Seçilmiş commit-dən yuxarı və aşağı bu qədər lokal commit-in detalları fonda əvvəlcədən yüklənir
+DETAIL_PREFETCH_ROWS = 2
+# Anbara yazan əməliyyatlar (pull, commit + push, reset) bir-birini əvəz etmir - ardıcıl icra olunur
+GIT_WRITE_KEY = "git_write"
+# Fayl izləyicisi olmayan sistemlərdə işçi qovluq pəncərə fokus alanda (ən çox bu fasilə ilə) və dövri yoxlanılır
+STATUS_FOCUS_THROTTLE = 2.0
+STATUS_POLL_MS = 5000
+
+def _online_commit_row(data):
+    date = calendar.timegm(time.strptime(data['commit']['author']['date'], "%Y-%m-%dT%H:%M:%SZ"))
+    return CommitRow(data['sha'], data['commit']['message'].split('\n')[0], data['commit']['author']['name'], date,
+                     tuple(parent['sha'] for parent in data.get('parents', [])))
+
+def _commit_rows(commits, converter):
+    rows = []
+    for commit_data in commits:
+        try:
+            rows.append(converter(commit_data))
+        except Exception as e:
+            log(f"!!! COMMIT DATA PARSING ERROR: {e}")
+    return rows
+
+def _merge_worktree_updates(old, new):
+    # Eyni anbarın gözləyən fərqləri birləşir, sayğaclar isə ən sonuncudan götürülür
+    (_, (old_root, old_changes, _)), (func, (root, changes, counts)) = old, new
+    if old_root != root: return new
+    return func, (root, {**old_changes, **changes}, counts)
+
+def _merge_diff_chunks(old, new):
+    # Eyni commit-in gözləyən diff hissələri bir mətndə birləşir
+    (func, (old_sha, old_text)), (_, (sha, text)) = old, new
+    if old_sha != sha: return new
+    return func, (sha, old_text + text)
 
 class GitFunctions:
     def __init__(self, app: ctk.CTk):
@@ -20,20 +85,80 @@ class GitFunctions:
         self.target_repo_url = None
         self.active_repo_data = {}
         self.selected_commit_hash = None
-        self.full_commit_hashes = {}
-        # Konfiqurasiyaya yeni sahələr əlavə edildi
-        self.config = {
-            "token": "", 
-            "last_source_path": "",
-            "user_name": "",
-            "user_email": ""
-        }
+        # Detal panelində göstərilən commit və yüklənmiş detalların (fayllar + diff) LRU keşi
+        self._detail_sha = None
+        self.detail_cache = DetailCache()
+        # Mənbə anbarının işçi qovluğunu izləyən inotify izləyicisi (dəstəklənmirsə None)
+        self.watcher = None
+        self._watcher_lock = threading.Lock()
+        # İşçi qovluq paneli: vəziyyət modeli və növbəti yeniləmədə yoxlanılacaq yollar
+        self.worktree_status = None
+        self._status_pending = set()
+        self._status_full = False
+        self._status_lock = threading.Lock()
+        self._shown_worktree = None
+        self._last_focus_refresh = 0.0
+        # Davam edən arxiv endirmələri (yol -> ResumableDownload)
+        self._downloads = {}
+        # Toplu sinxronizasiya pəncərəsi və cari icra
+        self.batch_window = None
+        self.diagnostics_window = None
+        self._batch_run = None
+        # Tarixçə mənbəyi ("local"/"online") və səhifələmə vəziyyəti
+        self.history_source = None
+        # Son birləşmiş (lokal + onlayn) tarixçənin qrafı
+        self.commit_graph = None
+        self._history_generation = 0
+        # Commit metadatası sessiyalar arasında SQLite-da saxlanılır
+        self.commit_store = CommitStore()
+        # Cari tarixçənin axtarış indeksi: anbara yazılan yeni commitlər ona dərhal əlavə olunur
+        self.history_index = CommitSearchIndex()
+        self._search_key = None
+        self._search_query = ""
+        self.commit_store.on_change = self._on_store_change
+        # Son məlum vəziyyət: başlanğıcda dərhal göstərilir, sonra fonda yenilənir
+        self.snapshot = StateSnapshot()
+        self._shown_repos = {}
+        # GraphQL ilə son commitləri bu yaxında alınmış depolar (full_name -> monotonic vaxt)
+        self._graphql_synced = {}
+        # Bütün GitHub sorğuları üçün ortaq, keşli HTTP müştərisi
+        self.github = GitHubClient()
+        # İşçi thread-lər Tk-ya birbaşa deyil, bu növbə vasitəsilə müraciət edir
+        self.ui = UIUpdatePump(app)
+        self.ui.start()
+        self._history_merge = concat_merge(self._update_commit_history_ui, compatible=lambda old, new: old[2] == new[2])
+        self._repo_list_merge = concat_merge(self._update_repo_list_ui)
+        # Bütün fon tapşırıqları bu məhdud növbədən keçir
+        self.scheduler = TaskScheduler(max_workers=TASK_WORKERS, on_queue_change=self._on_queue_change)
+        # Fon prioritetli tapşırıqların sorğuları API limitinə qənaətlə göndərilir
+        self.github.is_interactive = self._is_interactive_task
+        self.github.budget.on_change = lambda budget: self.ui.post(self._update_budget_ui, key="rate_budget")
+        # Canlı konfiqurasiya yaddaşdadır; diskə fonda, atomik və birləşdirilmiş şəkildə yazılır
+        self.config = ConfigStore()
+        self.config.on_error = lambda e: self._post_status(f"Ayarları yadda saxlamaq mümkün olmadı: {e}", "orange")
         log("GitFunctions obyekti yaradıldı.")
 
     def _update_status(self, text, color="white"):
         if self.app.winfo_exists():
             self.app.status_bar.configure(text=text, text_color=color)
 
+    def _ask_ui(self, func, *args, **kwargs):
+        """Dialoqu (məs. messagebox.askyesno) UI thread-ində göstərir və cavabı işçi thread-ində gözləyir."""
+        done = threading.Event()
+        answer = []
+        def ask():
+            try:
+                answer.append(func(*args, **kwargs))
+            finally:
+                done.set()
+        self.ui.post(ask)
+        done.wait()
+        return answer[0] if answer else None
+
+    def _post_status(self, text, color="white"):
+        # Status sətrində yalnız ən son mətn göstərilir, aradakılar birləşdirilir
+        self.ui.post(self._update_status, text, color, key="status")
+
     def _update_info_labels(self, source_text=None, target_text=None):
         try:
             if source_text is not None: self.app.source_label.configure(text=source_text)
@@ -43,112 +168,250 @@ class GitFunctions:
 
     def _update_repo_list_ui(self, repos):
         if not self.app.winfo_exists(): return
-        for widget in self.app.repo_list_frame.winfo_children():
-            widget.destroy()
-        for repo in sorted(repos, key=lambda x: x['name']):
-            ctk.CTkButton(
-                self.app.repo_list_frame, text=repo['name'], fg_color="transparent",
-                border_width=1, anchor="w",
-                command=self.run_in_thread(self.handle_select_target_repo, repo)
-            ).pack(fill="x", padx=5, pady=3)
+        self.app.repo_list.set_repos(repos)
         self._update_status(f"{len(repos)} depo tapıldı. Əməliyyat üçün seçin.", "lightgreen")
 
-    def _update_commit_history_ui(self, commits, source_type="online"):
+    def _post_repo_list(self, func, repos):
+        self.ui.post(func, repos, key="repo_list", merge=self._repo_list_merge)
+
+    def _add_repos_to_list_ui(self, repos):
+        """Gələn səhifədəki depoları indeksə əlavə edir; siyahı yalnız görünən sətirləri yenidən çəkir."""
         if not self.app.winfo_exists(): return
-        self.full_commit_hashes.clear()
-        for item in self.app.commit_history_table.get_children():
-            self.app.commit_history_table.delete(item)
-        if not commits: return
-        for commit_data in commits:
-            try:
-                if source_type == "local" and isinstance(commit_data, git.Commit):
-                    sha_full, msg, author, date_str = (commit_data.hexsha, commit_data.summary, commit_data.author.name, datetime.fromtimestamp(commit_data.authored_date).strftime('%Y-%m-%d %H:%M'))
-                elif source_type == "online":
-                    sha_full, msg, author, date_str = (commit_data['sha'], commit_data['commit']['message'].split('\n')[0], commit_data['commit']['author']['name'], datetime.strptime(commit_data['commit']['author']['date'], "%Y-%m-%dT%H:%M:%SZ").strftime('%Y-%m-%d %H:%M'))
-                else: continue
-                sha_short = sha_full[:8]
-                self.full_commit_hashes[sha_short] = sha_full
-                self.app.commit_history_table.insert("", "end", values=(sha_short, msg, author, date_str))
-            except Exception as e:
-                log(f"!!! COMMIT DATA PARSING ERROR: {e}")
-
-    def run_in_thread(self, func, *args, **kwargs):
+        self.app.repo_list.add_repos(repos)
+
+    def _update_commit_history_ui(self, rows, has_more=False, generation=None):
+        if not self.app.winfo_exists(): return
+        if generation is not None and generation != self._history_generation: return
+        self.app.history_view.set_rows(rows, has_more)
+        # Süzgəc yeni sətirlər üçün yenidən hesablanır (aktiv sorğu varsa)
+        self._refresh_search()
+
+    def _append_commit_history_ui(self, rows, has_more, generation):
+        if not self.app.winfo_exists() or generation != self._history_generation: return
+        self.app.history_view.append_rows(rows, has_more)
+
+    def _post_history(self, func, rows, has_more, generation):
+        # Gözləyən cədvəl yeniləmələri birləşir: əvəzetmə köhnələri silir, paketlər bir-birinə qoşulur
+        self.ui.post(func, rows, has_more, generation, key="history_table", merge=self._merge_history_updates)
+
+    def _merge_history_updates(self, old, new):
+        if old[1][2] > new[1][2]: return old  # köhnə nəsildən gecikmiş yeniləmə
+        return self._history_merge(old, new)
+
+    def _begin_history(self, source_type):
+        """Yeni tarixçə mənbəyinə keçid: köhnə səhifə yükləmələrinin nəticələri atılacaq."""
+        self._history_generation += 1
+        self.history_source = source_type
+        if self.snapshot.get("history_source") != source_type:
+            self.snapshot.update(history_source=source_type)
+        return self._history_generation
+
+    def handle_repo_click(self, repo):
+        self.run_in_thread(self.handle_select_target_repo, repo, key="select_target")()
+
+    def run_in_thread(self, func, *args, key=None, priority=PRIORITY_INTERACTIVE, replace=True, **kwargs):
+        """Tapşırığı planlayıcıya göndərən callback qaytarır; eyni `key` ilə yeni çağırış köhnəsini əvəz edir
+        (`replace=False` olduqda isə ondan sonra növbəyə düzülür)."""
         def wrapper():
-            log(f"'{func.__name__}' funksiyası üçün yeni thread yaradılır.")
-            self.app.connect_button.configure(state="disabled")
-            thread = threading.Thread(target=self._run_task_with_finally, args=(func, args, kwargs), daemon=True)
-            thread.start()
+            self.scheduler.submit(func, *args, key=key, priority=priority, replace=replace, **kwargs)
         return wrapper
 
-    def _run_task_with_finally(self, func, args, kwargs):
-        log(f"Thread başladı: '{func.__name__}' icra edilir.")
-        try:
-            func(*args, **kwargs)
-            log(f"Thread uğurla tamamlandı: '{func.__name__}'.")
-        except Exception as e:
-            log(f"!!! THREAD XƏTASI '{func.__name__}': {e}")
-        finally:
-            if self.app.winfo_exists():
-                self.app.connect_button.configure(state="normal")
-            log(f"Thread sonlandı: '{func.__name__}' və düymələr aktiv edildi.")
+    def _on_queue_change(self, waiting, running):
+        self.ui.post(self._update_queue_ui, waiting, running, key="queue")
+
+    def _update_queue_ui(self, waiting, running):
+        if not self.app.winfo_exists(): return
+        busy = waiting + running > 0
+        # Fon tapşırıqları (izləyici, indeks, endirmələr) düyməni bloklamır - yalnız gedən qoşulma
+        self.app.connect_button.configure(state="disabled" if self.scheduler.is_pending("connect") else "normal")
+        self.app.queue_label.configure(text=f"Tapşırıqlar: {running} icrada, {waiting} növbədə" if busy else "")
+
+    def _is_interactive_task(self):
+        task = self.scheduler.current_task()
+        return task is None or task.priority < PRIORITY_BACKGROUND
+
+    def _update_budget_ui(self):
+        limit, remaining, _, _ = self.github.budget.snapshot()
+        low = remaining is not None and limit and remaining < limit * 0.1
+        self.app.rate_label.configure(text=self.github.budget.describe(), text_color="orange" if low else "gray")
+
+    def handle_open_diagnostics(self):
+        from diagnostics_window import DiagnosticsWindow
+        if self.diagnostics_window and self.diagnostics_window.winfo_exists():
+            self.diagnostics_window.focus()
+            return
+        self.diagnostics_window = DiagnosticsWindow(self.app)
 
     def save_config(self):
-        log("Konfiqurasiya saxlanılır...")
-        self.config['token'] = self.app.token_entry.get()
-        self.config['last_source_path'] = self.source_repo_path
-        # Yeni məlumatları da yadda saxla
-        self.config['user_name'] = self.app.user_name_entry.get()
-        self.config['user_email'] = self.app.user_email_entry.get()
-        try:
-            with open(CONFIG_FILE, "w") as f:
-                json.dump(self.config, f, indent=4)
-            log(f"Konfiqurasiya '{CONFIG_FILE}' faylına yazıldı.")
-            self.app.after(0, self._update_status, "Ayarlar yadda saxlanıldı!", "lightgreen")
-        except Exception as e:
-            log(f"!!! KONFİQURASİYA SAXLANMA XƏTASI: {e}")
+        # Düymədən (UI thread-indən) çağırılır; yalnız yaddaş yenilənir - diskə yazma fonda baş verir
+        self.config.set(token=self.app.token_entry.get(), last_source_path=self.source_repo_path or "",
+                        user_name=self.app.user_name_entry.get(), user_email=self.app.user_email_entry.get(),
+                        use_graphql=bool(self.app.graphql_checkbox.get()))
+        self._post_status("Ayarlar yadda saxlanıldı!", "lightgreen")
 
     def load_config(self):
         log("Konfiqurasiya yüklənir...")
-        if not os.path.exists(CONFIG_FILE): return
+        if not self.config.load(): return
         try:
-            with open(CONFIG_FILE, "r") as f:
-                self.config = json.load(f)
-            log("Konfiqurasiya faylı uğurla oxundu.")
+            log(f"Konfiqurasiya faylı uğurla oxundu (profil: {self.config.profile_name}).")
             # Yadda saxlanmış məlumatları UI-a yüklə
             self.app.token_entry.insert(0, self.config.get("token", ""))
             self.app.user_name_entry.insert(0, self.config.get("user_name", ""))
             self.app.user_email_entry.insert(0, self.config.get("user_email", ""))
-            
+            if self.config.get("use_graphql"): self.app.graphql_checkbox.select()
+            self._restore_snapshot()
+
             last_path = self.config.get("last_source_path")
             if last_path and os.path.exists(last_path):
-                self.load_source_repo(last_path)
+                # Anbarın açılması UI thread-ini bloklamır; son baxılan tarixçə onlayn idisə, o saxlanılır
+                show_history = self.snapshot.get("history_source") != "online"
+                self.run_in_thread(self.load_source_repo, last_path, interactive=False, show_history=show_history,
+                                   key="source_repo")()
             if self.config.get("token"):
-                self.run_in_thread(self.handle_connect_account)()
+                self.run_in_thread(self._connect_account_task, self.config.get("token"), key="connect",
+                                   priority=PRIORITY_BACKGROUND)()
+                self._revalidate_target()
         except Exception as e:
             log(f"!!! KONFİQURASİYA YÜKLƏNMƏ XƏTASI: {e}")
 
+    def _restore_snapshot(self):
+        """Son sessiyanın depo siyahısını, hədəfini və tarixçəsini şəbəkəni gözləmədən göstərir."""
+        self.snapshot.load()
+        repos = self.snapshot.get("repos") or []
+        if repos:
+            self._shown_repos = {repo['full_name']: repo for repo in repos}
+            self.app.repo_list.set_repos(repos)
+            self._update_status(f"{len(repos)} depo (yadda saxlanmış siyahı). Yenilənir...", "gray")
+        target = self.snapshot.get("selected_target")
+        if target:
+            self.target_repo_url = target['clone_url']
+            self.active_repo_data = target
+            self._update_info_labels(None, f"Hədəf (Onlayn): {target['name']}")
+            if self.snapshot.get("history_source") == "online":
+                self.history_source = "online"
+                rows = self.commit_store.page(target['full_name'], 0, HISTORY_PAGE_SIZE)
+                self.app.history_view.set_rows(rows, self._store_has_more(target['full_name'], len(rows)))
+                self._reset_search_index(target['full_name'])
+        log(f"Vəziyyət surəti bərpa edildi: {len(repos)} depo.")
+
+    def _revalidate_target(self):
+        target = self.active_repo_data
+        if target and self.snapshot.get("history_source") == "online":
+            self.run_in_thread(self.fetch_online_commits, target, key="history", priority=PRIORITY_BACKGROUND)()
+
     def handle_connect_account(self):
+        # Tk vidjetləri yalnız UI thread-indən oxunur - token tapşırığa dəyər kimi ötürülür
         token = self.app.token_entry.get()
         if not token:
-            self.app.after(0, self._update_status, "Xəta: Access Token daxil edilməyib.", "orange")
+            self._update_status("Xəta: Access Token daxil edilməyib.", "orange")
             return
+        self.run_in_thread(self._connect_account_task, token, key="connect")()
+
+    def _connect_account_task(self, token):
         # ... (bu funksiyanın qalan hissəsi dəyişmir)
-        self.app.after(0, self._update_status, "GitHub hesabına qoşulunur...", "yellow")
-        headers = {"Authorization": f"token {token}"}
+        self._post_status("GitHub hesabına qoşulunur...", "yellow")
+        self.github.set_token(token)
+        url = f"{API_ROOT}/user/repos"
+        # Siyahı artıq göstərilirsə (surətdən və ya əvvəlki qoşulmadan), yalnız fərqlər tətbiq olunur
+        revalidating = bool(self._shown_repos)
+        # Hovuz thread-ləri tapşırığın prioritetini görmür, ona görə bir dəfə müəyyən edilib ötürülür
+        interactive = self._is_interactive_task()
         try:
-            repos_data, page = [], 1
-            while True:
-                url = f"https://api.github.com/user/repos?page={page}&per_page=100"
-                response = requests.get(url, headers=headers)
+            repos_data = None
+            if self.config.get("use_graphql"):
+                try:
+                    repos_data = self._fetch_repos_graphql(revalidating, interactive)
+                except (GraphQLError, KeyError, TypeError, requests.exceptions.HTTPError) as e:
+                    # Tokenin GraphQL icazəsi yoxdursa (401/403), son nöqtə xəta verirsə və ya sxem dəyişibsə
+                    # REST ilə davam edilir
+                    log(f"!!! GRAPHQL XƏTASI, REST istifadə olunur: {e}")
+            if repos_data is None:
+                repos_data = self._fetch_repos_rest(url, revalidating, interactive)
+            if revalidating:
+                self._apply_repo_revalidation(repos_data)
+            else:
+                self._shown_repos = {repo['full_name']: repo for repo in repos_data}
+                self._post_status(f"{len(repos_data)} depo tapıldı. Əməliyyat üçün seçin.", "lightgreen")
+            self.snapshot.update(repos=repos_data)
+            self.config.set(token=token)
+        except (requests.exceptions.RequestException, RateLimitError) as e:
+            if revalidating:
+                self._post_status(f"GitHub əlçatmazdır, yadda saxlanmış siyahı göstərilir: {e}", "orange")
+            else:
+                self._post_status(f"GitHub API xətası: {e}", "orange")
+
+    def _fetch_repos_rest(self, url, revalidating, interactive):
+        # Birinci səhifə dərhal göstərilir, qalanlarının sayı `Link` başlığından öyrənilir
+        response = self.github.get(url, params={"page": 1, "per_page": REPO_PAGE_SIZE}, interactive=interactive)
+        response.raise_for_status()
+        repos_data = [compact_repo(repo) for repo in response.json()]
+        if not revalidating: self._post_repo_list(self._update_repo_list_ui, list(repos_data))
+
+        links = parse_link_header(response.headers.get("Link"))
+        last_page = link_page_number(links["last"]) if "last" in links else None
+        if last_page and last_page > 1:
+            log(f"Depo siyahısı {last_page} səhifədir, qalanları paralel çəkilir...")
+            with ThreadPoolExecutor(max_workers=REPO_PAGE_WORKERS) as executor:
+                futures = [executor.submit(self._fetch_repo_page, url, page, interactive) for page in range(2, last_page + 1)]
+                for future in as_completed(futures):
+                    page_data = future.result()
+                    repos_data.extend(page_data)
+                    if not revalidating: self._post_repo_list(self._add_repos_to_list_ui, page_data)
+                    self._post_status(f"{len(repos_data)} depo yükləndi...", "yellow")
+        else:
+            # `last` linki olmayan halda köhnə ardıcıl üsulla davam edirik
+            page = 2
+            while "next" in links:
+                response = self.github.get(url, params={"page": page, "per_page": REPO_PAGE_SIZE}, interactive=interactive)
                 response.raise_for_status()
-                data = response.json()
-                if not data: break
-                repos_data.extend(data)
+                page_data = [compact_repo(repo) for repo in response.json()]
+                if not page_data: break
+                repos_data.extend(page_data)
+                if not revalidating: self._post_repo_list(self._add_repos_to_list_ui, page_data)
+                links = parse_link_header(response.headers.get("Link"))
                 page += 1
-            self.app.after(0, self._update_repo_list_ui, repos_data)
-            self.save_config()
-        except requests.exceptions.RequestException as e:
-            self.app.after(0, self._update_status, f"GitHub API xətası: {e}", "orange")
+        return repos_data
+
+    def _fetch_repos_graphql(self, revalidating, interactive):
+        """Depo siyahısı və hər deponun son commitləri bir neçə toplu GraphQL sorğusu ilə çəkilir."""
+        repos_data, requests_made = [], 0
+        for page in iter_repository_pages(self.github, interactive=interactive):
+            requests_made += 1
+            page_data = [repo for repo, _ in page]
+            for repo, history in page:
+                if history is None: continue
+                self._sync_online_store(repo['full_name'], *history)
+                self._graphql_synced[repo['full_name']] = time.monotonic()
+            if not repos_data and not revalidating:
+                self._post_repo_list(self._update_repo_list_ui, list(page_data))
+            elif not revalidating:
+                self._post_repo_list(self._add_repos_to_list_ui, page_data)
+            repos_data.extend(page_data)
+            self._post_status(f"{len(repos_data)} depo yükləndi (GraphQL)...", "yellow")
+        log(f"GraphQL: {len(repos_data)} depo və son commitləri {requests_made} sorğu ilə alındı.")
+        return repos_data
+
+    def _apply_repo_revalidation(self, repos_data):
+        fresh = {repo['full_name']: repo for repo in repos_data}
+        added = [repo for name, repo in fresh.items() if name not in self._shown_repos]
+        removed = [name for name in self._shown_repos if name not in fresh]
+        changed = [name for name, repo in fresh.items() if name in self._shown_repos and self._shown_repos[name] != repo]
+        self._shown_repos = fresh
+        if not (added or removed or changed):
+            self._post_status(f"{len(repos_data)} depo. Siyahı aktualdır.", "lightgreen")
+            return
+        log(f"Depo siyahısı fərqləri: +{len(added)} -{len(removed)} ~{len(changed)}")
+        if removed or changed:
+            # Silinən/dəyişən depolar indeksin yenidən qurulmasını tələb edir, süzgəc və mövqe qorunur
+            self.ui.post(self.app.repo_list.set_repos, repos_data, key="repo_list")
+        else:
+            self._post_repo_list(self._add_repos_to_list_ui, added)
+        self._post_status(f"{len(repos_data)} depo (+{len(added)} yeni, -{len(removed)} silinmiş, {len(changed)} dəyişmiş).", "lightgreen")
+
+    def _fetch_repo_page(self, url, page, interactive=None):
+        response = self.github.get(url, params={"page": page, "per_page": REPO_PAGE_SIZE}, interactive=interactive)
+        response.raise_for_status()
+        return [compact_repo(repo) for repo in response.json()]
 
     def handle_select_source_folder(self):
         folder_path = filedialog.askdirectory(title="Lokal Git anbarını seçin")
@@ -161,7 +424,7 @@ class GitFunctions:
         user_name = self.config.get("user_name")
         user_email = self.config.get("user_email")
         if not user_name or not user_email:
-            self.app.after(0, messagebox.showwarning, "Eksik Məlumat", "Davam etmək üçün 'Git İstifadəçi Məlumatları' bölməsini doldurun və yadda saxlayın.")
+            self.ui.post(messagebox.showwarning, "Eksik Məlumat", "Davam etmək üçün 'Git İstifadəçi Məlumatları' bölməsini doldurun və yadda saxlayın.")
             return False
         
         try:
@@ -174,10 +437,13 @@ class GitFunctions:
             log(f"!!! GIT KONFİQURASİYA XƏTASI: {e}")
             return False
 
-    def load_source_repo(self, path):
+    def load_source_repo(self, path, interactive=True, show_history=True):
         log(f"Lokal anbar yüklənir: {path}")
         try:
             if not os.path.exists(os.path.join(path, '.git')):
+                if not interactive:
+                    log("Son istifadə edilən qovluq artıq Git anbarı deyil, bərpa edilmədi.")
+                    return False
                 if messagebox.askyesno("Git Anbarı Tapılmadı", f"'{os.path.basename(path)}' qovluğu bir Git anbarı deyil.\nYeni bir anbar yaradılsınmı?"):
                     self.repo_object = git.Repo.init(path)
                     log("Yeni lokal anbar yaradıldı.")
@@ -191,128 +457,640 @@ class GitFunctions:
                 return False
 
             self.source_repo_path = path
-            self.app.after(0, self._update_info_labels, f"Mənbə (Lokal): {os.path.basename(path)}", None)
-            self.app.after(0, self.app.source_path_label.configure, {"text": path, "text_color": "white"})
-            self.run_in_thread(self.populate_local_commit_history)()
-            self.save_config()
+            self.ui.post(self._update_info_labels, f"Mənbə (Lokal): {os.path.basename(path)}", None)
+            self.ui.post(self.app.source_path_label.configure, {"text": path, "text_color": "white"})
+            if show_history: self.run_in_thread(self.populate_local_commit_history, key="history")()
+            self.run_in_thread(self._start_watcher, path, key="watcher", priority=PRIORITY_BACKGROUND)()
+            self.request_status_refresh()
+            self.refresh_push_state()
+            if interactive: self.config.set(last_source_path=path)
             return True
         except Exception as e:
             log(f"!!! LOKAL ANBAR YÜKLƏMƏ XƏTASI: {e}")
-            messagebox.showerror("Xəta", f"Anbarı yükləmək mümkün olmadı: {e}")
+            if interactive:
+                messagebox.showerror("Xəta", f"Anbarı yükləmək mümkün olmadı: {e}")
+            else:
+                self._post_status(f"Son lokal anbarı yükləmək mümkün olmadı: {e}", "orange")
             return False
 
+    def _start_watcher(self, path):
+        """Böyük ağaclarda qovluqların gəzilməsi uzun çəkə bilər, ona görə fonda işləyir."""
+        with self._watcher_lock:
+            if self.watcher and self.watcher.root == os.path.abspath(path): return
+            if self.watcher: self.watcher.stop()
+            self.watcher = None
+        watcher = start_watcher(path)
+        with self._watcher_lock:
+            # Gözləmə ərzində başqa anbar seçilibsə, bu izləyici lazım deyil
+            if watcher and os.path.abspath(self.source_repo_path or "") != watcher.root:
+                watcher.stop()
+                return
+            self.watcher = watcher
+        if watcher:
+            watcher.add_listener(lambda paths: self.request_status_refresh(None if paths is None else set(paths)))
+            # İzləyici qurulana qədər baş vermiş dəyişikliklər üçün
+            self.request_status_refresh()
+
+    # --- İşçi qovluğun vəziyyəti ---
+    def request_status_refresh(self, paths=None):
+        """Panelin yenilənməsini planlaşdırır; `paths` None-dursa tam `git status`. İstənilən thread-dən çağırıla bilər.
+
+        Gözləyən sorğular bir tapşırıqda birləşir, ona görə redaktorun ardıcıl yazmaları ayrı-ayrı yoxlanılmır."""
+        with self._status_lock:
+            if paths is None: self._status_full = True
+            else: self._status_pending |= paths
+        self.run_in_thread(self._refresh_status_task, key="worktree_status", priority=PRIORITY_BACKGROUND)()
+
+    def handle_window_focus(self, event=None):
+        """Pəncərə fokus alanda: başqa proqramda edilmiş dəyişikliklər üçün vəziyyət yenilənir.
+
+        Fokus pəncərənin hər elementi üçün ayrıca gəlir, ona görə yeniləmələr seyrəldilir."""
+        if not self.repo_object: return
+        now = time.monotonic()
+        if now - self._last_focus_refresh < STATUS_FOCUS_THROTTLE: return
+        self._last_focus_refresh = now
+        self.request_status_refresh()
+
+    def start_status_poll(self):
+        """İzləyici olmadıqda (inotify yalnız Linux-dadır) işçi qovluq dövri olaraq yoxlanılır."""
+        if not self.app.winfo_exists(): return
+        if self.repo_object and self.watcher is None: self.request_status_refresh()
+        self.app.after(STATUS_POLL_MS, self.start_status_poll)
+
+    def _refresh_status_task(self):
+        repo = self.repo_object
+        if not repo: return
+        with self._status_lock:
+            full, paths = self._status_full, self._status_pending
+            self._status_full, self._status_pending = False, set()
+        status = self.worktree_status
+        if status is None or status.root != os.path.abspath(repo.working_tree_dir):
+            status = self.worktree_status = WorktreeStatus(repo)
+            full = True
+        try:
+            changes = status.refresh() if full else status.refresh_paths(paths)
+        except git.GitCommandError as e:
+            log(f"!!! GIT STATUS XƏTASI: {e}")
+            return
+        if changes or full:
+            self.ui.post(self._update_worktree_ui, status.root, changes, status.counts(), key="worktree_panel",
+                         merge=_merge_worktree_updates)
+
+    def _update_worktree_ui(self, root, changes, counts):
+        if not self.app.winfo_exists(): return
+        if self.worktree_status is None or root != self.worktree_status.root: return
+        if root != self._shown_worktree:
+            self.app.worktree_panel.clear()
+            self._shown_worktree = root
+        self.app.worktree_panel.apply(changes, counts)
+
+    def _stage_changes(self):
+        """İzləyicinin topladığı yolları indeksə əlavə edir; izləyici yoxdursa və ya daşıbsa `git add -A`."""
+        with self._watcher_lock:
+            watcher = self.watcher
+        if watcher is None or watcher.root != os.path.abspath(self.repo_object.working_dir):
+            self.repo_object.git.add(A=True)
+            return None
+        rescan, paths = watcher.take_changes()
+        try:
+            if rescan:
+                log("Tam yoxlama ilə indeksləmə (git add -A)...")
+                self.repo_object.git.add(A=True)
+            elif paths:
+                existing, missing = stage_paths(self.repo_object, paths)
+                log(f"Yalnız dəyişmiş yollar indeksləndi: {existing} mövcud, {missing} silinmiş.")
+        except git.GitCommandError as e:
+            log(f"!!! QİSMƏN İNDEKSLƏMƏ XƏTASI: {e}. Tam yoxlama edilir.")
+            self.repo_object.git.add(A=True)
+        return watcher, rescan, paths
+
+    def _local_store_key(self):
+        return f"local:{os.path.abspath(self.repo_object.working_dir)}"
+
+    def _store_has_more(self, key, shown):
+        return shown < self.commit_store.count(key) or not self.commit_store.is_complete(key)
+
+    def _show_cached_history(self, key, page_size, generation):
+        """Anbarda olan tarixçəni şəbəkəyə/git-ə müraciət etmədən dərhal göstərir."""
+        rows = self.commit_store.page(key, 0, page_size)
+        if rows:
+            self._post_history(self._update_commit_history_ui, rows, self._store_has_more(key, len(rows)), generation)
+        return rows
+
     def populate_local_commit_history(self):
-        # ... (bu funksiya dəyişmir)
         if not self.repo_object: return
+        generation = self._begin_history("local")
+        key = self._local_store_key()
+        self._reset_search_index(key)
+        self._show_cached_history(key, LOCAL_HISTORY_PAGE_SIZE, generation)
         try:
-            commits = list(self.repo_object.iter_commits('main', max_count=100))
-            self.app.after(0, self._update_commit_history_ui, commits, "local")
+            head = self.repo_object.git.rev_parse('main')
         except git.exc.GitCommandError:
-            self.app.after(0, self._update_commit_history_ui, [], "local")
+            head = None
+        stored_head = self.commit_store.head(key)
+        if head and head == stored_head:
+            log("Lokal tarixçə dəyişməyib, anbardakı nəticə göstərildi.")
+            return
+        if head and stored_head and self._is_local_ancestor(stored_head, head):
+            # Yalnız anbardakı ən yeni commitdən sonrakı commitlər oxunur
+            new_rows = [row for batch in iter_log_batches(self.repo_object.working_dir, f"{stored_head}..{head}") for row in batch]
+            if not self._is_log_prefix(head, new_rows):
+                # Birləşdirilmiş köhnə tarixli commitlər tarixçənin ortasına düşür - anbar mövqeyə görə
+                # səhifələndiyi üçün sıra yenidən qurulur
+                self._stream_local_history(head, 0, generation, replace=True)
+                return
+            self.commit_store.prepend(key, new_rows)
+            log(f"{len(new_rows)} yeni lokal commit anbara əlavə edildi.")
+            if self.scheduler.is_cancelled(): return
+            self._show_cached_history(key, LOCAL_HISTORY_PAGE_SIZE, generation)
+            return
+        self._stream_local_history(head or 'main', 0, generation, replace=True)
+
+    def _is_log_prefix(self, head, rows):
+        """`rows` `git log head`-in ilk sətirləridirsə True (yəni anbarın başına əlavə etmək sıranı pozmur)."""
+        if not rows: return True
+        with closing(iter_log_batches(self.repo_object.working_dir, head, max_count=len(rows), batch_size=len(rows))) as batches:
+            top = next(batches, [])
+        return [row.sha for row in top] == [row.sha for row in rows]
+
+    def _is_local_ancestor(self, ancestor, descendant):
+        try:
+            return self.repo_object.is_ancestor(ancestor, descendant)
+        except git.exc.GitCommandError:
+            return False
+
+    def _stream_local_history(self, rev, skip, generation, replace, max_count=LOCAL_HISTORY_PAGE_SIZE):
+        """Lokal tarixçəni bir `git log` prosesindən oxuyur; paketlər gəldikcə cədvələ və anbara yazılır."""
+        key = self._local_store_key()
+        count = read = 0
+        try:
+            batches = iter_log_batches(self.repo_object.working_dir, rev, skip=skip,
+                                       max_count=max_count, batch_size=LOCAL_HISTORY_BATCH_SIZE)
+            with closing(batches):
+                for batch in batches:
+                    if generation != self._history_generation or self.scheduler.is_cancelled(): return
+                    read += len(batch)
+                    if replace and count == 0:
+                        self.commit_store.replace(key, batch)
+                        self._post_history(self._update_commit_history_ui, batch, False, generation)
+                    else:
+                        batch = self.commit_store.append(key, batch)
+                        self._post_history(self._append_commit_history_ui, batch, False, generation)
+                    count += len(batch)
+        except git.exc.GitCommandError as e:
+            log(f"Lokal 'main' tarixçəsi oxunmadı: {e}")
+        complete = read < max_count
+        if replace and count == 0:
+            self.commit_store.clear(key)
+            self._post_history(self._update_commit_history_ui, [], False, generation)
+        else:
+            if complete: self.commit_store.mark_complete(key)
+            self._post_history(self._append_commit_history_ui, [], not complete, generation)
 
     def handle_select_target_repo(self, repo_data):
         # ... (bu funksiya dəyişmir)
         self.target_repo_url = repo_data['clone_url']
         self.active_repo_data = repo_data
-        self.app.after(0, self._update_info_labels, None, f"Hədəf (Onlayn): {repo_data['name']}")
-        self.run_in_thread(self.fetch_online_commits, repo_data)()
+        self.snapshot.update(selected_target=repo_data)
+        self.ui.post(self._update_info_labels, None, f"Hədəf (Onlayn): {repo_data['name']}")
+        self.run_in_thread(self.fetch_online_commits, repo_data, key="history")()
+        self.refresh_push_state()
 
     def fetch_online_commits(self, repo_data):
-        # ... (bu funksiya dəyişmir)
-        token = self.app.token_entry.get()
-        headers = {"Authorization": f"token {token}"}
-        url = repo_data['commits_url'].replace('{/sha}', '')
+        self.github.set_token(self.config.get("token"))
+        generation = self._begin_history("online")
+        key = repo_data['full_name']
+        self._reset_search_index(key)
+        cached = self._show_cached_history(key, HISTORY_PAGE_SIZE, generation)
+        synced_at = self._graphql_synced.get(key)
+        if cached and synced_at and time.monotonic() - synced_at < GRAPHQL_FRESH_SECONDS:
+            return
         try:
-            response = requests.get(f"{url}?per_page=100", headers=headers)
-            response.raise_for_status()
-            commits = response.json()
-            self.app.after(0, self._update_commit_history_ui, commits, "online")
+            # Dəyişiklik yoxdursa bu sorğu 304 ilə qayıdır və limitdən yemir
+            rows, has_more = self._fetch_online_history_page(repo_data, {"per_page": HISTORY_PAGE_SIZE})
+            if self.scheduler.is_cancelled(): return
+            if self._sync_online_store(key, rows, has_more) or not cached:
+                if not self._show_cached_history(key, HISTORY_PAGE_SIZE, generation):
+                    self._post_history(self._update_commit_history_ui, [], False, generation)
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 409:
-                self.app.after(0, self._update_commit_history_ui, [], "online")
-                self.app.after(0, self._update_status, f"'{repo_data['name']}' anbarı boşdur.", "gray")
+                self.commit_store.clear(key)
+                self._post_history(self._update_commit_history_ui, [], False, generation)
+                self._post_status(f"'{repo_data['name']}' anbarı boşdur.", "gray")
+        except RateLimitError as e:
+            log(f"!!! ONLAYN TARİXÇƏ: {e}")
+            self._post_status(f"{e} Yadda saxlanmış tarixçə göstərilir." if cached else str(e), "orange")
+        except requests.exceptions.RequestException as e:
+            log(f"!!! ONLAYN TARİXÇƏ XƏTASI: {e}")
+            if cached: self._post_status("Şəbəkə əlçatmazdır, yadda saxlanmış tarixçə göstərilir.", "orange")
+
+    def _sync_online_store(self, key, rows, has_more):
+        """Birinci səhifəni anbarla tutuşdurur; anbar dəyişibsə True qaytarır."""
+        stored_head = self.commit_store.head(key)
+        if rows and rows[0].sha == stored_head: return False
+        shas = [row.sha for row in rows]
+        if stored_head in shas:
+            new_rows = self.commit_store.prepend(key, rows[:shas.index(stored_head)])
+            log(f"'{key}' üçün {len(new_rows)} yeni commit anbara əlavə edildi.")
+        else:
+            # İlk dəfə açılır, bir səhifədən çox yeni commit var və ya tarixçə yenidən yazılıb
+            self.commit_store.replace(key, rows, complete=not has_more)
+        return True
+
+    def _fetch_online_history_page(self, repo_data, params):
+        url = repo_data['commits_url'].replace('{/sha}', '')
+        response = self.github.get(url, params=params)
+        response.raise_for_status()
+        has_more = "next" in parse_link_header(response.headers.get("Link"))
+        return _commit_rows(response.json(), _online_commit_row), has_more
+
+    # --- Birləşmiş tarixçə ---
+    def handle_show_merged_history(self):
+        if not self.source_repo_path or not self.active_repo_data:
+            messagebox.showwarning("Eksik Məlumat", "Müqayisə üçün həm lokal anbar, həm də onlayn depo seçin.")
+            return
+        self.run_in_thread(self._merged_history_task, self.active_repo_data, key="history")()
+
+    def _full_local_history(self):
+        """Lokal 'main'-in bütün tarixçəsi: anbardakı tam və aktual nəticə, yoxdursa tək `git log`."""
+        key = self._local_store_key()
+        head = self.repo_object.git.rev_parse('main')
+        if self.commit_store.is_complete(key) and self.commit_store.head(key) == head:
+            return head, self.commit_store.page(key, 0, self.commit_store.count(key))
+        return head, [row for batch in iter_log_batches(self.repo_object.working_dir, head, batch_size=LOCAL_HISTORY_PAGE_SIZE)
+                      for row in batch]
+
+    def _stored_online_history(self, repo_data):
+        """Onlayn tarixçənin anbarda olan hissəsi; anbar boşdursa, ilk səhifə endirilir."""
+        key = repo_data['full_name']
+        count = self.commit_store.count(key)
+        if count: return self.commit_store.page(key, 0, count), self.commit_store.is_complete(key)
+        rows, more = self._fetch_online_history_page(repo_data, {"per_page": HISTORY_PAGE_SIZE})
+        self.commit_store.replace(key, rows, complete=not more)
+        return rows, not more
+
+    def _merged_history_task(self, repo_data):
+        if not self.repo_object: return
+        generation = self._begin_history("merged")
+        self._post_status("Lokal və onlayn tarixçə müqayisə olunur...", "yellow")
+        try:
+            local_head, local_rows = self._full_local_history()
+            remote_rows, remote_complete = self._stored_online_history(repo_data)
+        except (git.exc.GitCommandError, requests.exceptions.RequestException, RateLimitError) as e:
+            log(f"!!! BİRLƏŞMİŞ TARİXÇƏ XƏTASI: {e}")
+            self._post_status(f"Tarixçələri müqayisə etmək mümkün olmadı: {e}", "orange")
+            return
+        if self.scheduler.is_cancelled() or generation != self._history_generation: return
+        graph = CommitGraph()
+        graph.add_rows(local_rows)
+        graph.add_rows(remote_rows)
+        graph.set_tip(SIDE_LOCAL, local_head)
+        graph.set_tip(SIDE_REMOTE, remote_rows[0].sha if remote_rows else None)
+        rows = graph.merged_rows()
+        ahead, behind = graph.ahead_behind(SIDE_LOCAL, SIDE_REMOTE)
+        base = graph.merge_base(SIDE_LOCAL, SIDE_REMOTE)
+        self.commit_graph = graph
+        self._reset_search_index(None, rows)
+        self.ui.post(self._update_merged_history_ui, rows, graph.mark, generation, key="history_table")
+        # Onlayn tarixçənin yüklənməmiş hissəsində ortaq əcdad ola bilər - o zaman say minimal qiymətdir
+        partial = "" if base or remote_complete else " (onlayn tarixçə tam yüklənməyib)"
+        base_text = f"ortaq əcdad {base[:8]}" if base else "ortaq əcdad tapılmadı"
+        self._post_status(f"Birləşmiş tarixçə: ↑{ahead} yalnız lokal, ↓{behind} yalnız onlayn, {base_text}{partial}.", "lightgreen")
+
+    def _update_merged_history_ui(self, rows, marker, generation):
+        if not self.app.winfo_exists() or generation != self._history_generation: return
+        self.app.history_view.set_rows(rows, False, marker=marker)
+        self._refresh_search()
+
+    def handle_load_more_history(self):
+        """Virtual cədvəl sonuna yaxınlaşanda növbəti tarixçə səhifəsini yükləyir."""
+        self.run_in_thread(self._load_more_history_task, self._history_generation, key="history_more")()
+
+    def _load_more_history_task(self, generation):
+        if generation != self._history_generation: return
+        offset = len(self.app.history_view.rows)
+        if self.history_source == "local":
+            key, page_size = self._local_store_key(), LOCAL_HISTORY_PAGE_SIZE
+        else:
+            key, page_size = self.active_repo_data['full_name'], HISTORY_PAGE_SIZE
+        # Dərin tarixçə əvvəlcə anbardan oxunur, çatışmayan hissə mənbədən tamamlanır
+        rows = self.commit_store.page(key, offset, page_size)
+        if len(rows) == page_size or self.commit_store.is_complete(key):
+            self._post_history(self._append_commit_history_ui, rows, self._store_has_more(key, offset + len(rows)), generation)
+            return
+        if rows: self._post_history(self._append_commit_history_ui, rows, False, generation)
+        # Növbəti səhifə ən köhnə commit-in əcdadlarından deyil, tarixçədəki mövqedən davam edir -
+        # əks halda birləşdirilmiş yan filialların ondan sonra gələn commitləri itərdi
+        stored = self.commit_store.count(key)
+        if not stored:
+            self._post_history(self._append_commit_history_ui, [], False, generation)
+            return
+        if self.history_source == "local":
+            self._stream_local_history(self.commit_store.head(key), stored, generation, replace=False,
+                                       max_count=page_size - len(rows))
+            return
+        new_rows, has_more = [], False
+        try:
+            page = stored // page_size + 1
+            while True:
+                fetched, has_more = self._fetch_online_history_page(self.active_repo_data, {"per_page": page_size, "page": page})
+                new_rows = self.commit_store.append(key, fetched, complete=not has_more)
+                # Onlayn filiala yeni commitlər gəlibsə, səhifələr sürüşür və səhifə tam təkrar ola bilər
+                if new_rows or not has_more or self.scheduler.is_cancelled(): break
+                page += 1
+        except (requests.exceptions.RequestException, RateLimitError) as e:
+            log(f"!!! TARİXÇƏ SƏHİFƏSİ YÜKLƏNMƏDİ: {e}")
+            self._post_status(f"Köhnə commitləri yükləmək mümkün olmadı: {e}", "orange")
+        self._post_history(self._append_commit_history_ui, new_rows, has_more, generation)
+
+    # --- Tarixçədə axtarış ---
+    def _reset_search_index(self, key, rows=None):
+        """Yeni tarixçə üçün boş indeks: anbardakı sətirlər (`key`) fonda, verilmiş `rows` isə dərhal əlavə olunur."""
+        index = CommitSearchIndex()
+        self.history_index, self._search_key = index, key
+        if rows is not None:
+            index.add(rows)
+            index.ready = True
+            self._refresh_search()
+            return
+        self.run_in_thread(self._fill_search_index_task, index, key, key="search_index", priority=PRIORITY_BACKGROUND)()
+
+    def _fill_search_index_task(self, index, key):
+        # İndeks kilidi altında oxunur: bu vaxt gələn anbar bildirişləri gözləyir, əvvəlkilər isə artıq oxunan sətirlərdədir
+        with index.lock:
+            if index is not self.history_index: return
+            index.add(self.commit_store.page(key, 0, -1))
+            index.ready = True
+        log(f"Axtarış indeksi hazırdır: {len(index)} commit.")
+        self._refresh_search()
+
+    def _on_store_change(self, key, kind, rows):
+        index = self.history_index
+        if key is None or key != self._search_key: return
+        with index.lock:
+            if index is not self.history_index or not index.ready: return
+            if kind in ("replace", "clear"): index.clear()
+            index.add(rows, newer=kind == "prepend")
+        self._refresh_search()
+
+    def _refresh_search(self):
+        if self._search_query: self.run_in_thread(self._history_search_task, self._search_query, key="history_search")()
+
+    def handle_history_search(self, query):
+        query = query.strip()
+        if query == self._search_query: return
+        self._search_query = query
+        if not query:
+            self.app.history_view.set_filter(None)
+            self.app.history_search_label.configure(text="")
+            return
+        if self.history_source == "local" and self.repo_object:
+            # Axtarış bütün lokal tarixçəni əhatə etsin deyə anbarda olmayan köhnə commitlər fonda oxunur
+            self.run_in_thread(self._complete_local_history_task, self._history_generation,
+                               key="history_complete", priority=PRIORITY_BACKGROUND)()
+        self._refresh_search()
+
+    def _history_search_task(self, query):
+        index = self.history_index
+        matches = index.search(query)
+        self.ui.post(self._apply_history_search_ui, query, matches, index.ready, key="history_search")
+
+    def _apply_history_search_ui(self, query, matches, ready):
+        if not self.app.winfo_exists() or query != self._search_query: return
+        self.app.history_view.set_filter(matches)
+        pending = "" if ready else " (indeks hazırlanır...)"
+        self.app.history_search_label.configure(text=f"{len(matches)} commit tapıldı{pending}")
+
+    def _complete_local_history_task(self, generation):
+        key = self._local_store_key()
+        head = self.commit_store.head(key)
+        if self.commit_store.is_complete(key) or head is None: return
+        try:
+            # Anbardakı sətirlər `git log head`-in ilk hissəsidir - davamı mövqeyə görə oxunur (bax: _load_more_history_task);
+            # ən köhnə commit-dən gəzmək birləşmələrdə digər valideynin tarixçəsini buraxardı
+            batches = iter_log_batches(self.repo_object.working_dir, head, skip=self.commit_store.count(key),
+                                       batch_size=LOCAL_HISTORY_PAGE_SIZE)
+            with closing(batches):
+                for batch in batches:
+                    if generation != self._history_generation or self.scheduler.is_cancelled(): return
+                    self.commit_store.append(key, batch)
+        except git.exc.GitCommandError as e:
+            log(f"Lokal tarixçə tam oxunmadı: {e}")
+            return
+        self.commit_store.mark_complete(key)
+        log(f"Lokal tarixçə anbarda tamamlandı: {self.commit_store.count(key)} commit.")
 
     def handle_commit_selection_event(self, event):
-        # ... (bu funksiya dəyişmir)
-        if not self.app.commit_history_table.selection(): return
-        selected_item = self.app.commit_history_table.selection()[0]
-        item_values = self.app.commit_history_table.item(selected_item, "values")
-        sha_short, message = item_values[0], item_values[1]
-        self.selected_commit_hash = self.full_commit_hashes.get(sha_short)
-        if self.selected_commit_hash:
-            self.app.selected_commit_label.configure(text=f"Seçildi: {sha_short} - {message}", text_color="cyan")
+        row = self.app.history_view.selected_row()
+        if not row: return
+        self.selected_commit_hash = row.sha
+        self.app.selected_commit_label.configure(text=f"Seçildi: {row.sha[:8]} - {row.message}", text_color="cyan")
+        self._show_commit_detail(row)
+
+    # --- Commit detalları ---
+    def _show_commit_detail(self, row):
+        # Cədvəl yenidən çəkiləndə seçim hadisəsi təkrarlanır - eyni commit yenidən yüklənmir
+        if row.sha == self._detail_sha: return
+        self._detail_sha = row.sha
+        self.app.detail_tabs.set("Commit Detalları")
+        detail = self.detail_cache.get(row.sha)
+        if detail:
+            self.app.commit_detail_pane.show_detail(row, detail)
+        else:
+            self.app.commit_detail_pane.show_loading(row)
+            # Seçim dəyişəndə eyni açarlı köhnə yükləmə ləğv olunur
+            self.run_in_thread(self._load_commit_detail_task, row, key="commit_detail")()
+        self._prefetch_commit_details()
+
+    def _load_commit_detail_task(self, row):
+        pane = self.app.commit_detail_pane
+        try:
+            if self._has_local_commit(row.sha):
+                files = local_changed_files(self.repo_object, row.sha, row.parents)
+                self.ui.post(pane.set_files, row.sha, files)
+                parts, truncated = [], False
+                with closing(iter_local_diff(self.source_repo_path, row.sha, row.parents)) as chunks:
+                    for chunk in chunks:
+                        # Generator bağlananda git prosesi də dayandırılır
+                        if self.scheduler.is_cancelled(): return
+                        if chunk is None:
+                            truncated = True
+                            break
+                        parts.append(chunk)
+                        self.ui.post(pane.append_diff, row.sha, chunk, key="commit_detail_diff", merge=_merge_diff_chunks)
+                detail = CommitDetail(row.sha, files, "".join(parts), truncated)
+            elif self.active_repo_data:
+                detail = online_detail(self.github, self.active_repo_data, row.sha)
+                if self.scheduler.is_cancelled(): return
+                self.ui.post(pane.set_files, row.sha, detail.files)
+                self.ui.post(pane.append_diff, row.sha, detail.diff, key="commit_detail_diff", merge=_merge_diff_chunks)
+            else:
+                self.ui.post(pane.show_error, row.sha, f"'{row.sha[:8]}' lokal anbarda yoxdur və onlayn depo seçilməyib.")
+                return
+        except (git.exc.GitCommandError, requests.exceptions.RequestException, RateLimitError) as e:
+            log(f"!!! COMMIT DETALLARI YÜKLƏNMƏDİ '{row.sha[:8]}': {e}")
+            self.ui.post(pane.show_error, row.sha, f"'{row.sha[:8]}' detallarını yükləmək mümkün olmadı: {e}")
+            return
+        self.detail_cache.put(row.sha, detail)
+        self.ui.post(pane.finish, row.sha, detail.truncated)
+
+    def _prefetch_commit_details(self):
+        """Oxlarla gəzinti zamanı qonşu commitlər artıq keşdə olsun deyə onlar fonda hazırlanır (yalnız lokal)."""
+        view = self.app.history_view
+        if not self.repo_object or view.selected_index is None: return
+        start = max(0, view.selected_index - DETAIL_PREFETCH_ROWS)
+        rows = [row for row in view.shown[start:view.selected_index + DETAIL_PREFETCH_ROWS + 1] if row.sha not in self.detail_cache]
+        if rows: self.run_in_thread(self._prefetch_details_task, rows, key="commit_detail_prefetch", priority=PRIORITY_BACKGROUND)()
+
+    def _prefetch_details_task(self, rows):
+        for row in rows:
+            if self.scheduler.is_cancelled(): return
+            if row.sha in self.detail_cache or not self._has_local_commit(row.sha): continue
+            try:
+                files = local_changed_files(self.repo_object, row.sha, row.parents)
+                with closing(iter_local_diff(self.source_repo_path, row.sha, row.parents)) as chunks:
+                    parts = list(chunks)
+            except git.exc.GitCommandError as e:
+                log(f"Commit detalları əvvəlcədən yüklənmədi '{row.sha[:8]}': {e}")
+                continue
+            truncated = bool(parts) and parts[-1] is None
+            self.detail_cache.put(row.sha, CommitDetail(row.sha, files, "".join(parts[:-1] if truncated else parts), truncated))
 
     def handle_pull(self):
-        self.run_in_thread(self._pull_task)()
+        self.run_in_thread(self._pull_task, key=GIT_WRITE_KEY, replace=False)()
 
     # git_functions.py faylında _pull_task funksiyasını tapıb bununla əvəz edin
 
     def _pull_task(self):
         if not all([self.source_repo_path, self.target_repo_url]):
-            self.app.after(0, messagebox.showwarning, "Eksik Məlumat", "Əməliyyat üçün Mənbə və Hədəf seçin.")
+            self.ui.post(messagebox.showwarning, "Eksik Məlumat", "Əməliyyat üçün Mənbə və Hədəf seçin.")
             return
         if not self.repo_object:
             return
             
         try:
             log("Pull əməliyyatı başladı...")
-            self.app.after(0, self._update_status, "Onlayn dəyişikliklər çəkilir (pull)...", "yellow")
+            self._post_status("Onlayn dəyişikliklər çəkilir (pull)...", "yellow")
             
-            remote_name = "hədəf_depo"
-            remote = None
-            if remote_name in [r.name for r in self.repo_object.remotes]:
-                remote = self.repo_object.remote(name=remote_name)
-                if remote.url != self.target_repo_url:
-                    remote.set_url(self.target_repo_url)
-            else:
-                remote = self.repo_object.create_remote(remote_name, self.target_repo_url)
+            remote = ensure_remote(self.repo_object, self.target_repo_url)
 
-            # --- DƏYİŞİKLİK BURADADIR ---
-            # Açıq şəkildə 'main' filialını çəkdiyimizi bildiririk
-            log(f"'{remote.name}' anbarından 'main' filialı çəkilir...")
-            remote.pull(refspec='main', allow_unrelated_histories=True)
-            # --- SON ---
-            
-            self.app.after(0, self._update_status, "Dəyişikliklər uğurla çəkildi!", "lightgreen")
+            # Açıq şəkildə 'main' filialını, hədəf üçün seçilmiş rejimdə (dayaz/blobsuz/fast-forward) çəkirik
+            options = self._target_pull_options()
+            started = time.perf_counter()
+            before, after = pull_with_options(self.repo_object, remote, 'main', options, progress=self._post_pull_progress)
+            log(f"Pull bitdi ({describe_options(options)}): {before} -> {after}, {time.perf_counter() - started:.1f} san.")
+
+            self._post_status("Dəyişikliklər uğurla çəkildi!" if before != after else "Lokal anbar artıq yenidir.", "lightgreen")
             self.populate_local_commit_history()
             
         except git.exc.GitCommandError as e:
             log(f"!!! PULL XƏTASI: {e}")
             error_message = str(e)
             if "conflict" in error_message.lower():
-                 self.app.after(0, messagebox.showwarning, "Merge Conflict", "Pull əməliyyatı zamanı 'merge conflict' baş verdi.\n\nZəhmət olmasa, konflikləri VS Code kimi bir redaktorda həll edib, dəyişiklikləri yenidən commit edin.")
+                 self.ui.post(messagebox.showwarning, "Merge Conflict", "Pull əməliyyatı zamanı 'merge conflict' baş verdi.\n\nZəhmət olmasa, konflikləri VS Code kimi bir redaktorda həll edib, dəyişiklikləri yenidən commit edin.")
+            elif "not possible to fast-forward" in error_message.lower():
+                 self.ui.post(messagebox.showwarning, "Fast-forward Mümkün Deyil", "Lokal və onlayn filiallar ayrılıb, 'yalnız fast-forward' rejimində birləşdirmə edilmədi.\n\nPull ayarlarında bu rejimi söndürün və ya dəyişiklikləri əl ilə birləşdirin.")
             elif "couldn't find remote ref main" in error_message.lower():
-                 self.app.after(0, messagebox.showwarning, "Filial Tapılmadı", "Onlayn anbarda 'main' adlı filial tapılmadı. Depo boş ola bilər. Əvvəlcə bir dəfə 'Push' etməyə cəhd edin.")
+                 self.ui.post(messagebox.showwarning, "Filial Tapılmadı", "Onlayn anbarda 'main' adlı filial tapılmadı. Depo boş ola bilər. Əvvəlcə bir dəfə 'Push' etməyə cəhd edin.")
             else:
-                self.app.after(0, messagebox.showerror, "Pull Xətası", f"Dəyişiklikləri çəkmək mümkün olmadı:\n\n{e}")
+                self.ui.post(messagebox.showerror, "Pull Xətası", f"Dəyişiklikləri çəkmək mümkün olmadı:\n\n{e}")
         except Exception as e:
             log(f"!!! GÖZLƏNİLMƏZ PULL XƏTASI: {e}")
-            self.app.after(0, messagebox.showerror, "Gözlənilməz Xəta", str(e))
+            self.ui.post(messagebox.showerror, "Gözlənilməz Xəta", str(e))
+        finally:
+            # Birləşdirmə (və ya konflikt) işçi qovluğu və indeksi dəyişir
+            self.request_status_refresh()
+            self.refresh_push_state()
+    def _target_pull_options(self):
+        return pull_options_for(self.config, self.active_repo_data.get('full_name') or self.target_repo_url)
+
+    def _post_pull_progress(self, stage, percent, message):
+        progress = f" {percent}%" if percent is not None else ""
+        self._post_status(f"Pull: {stage}{progress} {message}".strip(), "yellow")
+
+    # --- Push-dan əvvəl yoxlama ---
+    def refresh_push_state(self):
+        """Push düyməsinin yanındakı ↑/↓ saylarını fonda yeniləyir."""
+        if self.source_repo_path and self.target_repo_url:
+            self.run_in_thread(self._push_state_task, key="preflight", priority=PRIORITY_BACKGROUND)()
+
+    def _cached_online_rows(self):
+        target = self.active_repo_data
+        if not target or target.get('clone_url') != self.target_repo_url: return []
+        return self.commit_store.page(target['full_name'], 0, HISTORY_SCAN_LIMIT)
+
+    def _check_push(self):
+        """Onlayn 'main' ilə müqayisə; yoxlama alınmasa (şəbəkə, giriş) None qaytarır."""
+        try:
+            preflight = check_push(self.repo_object, self.target_repo_url, 'main', self._cached_online_rows())
+        except git.exc.GitCommandError as e:
+            log(f"!!! PUSH YOXLAMASI ALINMADI: {e}")
+            preflight = None
+        self.ui.post(self._update_push_state_ui, preflight, key="push_state")
+        return preflight
+
+    def _push_state_task(self):
+        if self.repo_object and self.target_repo_url: self._check_push()
+
+    def _update_push_state_ui(self, preflight):
+        if not self.app.winfo_exists(): return
+        color = "gray" if preflight is None else ("orange" if will_be_rejected(preflight) else "lightgreen")
+        self.app.push_state_label.configure(text=describe_preflight(preflight), text_color=color)
+
+    def _confirm_push(self):
+        """Push rədd ediləcəksə, istifadəçiyə əvvəlcə pull etməyi təklif edir. Push edilə bilərsə True qaytarır."""
+        preflight = self._check_push()
+        # Yoxlamaq mümkün olmadısa, əvvəlki kimi push cəhd edilir - rədd cavabı onsuz da göstərilir
+        if preflight is None or not will_be_rejected(preflight): return True
+        behind = "bir neçə" if preflight.behind is None else str(preflight.behind)
+        if not self._ask_ui(messagebox.askyesno, "Onlayn Dəyişikliklər Var",
+                            f"Onlayn 'main' filialında lokalda olmayan {behind} commit var - push rədd ediləcək.\n\n"
+                            "Commit lokal olaraq saxlanıldı. Əvvəlcə dəyişiklikləri çəkib (pull) sonra göndərmək istəyirsiniz?"):
+            self._post_status("Commit lokal saxlanıldı, push edilmədi (onlayn dəyişikliklər əvvəlcə çəkilməlidir).", "orange")
+            return False
+        self._pull_task()
+        preflight = self._check_push()
+        if preflight is not None and will_be_rejected(preflight):
+            self._post_status("Pull-dan sonra da onlayn filial irəlidədir - push edilmədi.", "orange")
+            return False
+        return True
+
+    def handle_open_pull_options(self):
+        if not self.target_repo_url:
+            messagebox.showwarning("Hədəf Seçilməyib", "Pull ayarları hər onlayn depo üçün ayrıdır - əvvəlcə hədəf depo seçin.")
+            return
+        from pull_options_window import PullOptionsDialog
+        name = self.active_repo_data.get('full_name') or self.target_repo_url
+        PullOptionsDialog(self.app, name, self._target_pull_options(), self.save_pull_options)
+
+    def save_pull_options(self, full_name, options):
+        set_pull_options(self.config, full_name, options)
+        self._post_status(f"'{full_name}' üçün pull ayarları: {describe_options(options)}.", "lightgreen")
+
     def handle_commit_and_push(self):
         # ... (bu funksiya dəyişmir)
-        self.run_in_thread(self._commit_and_push_task)()
+        self.run_in_thread(self._commit_and_push_task, key=GIT_WRITE_KEY, replace=False)()
 
     def _commit_and_push_task(self):
         msg = self.app.commit_message_entry.get()
         if not all([self.source_repo_path, self.target_repo_url, msg]):
-            self.app.after(0, messagebox.showwarning, "Eksik Məlumat", "Əməliyyat üçün Mənbə, Hədəf seçin və Commit mesajı yazın.")
+            self.ui.post(messagebox.showwarning, "Eksik Məlumat", "Əməliyyat üçün Mənbə, Hədəf seçin və Commit mesajı yazın.")
             return
         if not self.repo_object or self.repo_object.working_dir != self.source_repo_path:
             if not self.load_source_repo(self.source_repo_path): return
+        staged = None
         try:
-            self.repo_object.git.add(A=True)
+            staged = self._stage_changes()
             self.repo_object.index.commit(msg)
+            staged = None
+            self.request_status_refresh()
 
-            # --- DÜZƏLİŞ EDİLMİŞ REMOTE MƏNTİQİ ---
-            remote_name = "hədəf_depo"
-            remote = None
-            if remote_name in [r.name for r in self.repo_object.remotes]:
-                remote = self.repo_object.remote(name=remote_name)
-                if remote.url != self.target_repo_url:
-                    remote.set_url(self.target_repo_url)
-            else:
-                remote = self.repo_object.create_remote(remote_name, self.target_repo_url)
-            # -----------------------------------
+            # Rədd ediləcək push üçün heç bir məlumat göndərilmir
+            if not self._confirm_push():
+                self.populate_local_commit_history()
+                return
+
+            remote = ensure_remote(self.repo_object, self.target_repo_url)
 
             log("Təhlükəsiz push cəhd edilir...")
             push_info = remote.push(refspec='HEAD:main', set_upstream=True)
@@ -321,18 +1099,67 @@ class GitFunctions:
             for info in push_info:
                 if info.flags & (info.ERROR | info.REJECTED):
                     log(f"!!! PUSH FAILED/REJECTED: {info.summary}")
-                    self.app.after(0, messagebox.showerror, "Push Rədd Edildi", f"Push əməliyyatı rədd edildi:\n\n{info.summary}\n\nBu, adətən onlayn depoda sizdə olmayan dəyişikliklər olduqda baş verir.\nZəhmət olmasa, əvvəlcə 'Dəyişiklikləri Çək (Pull)' düyməsinə basın.")
+                    self.ui.post(messagebox.showerror, "Push Rədd Edildi", f"Push əməliyyatı rədd edildi:\n\n{info.summary}\n\nBu, adətən onlayn depoda sizdə olmayan dəyişikliklər olduqda baş verir.\nZəhmət olmasa, əvvəlcə 'Dəyişiklikləri Çək (Pull)' düyməsinə basın.")
                     push_error = True
                     break
             
             if not push_error:
-                self.app.after(0, self._update_status, "Dəyişikliklər uğurla göndərildi!", "lightgreen")
-                self.app.after(0, self.app.commit_message_entry.delete, 0, 'end')
+                self._post_status("Dəyişikliklər uğurla göndərildi!", "lightgreen")
+                self.ui.post(self.app.commit_message_entry.delete, 0, 'end')
                 self.populate_local_commit_history()
-                self.run_in_thread(self.fetch_online_commits, self.active_repo_data)()
+                self.run_in_thread(self.fetch_online_commits, self.active_repo_data, key="history", priority=PRIORITY_BACKGROUND)()
+                self.refresh_push_state()
         except Exception as e:
             log(f"!!! GÖZLƏNİLMƏZ PUSH XƏTASI: {e}")
-            self.app.after(0, messagebox.showerror, "Gözlənilməz Xəta", str(e))
+            # Commit alınmayıbsa, izləyicinin dəyişiklikləri növbəti cəhd üçün saxlanılır
+            if staged: staged[0].restore_changes(*staged[1:])
+            self.ui.post(messagebox.showerror, "Gözlənilməz Xəta", str(e))
+    # --- Toplu sinxronizasiya ---
+    def handle_open_batch_window(self):
+        from batch_window import BatchSyncWindow
+        if self.batch_window and self.batch_window.winfo_exists():
+            self.batch_window.focus()
+            return
+        self.batch_window = BatchSyncWindow(self.app, self)
+
+    def add_batch_mapping(self, path, repo_data):
+        mapping = make_mapping(path, repo_data)
+        mappings = [m for m in self.config.get("batch_mappings", []) if m['path'] != mapping['path']]
+        self.config.set(batch_mappings=mappings + [mapping])
+        return mapping
+
+    def remove_batch_mappings(self, paths):
+        self.config.set(batch_mappings=[m for m in self.config.get("batch_mappings", []) if m['path'] not in paths])
+
+    def start_batch(self, mappings, action, message=""):
+        self.run_in_thread(self._batch_task, mappings, action, message, key="batch")()
+
+    def cancel_batch(self):
+        if self._batch_run: self._batch_run.cancel()
+
+    def _post_batch(self, method, *args, key=None):
+        if self.batch_window: self.ui.post(getattr(self.batch_window, method), *args, key=key)
+
+    def _batch_task(self, mappings, action, message):
+        started = time.perf_counter()
+        self._post_status(f"Toplu əməliyyat: {len(mappings)} depo...", "yellow")
+        self._batch_run = BatchRun(
+            mappings, action, message,
+            on_update=lambda m, state, detail: self._post_batch("update_row", m, state, detail, key=f"batch:{m['path']}"),
+            options_for=lambda full_name: pull_options_for(self.config, full_name),
+            identity=(self.config.get("user_name"), self.config.get("user_email")))
+        try:
+            summary = self._batch_run.run()
+        finally:
+            self._batch_run = None
+        seconds = time.perf_counter() - started
+        self._post_batch("show_summary", action, summary, seconds)
+        self._post_status(f"Toplu əməliyyat bitdi: {summary[STATE_OK]} uğurlu, {summary[STATE_FAILED]} xəta ({seconds:.1f} san.)",
+                          "orange" if summary[STATE_FAILED] else "lightgreen")
+        # Aktiv mənbə də toplunun içindədirsə tarixçəsi yenilənir
+        if self.source_repo_path and any(m['path'] == os.path.abspath(self.source_repo_path) for m in mappings):
+            self.run_in_thread(self.populate_local_commit_history, key="history", priority=PRIORITY_BACKGROUND)()
+
     # handle_zip_commit, _download_commit_zip_task, handle_load_commit, _load_commit_task
     # funksiyaları dəyişmir, olduğu kimi qalır...
 
@@ -340,29 +1167,67 @@ class GitFunctions:
         if not self.selected_commit_hash:
             messagebox.showwarning("Seçim Yoxdur", "Əvvəlcə tarixçədən bir commit seçin.")
             return
-        if not self.active_repo_data:
-            messagebox.showwarning("Hədəf Seçilməyib", "'.zip' əməliyyatı üçün onlayn hədəf anbarı seçməlisiniz.")
+        if not self.active_repo_data and not self.repo_object:
+            messagebox.showwarning("Hədəf Seçilməyib", "'.zip' əməliyyatı üçün onlayn hədəf və ya lokal mənbə anbarı seçməlisiniz.")
             return
+        name = self.active_repo_data.get('name') or os.path.basename(self.source_repo_path or "") or 'arxiv'
         zip_path = filedialog.asksaveasfilename(
             defaultextension=".zip", filetypes=[("Zip Arxiv", "*.zip")],
-            initialfile=f"{self.active_repo_data.get('name', 'arxiv')}-{self.selected_commit_hash[:8]}.zip",
+            initialfile=f"{name}-{self.selected_commit_hash[:8]}.zip",
             title="Commit Arxivini Harada Saxlamalı?")
         if not zip_path: return
-        self.run_in_thread(self._download_commit_zip_task, zip_path)()
+        self.run_in_thread(self._download_commit_zip_task, zip_path, self.active_repo_data, self.selected_commit_hash,
+                           key=f"zip:{zip_path}")()
 
-    def _download_commit_zip_task(self, zip_path):
+    def _has_local_commit(self, sha):
+        if not self.repo_object: return False
         try:
-            self.app.after(0, self._update_status, f"'{self.selected_commit_hash[:8]}' onlayn arxivdən endirilir...", "yellow")
-            token = self.app.token_entry.get()
-            headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github.v3+json"}
-            url = f"https://api.github.com/repos/{self.active_repo_data['full_name']}/zipball/{self.selected_commit_hash}"
-            with requests.get(url, headers=headers, stream=True) as r:
-                r.raise_for_status()
-                with open(zip_path, 'wb') as f:
-                    for chunk in r.iter_content(chunk_size=8192): f.write(chunk)
-            self.app.after(0, self._update_status, "Commit uğurla .zip olaraq endirildi!", "lightgreen")
+            self.repo_object.git.cat_file('-e', f"{sha}^{{commit}}")
+            return True
+        except git.exc.GitCommandError:
+            return False
+
+    def _download_commit_zip_task(self, zip_path, repo_data, sha):
+        if self._has_local_commit(sha):
+            # Commit lokal anbarda varsa arxiv şəbəkəsiz, disk sürəti ilə yaradılır
+            owner = repo_data.get('owner', {}).get('login')
+            name = f"{owner}-{repo_data['name']}" if owner and repo_data.get('name') else os.path.basename(self.source_repo_path)
+            export = LocalArchiveExport(self.source_repo_path, sha, zip_path, prefix=f"{name}-{sha[:7]}/",
+                                        on_progress=lambda d: self._post_status(f"'{sha[:8]}' lokal arxivlənir: {d.describe()}", "yellow"))
+            start_text = f"'{sha[:8]}' lokal anbardan arxivlənir..."
+        elif repo_data:
+            url = f"{API_ROOT}/repos/{repo_data['full_name']}/zipball/{sha}"
+            self.github.set_token(self.config.get("token"))
+            export = ResumableDownload(self.github, url, zip_path,
+                                       on_progress=lambda d: self._post_status(f"'{sha[:8]}' endirilir: {d.describe()}", "yellow"))
+            resuming = os.path.exists(export.part_path)
+            start_text = f"'{sha[:8]}' yarımçıq endirmədən davam edilir..." if resuming else f"'{sha[:8]}' onlayn arxivdən endirilir..."
+        else:
+            self.ui.post(messagebox.showerror, "Endirmə Xətası", f"'{sha[:8]}' lokal anbarda tapılmadı və onlayn hədəf seçilməyib.")
+            return
+        self._downloads[zip_path] = export
+        self.ui.post(self._update_download_ui, key="download_ui")
+        try:
+            self._post_status(start_text, "yellow")
+            export.run()
+            self._post_status("Commit uğurla .zip olaraq saxlanıldı!", "lightgreen")
+        except DownloadCancelled:
+            if isinstance(export, ResumableDownload):
+                self._post_status("Endirmə ləğv edildi (yarımçıq fayl növbəti cəhd üçün saxlanıldı).", "orange")
+            else:
+                self._post_status("Arxivləmə ləğv edildi.", "orange")
         except Exception as e:
-            self.app.after(0, messagebox.showerror, "Endirmə Xətası", f"Arxivi endirmək mümkün olmadı:\n\n{e}")
+            self.ui.post(messagebox.showerror, "Endirmə Xətası", f"Arxivi yaratmaq mümkün olmadı:\n\n{e}")
+        finally:
+            self._downloads.pop(zip_path, None)
+            self.ui.post(self._update_download_ui, key="download_ui")
+
+    def _update_download_ui(self):
+        self.app.cancel_download_button.configure(state="normal" if self._downloads else "disabled")
+
+    def handle_cancel_download(self):
+        for download in list(self._downloads.values()):
+            download.cancel()
 
     def handle_load_commit(self):
         if not self.selected_commit_hash:
@@ -372,12 +1237,14 @@ class GitFunctions:
             messagebox.showwarning("Mənbə Seçilməyib", "'Reset' əməliyyatı üçün lokal mənbə anbarı seçməlisiniz.")
             return
         if messagebox.askyesno("Təsdiq", f"'{self.selected_commit_hash[:8]}' commit-inə qayıtmaq istəyirsiniz?\nBÜTÜN SONRAKI DƏYİŞİKLİKLƏR SİLİNƏCƏK!"):
-            self.run_in_thread(self._load_commit_task)()
+            self.run_in_thread(self._load_commit_task, key=GIT_WRITE_KEY, replace=False)()
 
     def _load_commit_task(self):
         try:
             self.repo_object.git.reset('--hard', self.selected_commit_hash)
+            self.request_status_refresh()
+            self.refresh_push_state()
             self.populate_local_commit_history()
-            self.app.after(0, self._update_status, "Anbar uğurla geri qaytarıldı!", "lightgreen")
+            self._post_status("Anbar uğurla geri qaytarıldı!", "lightgreen")
         except Exception as e:
-            self.app.after(0, messagebox.showerror, "Reset Xətası", str(e))
\ No newline at end of file
+            self.ui.post(messagebox.showerror, "Reset Xətası", str(e))
\ No newline at end of file
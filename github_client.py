@@ -0,0 +1,226 @@
+import os
+import json
+import re
+import hashlib
+import threading
+from urllib.parse import urlparse, parse_qs
+from app_log import log
+from lazy_import import lazy_module
+from rate_budget import RateBudget, RateLimitError
+from instrumentation import span, url_template
+
+requests = lazy_module("requests")
+
+# GitHub Enterprise və ya yerli test serveri üçün dəyişdirilə bilər
+API_ROOT = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+CACHE_DIR = ".github_cache"
+# Diskdə keşin ümumi həcmi; aşıldıqda ən çoxdan istifadə olunmayan cavablar silinir
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Bundan böyük cavablar (məs. tam patch-lı commit detalları) diskə yazılmır
+CACHE_MAX_BODY_BYTES = 1024 * 1024
+MAX_ATTEMPTS = 3
+# (bağlantı, oxuma) - oxuma vaxtı hər paket arasındakı fasilədir; ilişmiş bağlantı istisna ilə kəsilir
+HTTP_TIMEOUT = (10, 30)
+
+_LINK_RE = re.compile(r'<([^>]+)>\s*;\s*rel="([^"]+)"')
+
+
+def parse_link_header(value):
+    """`Link` başlığını {rel: url} lüğətinə çevirir."""
+    return {rel: url for url, rel in _LINK_RE.findall(value or "")}
+
+
+def link_page_number(url):
+    """Səhifələmə linkindən `page` parametrini oxuyur."""
+    try:
+        return int(parse_qs(urlparse(url).query).get("page", ["1"])[0])
+    except (TypeError, ValueError):
+        return None
+
+
+class GitHubClient:
+    """GitHub API üçün paylaşılan sessiya: keep-alive bağlantı hovuzu, ETag/Last-Modified diskdə keşi
+    və limit büdcəsi (bax: rate_budget)."""
+
+    def __init__(self, token="", cache_dir=CACHE_DIR, pool_size=16, budget=None, cache_max_bytes=CACHE_MAX_BYTES,
+                 timeout=HTTP_TIMEOUT):
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.cache_max_bytes = cache_max_bytes
+        # Keşin həcmi ilk yazmada qovluqdan hesablanır, sonra yaddaşda izlənir
+        self._cache_bytes = None
+        self.budget = budget or RateBudget()
+        # Sorğunun istifadəçi əməliyyatı olub-olmadığını müəyyən edir (fon sorğuları limitə qənaətlə göndərilir)
+        self.is_interactive = lambda: True
+        self.pool_size = pool_size
+        self.token = token or ""
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+
+    @property
+    def session(self):
+        # Sessiya (və `requests`) yalnız ilk sorğuda yaradılır ki, başlanğıcı ləngitməsin
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = requests.adapters.HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    session.headers.update({"Accept": "application/vnd.github.v3+json"})
+                    if self.token: session.headers["Authorization"] = f"token {self.token}"
+                    self._session = session
+        return self._session
+
+    def set_token(self, token):
+        token = token or ""
+        if token == self.token: return
+        self.token = token
+        if self._session is None: return
+        if token:
+            self._session.headers["Authorization"] = f"token {token}"
+        else:
+            self._session.headers.pop("Authorization", None)
+
+    # --- Diskdə cavab keşi ---
+    def _cache_key(self, url):
+        # Cavablar istifadəçiyə görə fərqlənir, ona görə açar tokenə də bağlıdır
+        raw = f"{hashlib.sha256(self.token.encode()).hexdigest()}|{url}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _read_cache(self, key):
+        meta_path = os.path.join(self.cache_dir, f"{key}.json")
+        body_path = os.path.join(self.cache_dir, f"{key}.body")
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+            # Dəyişmə vaxtı son istifadəni göstərir (LRU silinmə bu sıra ilə gedir)
+            os.utime(meta_path)
+            return meta, body
+        except (OSError, ValueError):
+            return None, None
+
+    def _write_cache(self, key, meta, body):
+        if len(body) > CACHE_MAX_BODY_BYTES: return
+        with self._cache_lock:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                if self._cache_bytes is None: self._cache_bytes = sum(size for _, _, size in self._cache_entries())
+                for suffix, data, mode in ((".body", body, "wb"), (".json", json.dumps(meta), "w")):
+                    path = os.path.join(self.cache_dir, f"{key}{suffix}")
+                    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                    with open(tmp_path, mode) as f:
+                        f.write(data)
+                    previous = os.path.getsize(path) if os.path.exists(path) else 0
+                    os.replace(tmp_path, path)
+                    self._cache_bytes += os.path.getsize(path) - previous
+                if self._cache_bytes > self.cache_max_bytes: self._evict_cache()
+            except OSError as e:
+                log(f"!!! HTTP KEŞ YAZMA XƏTASI: {e}")
+
+    def _cache_entries(self):
+        """(son istifadə vaxtı, açar, həcm) - hər cavab üçün bir qeyd."""
+        entries = {}
+        with os.scandir(self.cache_dir) as items:
+            for item in items:
+                key, _, suffix = item.name.partition(".")
+                if suffix not in ("json", "body"): continue
+                stat = item.stat()
+                used, size = entries.get(key, (0, 0))
+                entries[key] = (max(used, stat.st_mtime) if suffix == "json" else used, size + stat.st_size)
+        return [(used, key, size) for key, (used, size) in entries.items()]
+
+    def _evict_cache(self):
+        # Hər dəfə bir cavab deyil, bir dəfəyə limitin 80%-inə qədər silinir
+        target = self.cache_max_bytes * 0.8
+        entries = sorted(self._cache_entries())
+        total = sum(size for _, _, size in entries)
+        removed = 0
+        for _, key, size in entries:
+            if total <= target: break
+            for suffix in (".json", ".body"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, f"{key}{suffix}"))
+                except FileNotFoundError:
+                    pass
+            total -= size
+            removed += 1
+        self._cache_bytes = total
+        log(f"HTTP keşindən {removed} köhnə cavab silindi ({total / 1048576:.1f} MB qaldı).")
+
+    def get(self, url, params=None, interactive=None):
+        """Şərti GET: dəyişiklik yoxdursa (304) keşdəki cavab bədəni qaytarılır.
+
+        Limit bitibsə və cavab keşdə varsa, köhnə keş cavabı qaytarılır (`from_cache`, `stale`)."""
+        if interactive is None: interactive = self.is_interactive()
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        key = self._cache_key(full_url)
+        meta, body = self._read_cache(key)
+        headers = {}
+        if meta:
+            if meta.get("etag"): headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"): headers["If-Modified-Since"] = meta["last_modified"]
+
+        for _ in range(MAX_ATTEMPTS):
+            try:
+                self.budget.acquire(interactive)
+            except RateLimitError:
+                if meta is None: raise
+                log(f"Limit səbəbindən keşdəki cavab istifadə olunur: {full_url}")
+                return self._cached_response(full_url, meta, body, stale=True)
+            with span("http", f"GET {url_template(full_url)}") as fields:
+                response = self.session.get(full_url, headers=headers, timeout=self.timeout)
+                fields.update(status=response.status_code, bytes=len(response.content), interactive=interactive)
+            if not self.budget.update(response): break
+        response.from_cache = response.stale = False
+        if response.status_code == 304 and meta:
+            # 304 cavabı bədənsizdir - keşdəki məlumatı cavaba köçürürük
+            response.status_code = 200
+            response._content = body
+            for name, value in meta.get("headers", {}).items():
+                response.headers.setdefault(name, value)
+            response.from_cache = True
+        elif response.status_code == 200 and (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+            self._write_cache(key, {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "headers": {k: response.headers[k] for k in ("Link", "Content-Type") if k in response.headers},
+            }, response.content)
+        return response
+
+    @staticmethod
+    def _cached_response(url, meta, body, stale=False):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = body
+        response.headers.update(meta.get("headers", {}))
+        response.from_cache, response.stale = True, stale
+        return response
+
+    def post(self, url, payload, interactive=None):
+        """Keşsiz JSON POST (GraphQL sorğuları üçün); limit gözləməsi GET ilə eynidir."""
+        if interactive is None: interactive = self.is_interactive()
+        for _ in range(MAX_ATTEMPTS):
+            self.budget.acquire(interactive)
+            with span("http", f"POST {url_template(url)}") as fields:
+                response = self.session.post(url, json=payload, timeout=self.timeout)
+                fields.update(status=response.status_code, bytes=len(response.content), interactive=interactive)
+            if not self.budget.update(response): break
+        return response
+
+    def stream(self, url, headers=None):
+        """Böyük cavablar (arxivlər) üçün keşsiz, axınlı GET."""
+        self.budget.acquire(interactive=True)
+        # Axında yalnız başlıqların gəlməsinə qədərki vaxt ölçülür
+        with span("http", f"GET {url_template(url)}", stream=True) as fields:
+            response = self.session.get(url, headers=headers or {}, stream=True, timeout=self.timeout)
+            fields.update(status=response.status_code, bytes=response.headers.get("Content-Length", "?"))
+        self.budget.update(response)
+        return response
+
+    def close(self):
+        if self._session is not None: self._session.close()
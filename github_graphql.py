@@ -0,0 +1,99 @@
+from datetime import datetime
+from github_client import API_ROOT
+from history_view import CommitRow
+from state_snapshot import compact_repo
+
+
+def graphql_url(api_root):
+    """GitHub Enterprise-də REST `https://host/api/v3`, GraphQL isə `https://host/api/graphql` ünvanındadır."""
+    root = api_root[:-len("/v3")] if api_root.endswith("/v3") else api_root
+    return f"{root}/graphql"
+
+
+GRAPHQL_URL = graphql_url(API_ROOT)
+# Bir sorğuda depo sayı: commitlərlə birlikdə sorğunun "dəyəri" limit daxilində qalır
+GRAPHQL_REPO_BATCH = 50
+GRAPHQL_COMMITS = 20
+
+REPOS_QUERY = """
+query($first: Int!, $after: String, $commits: Int!) {
+  viewer {
+    repositories(first: $first, after: $after, ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER],
+                 orderBy: {field: NAME, direction: ASC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name nameWithOwner url isPrivate pushedAt updatedAt
+        owner { login }
+        defaultBranchRef {
+          name
+          target {
+            ... on Commit {
+              history(first: $commits) {
+                pageInfo { hasNextPage }
+                nodes {
+                  oid messageHeadline
+                  author { name date }
+                  parents(first: 8) { nodes { oid } }
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+class GraphQLError(Exception):
+    pass
+
+
+def _timestamp(value):
+    return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+
+
+def repo_from_node(node):
+    """GraphQL depo qovşağını REST ilə eyni yığcam depo lüğətinə çevirir."""
+    full_name = node['nameWithOwner']
+    branch = node.get('defaultBranchRef') or {}
+    return compact_repo({
+        "name": node['name'],
+        "full_name": full_name,
+        "clone_url": f"{node['url']}.git",
+        "commits_url": f"{API_ROOT}/repos/{full_name}/commits{{/sha}}",
+        "private": node['isPrivate'],
+        "default_branch": branch.get('name'),
+        "pushed_at": node.get('pushedAt'),
+        "updated_at": node.get('updatedAt'),
+        "owner": node.get('owner') or {},
+    })
+
+
+def commits_from_node(node):
+    """Defolt filialın son commitlərini (sətirlər, daha köhnəsi var) qaytarır; boş depoda None."""
+    target = ((node.get('defaultBranchRef') or {}).get('target')) or {}
+    history = target.get('history')
+    if history is None: return None
+    rows = [CommitRow(commit['oid'], commit['messageHeadline'], (commit.get('author') or {}).get('name') or "",
+                      _timestamp(commit['author']['date']), tuple(parent['oid'] for parent in commit['parents']['nodes']))
+            for commit in history['nodes']]
+    return rows, history['pageInfo']['hasNextPage']
+
+
+def iter_repository_pages(client, commits=GRAPHQL_COMMITS, batch=GRAPHQL_REPO_BATCH, interactive=None):
+    """Hesabın depolarını son commitləri ilə birlikdə səhifə-səhifə verir: [(depo, (sətirlər, has_more) | None), ...]."""
+    cursor = None
+    while True:
+        response = client.post(GRAPHQL_URL, {"query": REPOS_QUERY,
+                                              "variables": {"first": batch, "after": cursor, "commits": commits}},
+                               interactive=interactive)
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get('errors'):
+            raise GraphQLError("; ".join(error.get('message', "") for error in payload['errors']))
+        repositories = payload['data']['viewer']['repositories']
+        yield [(repo_from_node(node), commits_from_node(node)) for node in repositories['nodes']]
+        if not repositories['pageInfo']['hasNextPage']: break
+        cursor = repositories['pageInfo']['endCursor']
@@ -0,0 +1,110 @@
+import re
+import bisect
+import itertools
+import threading
+from instrumentation import span
+
+# SHA axtarışı üçün ilk bu qədər simvola görə qruplaşdırılır; daha qısa hex sorğular yalnız sözlərdə axtarılır
+SHA_BUCKET = 4
+
+_WORD = re.compile(r"\w+")
+_HEX = re.compile(r"[0-9a-f]+")
+
+
+def tokenize(text):
+    return _WORD.findall(text.lower())
+
+
+class CommitSearchIndex:
+    """Commit mesajları, müəlliflər və SHA-lar üzrə tərs indeks.
+
+    Hər söz -> onu daxil edən commitlərin dəsti; sözlərin sıralı siyahısı prefiks axtarışı üçündür.
+    Sorğunun hər sözü hansısa sözün (və ya SHA-nın) prefiksi olmalıdır. Yeni commitlər indeksə əlavə
+    olunur - indeks heç vaxt yenidən qurulmur. Bütün metodlar thread-safe-dir."""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.rows = []
+        self._ids = {}
+        self._positions = []
+        self._postings = {}
+        self._vocab = []
+        self._new_words = []
+        self._sha_buckets = {}
+        self._top = 0
+        self._bottom = 0
+        # İndeks tam doldurulana qədər (bax: `fill`) anbar bildirişləri nəzərə alınmır
+        self.ready = False
+
+    def __len__(self):
+        return len(self.rows)
+
+    def clear(self):
+        with self.lock:
+            ready = self.ready
+            self.__init__()
+            self.ready = ready
+
+    def add(self, rows, newer=False):
+        """Sətirləri (yenidən köhnəyə) indeksə əlavə edir; `newer` - mövcud olanlardan daha yenidirlər.
+
+        Artıq indeksdə olan commitlər buraxılır; yeni əlavə olunan sətirləri qaytarır."""
+        with self.lock:
+            rows = [row for row in rows if row.sha not in self._ids]
+            if not rows: return rows
+            if newer:
+                positions = range(self._top - len(rows), self._top)
+                self._top -= len(rows)
+            else:
+                positions = range(self._bottom, self._bottom + len(rows))
+                self._bottom += len(rows)
+            new_words = self._new_words
+            for row, position in zip(rows, positions):
+                doc = len(self.rows)
+                self.rows.append(row)
+                self._ids[row.sha] = doc
+                self._positions.append(position)
+                for word in set(tokenize(row.message)) | set(tokenize(row.author)):
+                    docs = self._postings.get(word)
+                    if docs is None:
+                        docs = self._postings[word] = set()
+                        new_words.append(word)
+                    docs.add(doc)
+                self._sha_buckets.setdefault(row.sha[:SHA_BUCKET], []).append(doc)
+            return rows
+
+    def _merge_vocab(self):
+        # Yeni sözlər ilk axtarışda bir dəfəyə qoşulur (axın zamanı hər paketdə deyil); sıralı siyahıya
+        # sıralı paket qoşulanda timsort praktiki olaraq xətti işləyir
+        if not self._new_words: return
+        self._new_words.sort()
+        self._vocab.extend(self._new_words)
+        self._vocab.sort()
+        self._new_words = []
+
+    def _term_docs(self, term):
+        start = bisect.bisect_left(self._vocab, term)
+        sets = []
+        for word in itertools.islice(self._vocab, start, None):
+            if not word.startswith(term): break
+            sets.append(self._postings[word])
+        docs = set().union(*sets)
+        if len(term) >= SHA_BUCKET and _HEX.fullmatch(term):
+            docs.update(doc for doc in self._sha_buckets.get(term[:SHA_BUCKET], ()) if self.rows[doc].sha.startswith(term))
+        return docs
+
+    def search(self, query):
+        """Uyğun commitlər cədvəldəki sıra ilə (yenidən köhnəyə); boş sorğu üçün None."""
+        terms = tokenize(query)
+        if not terms: return None
+        with self.lock, span("search", "history", terms=len(terms)) as fields:
+            self._merge_vocab()
+            result = None
+            # Uzun sözlərin dəsti adətən kiçikdir - kəsişmə ondan başlayır
+            for term in sorted(set(terms), key=len, reverse=True):
+                docs = self._term_docs(term)
+                result = docs if result is None else result & docs
+                if not result: break
+            found = [self.rows[doc] for doc in sorted(result, key=self._positions.__getitem__)]
+            fields["matches"] = len(found)
+        return found
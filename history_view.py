@@ -0,0 +1,179 @@
+from collections import namedtuple
+from datetime import datetime
+
+# Tarixçə cədvəlinin bir sətri: GitPython obyekti və ya API lüğəti əvəzinə yığcam qeyd
+CommitRow = namedtuple("CommitRow", "sha message author timestamp parents")
+
+LOAD_MORE_THRESHOLD = 20
+
+
+def format_timestamp(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M')
+
+
+class VirtualHistoryTable:
+    """Treeview üzərində virtual cədvəl: yalnız görünən pəncərə qədər sətir saxlanılır,
+    sürüşdürmə zamanı bu sətirlərin dəyərləri yerində dəyişdirilir."""
+
+    def __init__(self, tree, scrollbar, row_height=25):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_height = row_height
+        self.rows = []
+        self.offset = 0
+        self.selected_index = None
+        self.has_more = False
+        self.loading = False
+        self.on_need_more = None
+        self.on_select = None
+        # Birləşmiş tarixçədə hash-dan əvvəl göstərilən işarə: row_marker(sha) -> mətn
+        self.row_marker = None
+        # Axtarış nəticəsi (None - süzgəc yoxdur); yüklənmiş bütün sətirlər `rows`-da qalır
+        self.matches = None
+        self._pool = []
+
+        self.scrollbar.configure(command=self._on_scrollbar)
+        self.tree.configure(yscrollcommand="")
+        self.tree.bind("<Configure>", self._on_configure, add="+")
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_by(3))
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self._move_selection(-self.visible_count))
+        self.tree.bind("<Next>", lambda e: self._move_selection(self.visible_count))
+        self.tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+
+    @property
+    def visible_count(self):
+        return len(self._pool)
+
+    @property
+    def shown(self):
+        return self.rows if self.matches is None else self.matches
+
+    # --- Məlumat ---
+    def set_rows(self, rows, has_more=False, marker=None):
+        """Cədvəli bir əməliyyatla tam əvəz edir; köhnə sətirlərə aid axtarış süzgəci də atılır."""
+        self.rows = list(rows)
+        self.matches = None
+        self.row_marker = marker
+        self.has_more = has_more
+        self.loading = False
+        self.offset = 0
+        self.selected_index = None
+        self.tree.selection_set(())
+        self._render()
+
+    def append_rows(self, rows, has_more=False):
+        self.rows.extend(rows)
+        self.has_more = has_more
+        self.loading = False
+        self._render()
+
+    def set_filter(self, matches):
+        """Cədvəldə yalnız `matches` göstərilir (None - hamısı); seçilmiş commit siyahıda qalırsa, seçili qalır."""
+        selected = self.selected_row()
+        self.matches = matches
+        self.selected_index = None
+        if selected:
+            self.selected_index = next((index for index, row in enumerate(self.shown) if row.sha == selected.sha), None)
+        if self.selected_index is None:
+            self.offset = 0
+        else:
+            self.offset = min(max(0, self.selected_index - self.visible_count // 2), self._max_offset())
+        self._render()
+
+    def selected_row(self):
+        if self.selected_index is None or self.selected_index >= len(self.shown): return None
+        return self.shown[self.selected_index]
+
+    # --- Sürüşdürmə ---
+    def _max_offset(self):
+        return max(0, len(self.shown) - self.visible_count)
+
+    def scroll_to(self, offset):
+        offset = min(max(0, int(offset)), self._max_offset())
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def scroll_by(self, delta):
+        self.scroll_to(self.offset + delta)
+        return "break"
+
+    def _on_mousewheel(self, event):
+        return self.scroll_by(-3 if event.delta > 0 else 3)
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.scroll_to(float(args[0]) * len(self.shown))
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1]
+            self.scroll_by(amount * (self.visible_count if unit == "pages" else 1))
+
+    def _move_selection(self, delta):
+        if not self.shown: return "break"
+        index = 0 if self.selected_index is None else self.selected_index + delta
+        index = min(max(0, index), len(self.shown) - 1)
+        self.selected_index = index
+        if index < self.offset:
+            self.offset = index
+        elif index >= self.offset + self.visible_count:
+            self.offset = index - self.visible_count + 1
+        self._render()
+        return "break"
+
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if selection and selection[0] in self._pool:
+            self.selected_index = self.offset + self._pool.index(selection[0])
+        if self.on_select: self.on_select(event)
+
+    # --- Çəkmə ---
+    def _on_configure(self, event):
+        count = max(1, (event.height - self.row_height) // self.row_height)
+        if count == len(self._pool): return
+        while len(self._pool) < count:
+            self._pool.append(self.tree.insert("", "end", iid=f"row{len(self._pool)}", values=("", "", "", "")))
+        if len(self._pool) > count:
+            self.tree.delete(*self._pool[count:])
+            del self._pool[count:]
+        self.offset = min(self.offset, self._max_offset())
+        self._render()
+
+    def _render(self):
+        selected_iid = None
+        shown = self.shown
+        for position, iid in enumerate(self._pool):
+            index = self.offset + position
+            if index < len(shown):
+                row = shown[index]
+                sha = f"{self.row_marker(row.sha)} {row.sha[:8]}" if self.row_marker else row.sha[:8]
+                self.tree.item(iid, values=(sha, row.message, row.author, format_timestamp(row.timestamp)))
+                self.tree.reattach(iid, "", position)
+                if index == self.selected_index: selected_iid = iid
+            else:
+                self.tree.detach(iid)
+        current = self.tree.selection()
+        if selected_iid and current != (selected_iid,):
+            self.tree.selection_set(selected_iid)
+            self.tree.focus(selected_iid)
+        elif not selected_iid and current:
+            self.tree.selection_set(())
+        self._update_scrollbar()
+        self._maybe_request_more()
+
+    def _update_scrollbar(self):
+        total = len(self.shown)
+        if total <= self.visible_count or total == 0:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + self.visible_count) / total)
+
+    def _maybe_request_more(self):
+        # Axtarış anbardakı bütün tarixçəni əhatə edir - süzgəc açıq ikən səhifə yüklənmir
+        if not self.has_more or self.loading or not self.on_need_more or self.matches is not None: return
+        if self.offset + self.visible_count >= len(self.rows) - LOAD_MORE_THRESHOLD:
+            self.loading = True
+            self.on_need_more()
@@ -0,0 +1,118 @@
+import re
+import time
+import logging
+import functools
+import threading
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from app_log import log
+
+RECENT_SPANS = 500
+SAMPLES_PER_OPERATION = 1000
+
+_SHA_RE = re.compile(r"^[0-9a-f]{7,40}$")
+
+
+class SpanRecorder:
+    """Son ölçmələri və hər əməliyyat növü üçün gecikmə nümunələrini yaddaşda saxlayır."""
+
+    def __init__(self, recent=RECENT_SPANS, samples=SAMPLES_PER_OPERATION):
+        self._recent = deque(maxlen=recent)
+        self._samples = {}
+        self._sample_size = samples
+        self._lock = threading.Lock()
+
+    def record(self, kind, name, seconds, fields):
+        with self._lock:
+            self._recent.append((time.time(), kind, name, seconds, fields))
+            samples = self._samples.get((kind, name))
+            if samples is None:
+                samples = self._samples[(kind, name)] = deque(maxlen=self._sample_size)
+            samples.append(seconds)
+
+    def recent(self, limit=100):
+        with self._lock:
+            return list(self._recent)[-limit:][::-1]
+
+    def stats(self):
+        """[(növ, ad, say, p50, p90, p99, maks)] - saniyə ilə, ümumi vaxta görə azalan sırada."""
+        with self._lock:
+            items = [(key, sorted(samples)) for key, samples in self._samples.items()]
+        rows = []
+        for (kind, name), values in items:
+            pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+            rows.append((kind, name, len(values), pick(0.5), pick(0.9), pick(0.99), values[-1], sum(values)))
+        rows.sort(key=lambda row: row[-1], reverse=True)
+        return [row[:-1] for row in rows]
+
+    def clear(self):
+        with self._lock:
+            self._recent.clear()
+            self._samples.clear()
+
+
+SPANS = SpanRecorder()
+
+
+@contextmanager
+def span(kind, name, **fields):
+    """Bloku ölçür və nəticəni SPANS-a, DEBUG səviyyəsində isə jurnal faylına yazır.
+
+    Qaytarılan lüğətə blok daxilində əlavə sahələr (status, bayt və s.) yazıla bilər."""
+    started = time.perf_counter()
+    try:
+        yield fields
+    except GeneratorExit:
+        # Axın istehlakçı tərəfindən tez dayandırılıb - xəta deyil
+        fields["stopped"] = True
+        raise
+    except BaseException as e:
+        fields["error"] = type(e).__name__
+        raise
+    finally:
+        seconds = time.perf_counter() - started
+        SPANS.record(kind, name, seconds, fields)
+        log(f"span {kind} {name}", level=logging.DEBUG, ms=f"{seconds * 1000:.1f}", **fields)
+
+
+def url_template(url):
+    """URL-dən sorğu parametrlərini və dəyişən hissələri (sahib/depo, sha, nömrələr) çıxarır:
+    `/repos/o/r/commits/abc123` -> `/repos/{owner}/{repo}/commits/{sha}`."""
+    parts = urlparse(url).path.split("/")
+    if len(parts) > 3 and parts[1] == "repos":
+        parts[2], parts[3] = "{owner}", "{repo}"
+    for index, part in enumerate(parts):
+        if part.isdigit():
+            parts[index] = "{n}"
+        elif _SHA_RE.match(part) and any(c.isdigit() for c in part):
+            parts[index] = "{sha}"
+    return "/".join(parts) or "/"
+
+
+def _git_subcommand(command):
+    if isinstance(command, str): return command.split()[1] if " " in command else command
+    args = list(command)[1:]
+    skip_next = False
+    for arg in args:
+        if skip_next:
+            skip_next = False
+        elif arg in ("-c", "-C"):
+            skip_next = True
+        elif not str(arg).startswith("-"):
+            return str(arg)
+    return "git"
+
+
+def instrument_git(git_module):
+    """GitPython-un bütün git əmrlərinin keçdiyi `Git.execute` metodunu ölçmə ilə bükür."""
+    execute = git_module.cmd.Git.execute
+    if getattr(execute, "_instrumented", False): return
+
+    @functools.wraps(execute)
+    def traced(self, command, *args, **kwargs):
+        with span("git", _git_subcommand(command)):
+            return execute(self, command, *args, **kwargs)
+
+    traced._instrumented = True
+    git_module.cmd.Git.execute = traced
@@ -0,0 +1,51 @@
+import sys
+import importlib
+import threading
+
+_import_hooks = {}
+_hooks_lock = threading.Lock()
+
+
+def when_imported(name, callback):
+    """Modul LazyModule vasitəsilə ilk yükləndikdə `callback(modul)` çağırılır (artıq yüklənibsə dərhal)."""
+    with _hooks_lock:
+        module = sys.modules.get(name)
+        if module is None:
+            _import_hooks.setdefault(name, []).append(callback)
+            return
+    callback(module)
+
+
+class LazyModule:
+    """Modulu ilk atribut müraciətinə qədər idxal etməyən, thread-təhlükəsiz əvəzçi.
+
+    `git` və `requests` kimi ağır kitabxanalar pəncərə çəkiləndən sonra, ilk lazım olduqda yüklənir."""
+
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._module is None:
+                module = importlib.import_module(self._name)
+                with _hooks_lock:
+                    hooks = _import_hooks.pop(self._name, [])
+                for callback in hooks: callback(module)
+                self.__dict__["_module"] = module
+        return self._module
+
+    @property
+    def is_loaded(self):
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._module or self._load(), attr)
+
+    def __repr__(self):
+        return f"<LazyModule '{self._name}' ({'yüklənib' if self.is_loaded else 'gözləyir'})>"
+
+
+def lazy_module(name):
+    return LazyModule(name)
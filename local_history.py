@@ -0,0 +1,61 @@
+import subprocess
+from lazy_import import lazy_module
+from history_view import CommitRow
+from instrumentation import span
+
+git = lazy_module("git")
+
+# Sahələr \x1f, qeydlər \x1e ilə ayrılır - commit mesajlarında bu simvollar olmur
+LOG_FORMAT = "%H%x1f%P%x1f%an%x1f%at%x1f%s%x1e"
+FIELD_SEP = b"\x1f"
+RECORD_SEP = b"\x1e"
+READ_SIZE = 64 * 1024
+
+
+def _parse_record(record):
+    sha, parents, author, timestamp, subject = record.strip(b"\n").split(FIELD_SEP, 4)
+    return CommitRow(sha.decode("ascii"), subject.decode("utf-8", "replace"), author.decode("utf-8", "replace"),
+                     int(timestamp), tuple(parents.decode("ascii").split()))
+
+
+def iter_log_batches(repo_path, rev="main", skip=0, max_count=None, batch_size=250):
+    """Tək `git log` prosesi işlədir və çıxışını axın şəklində CommitRow paketlərinə çevirir."""
+    args = [git.Git.GIT_PYTHON_GIT_EXECUTABLE or "git", "-C", repo_path, "log", f"--format={LOG_FORMAT}", "--no-color"]
+    if skip: args.append(f"--skip={skip}")
+    if max_count: args.append(f"--max-count={max_count}")
+    args += [rev, "--"]
+
+    process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.DEVNULL,
+                               creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+    # Ölçmə istehlakçının paketləri emal etdiyi vaxtı da əhatə edir
+    with span("git", "log", skip=skip) as fields:
+        try:
+            buffer, batch, count = b"", [], 0
+            while True:
+                chunk = process.stdout.read1(READ_SIZE)
+                if not chunk: break
+                buffer += chunk
+                *records, buffer = buffer.split(RECORD_SEP)
+                for record in records:
+                    batch.append(_parse_record(record))
+                    if len(batch) >= batch_size:
+                        count += len(batch)
+                        fields["commits"] = count
+                        yield batch
+                        batch = []
+            if buffer.strip():
+                batch.append(_parse_record(buffer))
+            if batch:
+                fields["commits"] = count + len(batch)
+                yield batch
+
+            status = process.wait()
+            if status != 0:
+                raise git.exc.GitCommandError(args, status, process.stderr.read())
+        finally:
+            # İstehlakçı tez dayanarsa (məs. başqa depo seçildi) proses dərhal dayandırılır
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            process.stderr.close()
@@ -1,6 +1,15 @@
+import startup_timing
+from app_log import setup_logging
+import importlib.util
 import customtkinter as ctk
 from tkinter import messagebox, ttk
 from git_functions import GitFunctions
+from history_view import VirtualHistoryTable
+from repo_sidebar import VirtualRepoList
+from status_panel import WorktreeStatusPanel
+from commit_detail_pane import CommitDetailPane
+
+startup_timing.mark("idxallar")
 
 class GitApp(ctk.CTk):
     def __init__(self):
@@ -39,15 +48,39 @@ class GitApp(ctk.CTk):
         self.create_left_sidebar()
         self.create_right_main_area()
 
-        self.status_bar = ctk.CTkLabel(self, text="Hazır vəziyyətdə.", anchor="w")
-        self.status_bar.grid(row=1, column=0, columnspan=2, padx=20, pady=(5, 10), sticky="ew")
-
-        self.after(100, self.functions.load_config)
+        status_frame = ctk.CTkFrame(self, fg_color="transparent")
+        status_frame.grid(row=1, column=0, columnspan=2, padx=20, pady=(5, 10), sticky="ew")
+        self.status_bar = ctk.CTkLabel(status_frame, text="Hazır vəziyyətdə.", anchor="w")
+        self.status_bar.pack(side="left", fill="x", expand=True)
+        self.queue_label = ctk.CTkLabel(status_frame, text="", text_color="gray", anchor="e")
+        self.queue_label.pack(side="right")
+        self.rate_label = ctk.CTkLabel(status_frame, text="", text_color="gray", anchor="e")
+        self.rate_label.pack(side="right", padx=(0, 15))
+        self.diagnostics_button = ctk.CTkButton(status_frame, text="Diaqnostika", width=90, height=24,
+                                                command=self.functions.handle_open_diagnostics)
+        self.diagnostics_button.pack(side="right", padx=(0, 15))
+
+        self._first_frame_seen = False
+        self.bind("<Map>", self._on_first_map, add="+")
+        self.bind("<FocusIn>", self.functions.handle_window_focus, add="+")
+
+    def _on_first_map(self, event):
+        if event.widget is not self or self._first_frame_seen: return
+        self._first_frame_seen = True
+        startup_timing.mark("pəncərə çəkildi")
+        # İlk boş dövrə pəncərənin artıq istifadəyə hazır olduğu ilk kadrdır
+        self.after_idle(self._on_first_frame)
+
+    def _on_first_frame(self):
+        startup_timing.mark("ilk interaktiv kadr")
+        startup_timing.report()
+        self.functions.load_config()
+        self.functions.start_status_poll()
 
     def create_left_sidebar(self):
         sidebar_frame = ctk.CTkFrame(self, width=280, corner_radius=10)
         sidebar_frame.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
-        sidebar_frame.grid_rowconfigure(3, weight=1) # repo_list_frame üçün
+        sidebar_frame.grid_rowconfigure(3, weight=1) # repo_list üçün
 
         # Hesab və İstifadəçi Məlumatları Paneli
         control_frame = ctk.CTkFrame(sidebar_frame)
@@ -56,8 +89,10 @@ class GitApp(ctk.CTk):
         ctk.CTkLabel(control_frame, text="GitHub Access Token", font=ctk.CTkFont(weight="bold")).pack(anchor="w", padx=10, pady=(10,0))
         self.token_entry = ctk.CTkEntry(control_frame, placeholder_text="ghp_...")
         self.token_entry.pack(fill="x", padx=10, pady=5)
-        self.connect_button = ctk.CTkButton(control_frame, text="Hesaba Bağlan", command=self.functions.run_in_thread(self.functions.handle_connect_account))
-        self.connect_button.pack(fill="x", padx=10, pady=(0,15))
+        self.connect_button = ctk.CTkButton(control_frame, text="Hesaba Bağlan", command=self.functions.handle_connect_account)
+        self.connect_button.pack(fill="x", padx=10, pady=(0,5))
+        self.graphql_checkbox = ctk.CTkCheckBox(control_frame, text="GraphQL ilə toplu yüklə (depolar + son commitlər)")
+        self.graphql_checkbox.pack(anchor="w", padx=10, pady=(0,15))
         
         # --- YENİ İSTİFADƏÇİ MƏLUMATLARI BÖLMƏSİ ---
         ctk.CTkLabel(control_frame, text="Git İstifadəçi Məlumatları (Commit üçün)", font=ctk.CTkFont(weight="bold")).pack(anchor="w", padx=10, pady=(10,0))
@@ -82,15 +117,16 @@ class GitApp(ctk.CTk):
         self.select_source_button = ctk.CTkButton(local_repo_frame, text="Commit üçün Qovluq Seç...", command=self.functions.handle_select_source_folder)
         self.select_source_button.pack(fill="x", padx=10, pady=5)
         self.source_path_label = ctk.CTkLabel(local_repo_frame, text="Qovluq seçilməyib", text_color="gray", anchor="w", wraplength=220)
-        self.source_path_label.pack(fill="x", padx=10, pady=(0, 10))
+        self.source_path_label.pack(fill="x", padx=10, pady=(0, 5))
+        self.batch_button = ctk.CTkButton(local_repo_frame, text="Toplu Sinxronizasiya...", command=self.functions.handle_open_batch_window)
+        self.batch_button.pack(fill="x", padx=10, pady=(0, 10))
 
         # Onlayn Anbarlar
         repo_list_label = ctk.CTkLabel(sidebar_frame, text="Onlayn Depolar (Hədəf)", font=ctk.CTkFont(weight="bold"))
         repo_list_label.grid(row=2, column=0, padx=15, pady=(0, 5), sticky="w")
-        self.repo_list_frame = ctk.CTkScrollableFrame(sidebar_frame, corner_radius=5)
-        self.repo_list_frame.grid(row=3, column=0, padx=15, pady=(0, 15), sticky="nsew")
-        
-        ctk.CTkLabel(self.repo_list_frame, text="Hesaba qoşulun...").pack(pady=20)
+        self.repo_list = VirtualRepoList(sidebar_frame, empty_text="Hesaba qoşulun...", corner_radius=5)
+        self.repo_list.grid(row=3, column=0, padx=15, pady=(0, 15), sticky="nsew")
+        self.repo_list.on_select = self.functions.handle_repo_click
 
     def create_right_main_area(self):
         # Bu funksiyada dəyişiklik yoxdur, olduğu kimi qalır
@@ -106,11 +142,25 @@ class GitApp(ctk.CTk):
         self.source_label.pack(fill="x", padx=10, pady=5)
         self.target_label = ctk.CTkLabel(info_frame, text="Hədəf (Onlayn): Heç bir depo seçilməyib", anchor="w")
         self.target_label.pack(fill="x", padx=10, pady=5)
+        # ↑ yalnız lokal, ↓ yalnız onlayn, = hər ikisində olan commitlər
+        self.merged_history_button = ctk.CTkButton(info_frame, text="Lokal + Onlayn Tarixçəni Müqayisə Et",
+                                                   command=self.functions.handle_show_merged_history)
+        self.merged_history_button.pack(anchor="w", padx=10, pady=(0, 10))
         
         table_frame = ctk.CTkFrame(right_frame, fg_color="transparent")
         table_frame.grid(row=1, column=0, padx=15, pady=10, sticky="nsew")
         table_frame.grid_columnconfigure(0, weight=1)
-        table_frame.grid_rowconfigure(0, weight=1)
+        table_frame.grid_rowconfigure(1, weight=1)
+
+        # Mesaj, müəllif və ya SHA üzrə axtarış anbardakı bütün tarixçəni əhatə edir
+        search_frame = ctk.CTkFrame(table_frame, fg_color="transparent")
+        search_frame.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 5))
+        search_frame.grid_columnconfigure(0, weight=1)
+        self.history_search_entry = ctk.CTkEntry(search_frame, placeholder_text="Tarixçədə axtar (mesaj, müəllif, SHA)...")
+        self.history_search_entry.grid(row=0, column=0, sticky="ew")
+        self.history_search_entry.bind("<KeyRelease>", lambda e: self.functions.handle_history_search(self.history_search_entry.get()))
+        self.history_search_label = ctk.CTkLabel(search_frame, text="", text_color="gray", anchor="e")
+        self.history_search_label.grid(row=0, column=1, padx=(10, 0))
 
         columns = ("hash", "message", "author", "date")
         self.commit_history_table = ttk.Treeview(table_frame, columns=columns, show="headings", selectmode="browse")
@@ -125,16 +175,31 @@ class GitApp(ctk.CTk):
         self.commit_history_table.column("author", width=150, stretch=False)
         self.commit_history_table.column("date", width=150, stretch=False)
 
-        self.commit_history_table.grid(row=0, column=0, sticky="nsew")
-
-        scrollbar = ctk.CTkScrollbar(table_frame, command=self.commit_history_table.yview)
-        scrollbar.grid(row=0, column=1, sticky="ns")
-        self.commit_history_table.configure(yscrollcommand=scrollbar.set)
-        
-        self.commit_history_table.bind("<<TreeviewSelect>>", self.functions.handle_commit_selection_event)
+        self.commit_history_table.grid(row=1, column=0, sticky="nsew")
+
+        scrollbar = ctk.CTkScrollbar(table_frame)
+        scrollbar.grid(row=1, column=1, sticky="ns")
+
+        # Cədvəl virtualdır: sürüşdürmə və seçim VirtualHistoryTable tərəfindən idarə olunur
+        self.history_view = VirtualHistoryTable(self.commit_history_table, scrollbar)
+        self.history_view.on_select = self.functions.handle_commit_selection_event
+        self.history_view.on_need_more = self.functions.handle_load_more_history
+
+        # İşçi qovluq və seçilmiş commit-in detalları eyni yeri paylaşır
+        self.detail_tabs = ctk.CTkTabview(right_frame, height=260)
+        self.detail_tabs.grid(row=2, column=0, padx=15, pady=(0, 5), sticky="ew")
+        worktree_tab = self.detail_tabs.add("İşçi Qovluq")
+        commit_tab = self.detail_tabs.add("Commit Detalları")
+        for tab in (worktree_tab, commit_tab):
+            tab.grid_columnconfigure(0, weight=1)
+            tab.grid_rowconfigure(0, weight=1)
+        self.worktree_panel = WorktreeStatusPanel(worktree_tab)
+        self.worktree_panel.grid(row=0, column=0, sticky="nsew")
+        self.commit_detail_pane = CommitDetailPane(commit_tab)
+        self.commit_detail_pane.grid(row=0, column=0, sticky="nsew")
 
         action_frame = ctk.CTkFrame(right_frame)
-        action_frame.grid(row=2, column=0, padx=15, pady=15, sticky="ew")
+        action_frame.grid(row=3, column=0, padx=15, pady=15, sticky="ew")
         action_frame.grid_columnconfigure(0, weight=1)
 
         pull_push_frame = ctk.CTkFrame(action_frame, fg_color="transparent")
@@ -143,9 +208,14 @@ class GitApp(ctk.CTk):
         
         self.pull_button = ctk.CTkButton(pull_push_frame, text="Dəyişiklikləri Çək (Pull)", command=self.functions.handle_pull)
         self.pull_button.grid(row=0, column=0, padx=(0,10))
+        self.pull_options_button = ctk.CTkButton(pull_push_frame, text="Pull Ayarları...", width=110, command=self.functions.handle_open_pull_options)
+        self.pull_options_button.grid(row=0, column=1, sticky="w")
         
+        # Lokal HEAD-in onlayn 'main'-dən irəlidə (↑) və geridə (↓) olduğu commit sayı
+        self.push_state_label = ctk.CTkLabel(pull_push_frame, text="", text_color="gray", anchor="e")
+        self.push_state_label.grid(row=0, column=2, sticky="e")
         self.commit_push_button = ctk.CTkButton(pull_push_frame, text="Commit et və Göndər (Push)", command=self.functions.handle_commit_and_push)
-        self.commit_push_button.grid(row=0, column=2, padx=(10,0))
+        self.commit_push_button.grid(row=0, column=3, padx=(10,0))
         
         commit_message_frame = ctk.CTkFrame(action_frame, fg_color="transparent")
         commit_message_frame.grid(row=1, column=0, sticky="ew", padx=10, pady=10)
@@ -163,17 +233,19 @@ class GitApp(ctk.CTk):
         button_sub_frame.grid(row=0, column=1, sticky="e")
         self.zip_commit_button = ctk.CTkButton(button_sub_frame, text="Commit'i .zip Yüklə", command=self.functions.handle_zip_commit)
         self.zip_commit_button.pack(side="right", padx=(10,0))
+        self.cancel_download_button = ctk.CTkButton(button_sub_frame, text="Endirməni Dayandır", width=130, state="disabled",
+                                                    command=self.functions.handle_cancel_download)
+        self.cancel_download_button.pack(side="right", padx=(10,0))
         self.load_commit_button = ctk.CTkButton(button_sub_frame, text="Commitə Qayıt (Reset)", command=self.functions.handle_load_commit)
         self.load_commit_button.pack(side="right")
 
 
 if __name__ == "__main__":
-    try:
-        import git
-        import requests
-    except ImportError:
+    # Kitabxanalar burada idxal edilmir, yalnız mövcudluğu yoxlanılır (onlar ilk lazım olduqda yüklənir)
+    if any(importlib.util.find_spec(name) is None for name in ("git", "requests")):
         messagebox.showerror("Kitabxana Xətası", "Zəhmət olmasa, tələb olunan kitabxanaları quraşdırın:\npip install customtkinter GitPython requests")
         exit()
         
+    setup_logging()
     app = GitApp()
     app.mainloop()
\ No newline at end of file
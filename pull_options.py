@@ -0,0 +1,115 @@
+from app_log import log
+from lazy_import import lazy_module
+
+git = lazy_module("git")
+
+# Hər hədəf deposu üçün konfiqurasiyada (depo ayarları: full_name -> "pull_options") saxlanılan ayarlar.
+# depth: 0 - bütün tarixçə, N - yalnız son N commit; blobless: köhnə commitlərin fayl
+# məzmunu endirilmir (lazım olduqda serverdən alınır); ff_only: birləşdirmə commit-i yaradılmır.
+DEFAULT_PULL_OPTIONS = {"depth": 0, "blobless": False, "ff_only": False}
+# Dayaz depoda ortaq valideyn axtarışı: hər addımda bu qədər commit, bu qədər addımdan sonra --unshallow
+DEEPEN_STEP = 50
+MAX_DEEPEN_ATTEMPTS = 4
+
+_STAGE_TITLES = (
+    ("COUNTING", "Obyektlər sayılır"),
+    ("COMPRESSING", "Obyektlər sıxılır"),
+    ("RECEIVING", "Obyektlər qəbul edilir"),
+    ("RESOLVING", "Dəltalar həll edilir"),
+    ("FINDING_SOURCES", "Mənbələr axtarılır"),
+    ("CHECKING_OUT", "Fayllar çıxarılır"),
+)
+
+
+def pull_options_for(config, full_name):
+    options = dict(DEFAULT_PULL_OPTIONS)
+    options.update(config.repo_setting(full_name, "pull_options", {}))
+    return options
+
+
+def set_pull_options(config, full_name, options):
+    """Standart dəyərlərlə eyni olan ayarlar konfiqurasiyada saxlanılmır."""
+    options = {key: options[key] for key in DEFAULT_PULL_OPTIONS if options.get(key, DEFAULT_PULL_OPTIONS[key]) != DEFAULT_PULL_OPTIONS[key]}
+    config.set_repo_setting(full_name, "pull_options", options or None)
+
+
+def describe_options(options):
+    parts = []
+    if options.get("depth"): parts.append(f"dərinlik {options['depth']}")
+    if options.get("blobless"): parts.append("blobsuz")
+    if options.get("ff_only"): parts.append("yalnız fast-forward")
+    return ", ".join(parts) or "tam tarixçə"
+
+
+def is_first_sync(repo):
+    """Lokal budaqda hələ commit yoxdursa (boş və ya yenicə yaradılmış depo) - dərinlik yalnız onda tətbiq olunur."""
+    return not repo.head.is_valid()
+
+
+def fetch_kwargs(options, first_sync=True):
+    """`first_sync` False olduqda dərinlik nəzərə alınmır: mövcud tarixçənin üzərinə dayaz fetch
+    ortaq valideyni kəsər və sonrakı birləşdirməni mümkünsüz edərdi."""
+    kwargs = {}
+    if options.get("depth") and first_sync: kwargs["depth"] = int(options["depth"])
+    # İlk --filter ilə fetch remote-u "promisor" kimi qeyd edir (qismən klon), sonrakılar da filtrlə gedir
+    if options.get("blobless"): kwargs["filter"] = "blob:none"
+    return kwargs
+
+
+def is_shallow(repo):
+    return repo.git.rev_parse("--is-shallow-repository") == "true"
+
+
+def _has_merge_base(repo):
+    try:
+        repo.git.merge_base("HEAD", "FETCH_HEAD")
+        return True
+    except git.GitCommandError:
+        return False
+
+
+def deepen_until_merge_base(repo, remote, branch, options, progress=None):
+    """Dayaz depoda HEAD ilə FETCH_HEAD-in ortaq valideyni tapılana qədər tarixçə addım-addım dərinləşdirilir;
+    tapılmazsa, tarixçə tam endirilir (--unshallow)."""
+    step = max(int(options.get("depth") or 0), DEEPEN_STEP)
+    kwargs = fetch_kwargs(options, first_sync=False)
+    for _ in range(MAX_DEEPEN_ATTEMPTS):
+        if not is_shallow(repo) or _has_merge_base(repo): return
+        log(f"Ortaq valideyn tapılmadı, tarixçə {step} commit dərinləşdirilir...")
+        remote.fetch(branch, progress=progress, deepen=step, **kwargs)
+    if not is_shallow(repo) or _has_merge_base(repo): return
+    log("Ortaq valideyn hələ də tapılmadı, tam tarixçə endirilir (--unshallow)...")
+    remote.fetch(branch, progress=progress, unshallow=True, **kwargs)
+
+
+def progress_reporter(callback):
+    """GitPython-un `progress` parametri üçün funksiya: `callback(mərhələ, faiz və ya None, mesaj)`."""
+    def report(op_code, cur_count, max_count=None, message=""):
+        stage = op_code & git.RemoteProgress.OP_MASK
+        title = next((text for name, text in _STAGE_TITLES if stage == getattr(git.RemoteProgress, name, None)), "Gedir")
+        percent = int(cur_count * 100 / max_count) if max_count else None
+        callback(title, percent, (message or "").strip(" ,"))
+    return report
+
+
+def pull_with_options(repo, remote, branch, options, progress=None):
+    """Əvvəlcə seçilmiş rejimdə fetch, sonra FETCH_HEAD-in birləşdirilməsi (`git pull` əvəzinə -
+    `git pull` --filter qəbul etmir). Birləşdirmədən əvvəlki və sonrakı HEAD-i qaytarır.
+
+    Dərinlik yalnız ilk sinxronizasiyada tətbiq olunur; sonra dayaz depo ortaq valideyn tapılana qədər dərinləşdirilir."""
+    first_sync = is_first_sync(repo)
+    kwargs = fetch_kwargs(options, first_sync)
+    reporter = progress_reporter(progress) if progress else None
+    log(f"'{remote.name}/{branch}' çəkilir ({describe_options(options)})...")
+    remote.fetch(branch, progress=reporter, **kwargs)
+    before = repo.head.commit.hexsha if repo.head.is_valid() else None
+    if not first_sync: deepen_until_merge_base(repo, remote, branch, options, reporter)
+    if options.get("ff_only"):
+        repo.git.merge("--ff-only", "FETCH_HEAD")
+    elif first_sync or is_shallow(repo):
+        # Dayaz tarixçədə ortaq valideynin olmaması kəsilmiş tarixçənin nəticəsi ola bilər - əlaqəsiz
+        # tarixçələrin birləşdirilməsinə icazə verilmir (boş budaq isə sadəcə FETCH_HEAD-ə keçir)
+        repo.git.merge("--no-edit", "FETCH_HEAD")
+    else:
+        repo.git.merge("--allow-unrelated-histories", "--no-edit", "FETCH_HEAD")
+    return before, repo.head.commit.hexsha
@@ -0,0 +1,44 @@
+import customtkinter as ctk
+from tkinter import messagebox
+
+
+class PullOptionsDialog(ctk.CTkToplevel):
+    """Bir hədəf deposu üçün pull rejimi: dayaz tarixçə, blobsuz (qismən) fetch və yalnız fast-forward."""
+
+    def __init__(self, master, full_name, options, on_save):
+        super().__init__(master)
+        self.full_name = full_name
+        self.on_save = on_save
+        self.title("Pull Ayarları")
+        self.geometry("460x330")
+        self.resizable(False, False)
+
+        ctk.CTkLabel(self, text=full_name, font=ctk.CTkFont(weight="bold"), anchor="w").pack(fill="x", padx=20, pady=(20, 10))
+
+        ctk.CTkLabel(self, text="Tarixçə dərinliyi (0 - bütün tarixçə):", anchor="w").pack(fill="x", padx=20)
+        self.depth_entry = ctk.CTkEntry(self, placeholder_text="Məs: 1")
+        self.depth_entry.insert(0, str(options.get("depth") or 0))
+        self.depth_entry.pack(fill="x", padx=20, pady=(2, 10))
+
+        self.blobless_checkbox = ctk.CTkCheckBox(self, text="Blobsuz fetch (köhnə faylların məzmunu lazım olduqda endirilir)")
+        if options.get("blobless"): self.blobless_checkbox.select()
+        self.blobless_checkbox.pack(anchor="w", padx=20, pady=5)
+        self.ff_only_checkbox = ctk.CTkCheckBox(self, text="Yalnız fast-forward (birləşdirmə commit-i yaradılmır)")
+        if options.get("ff_only"): self.ff_only_checkbox.select()
+        self.ff_only_checkbox.pack(anchor="w", padx=20, pady=5)
+
+        ctk.CTkLabel(self, text="Böyük depolarda ilk çəkiliş üçün dərinlik 1 və blobsuz rejim\nendirilən həcmi kəskin azaldır.",
+                     text_color="gray", justify="left", anchor="w").pack(fill="x", padx=20, pady=(10, 0))
+        ctk.CTkButton(self, text="Yadda Saxla", command=self._save).pack(fill="x", padx=20, pady=20)
+        self.after(100, self.grab_set)
+
+    def _save(self):
+        try:
+            depth = int(self.depth_entry.get().strip() or 0)
+            if depth < 0: raise ValueError
+        except ValueError:
+            messagebox.showwarning("Yanlış Dəyər", "Dərinlik mənfi olmayan tam ədəd olmalıdır.", parent=self)
+            return
+        self.on_save(self.full_name, {"depth": depth, "blobless": bool(self.blobless_checkbox.get()),
+                                      "ff_only": bool(self.ff_only_checkbox.get())})
+        self.destroy()
@@ -0,0 +1,85 @@
+import tempfile
+from collections import namedtuple
+from app_log import log
+from instrumentation import span
+
+# Keşdəki onlayn tarixçədən "geridə qalma" sayını hesablayarkən baxılan maksimum commit sayı
+HISTORY_SCAN_LIMIT = 2000
+# Fonda işləyən ls-remote parol soruşub asılı qalmasın
+NO_PROMPT_ENV = {"GIT_TERMINAL_PROMPT": "0"}
+
+# ahead/behind: lokal HEAD-in onlayn filialdan irəlidə/geridə olduğu commit sayı.
+# None - onlayn uc lokal anbarda yoxdur və dəqiq say məlum deyil (behind ən azı 1-dir).
+Preflight = namedtuple("Preflight", "remote_sha ahead behind")
+
+
+def will_be_rejected(preflight):
+    """Onlayn filialda lokalda olmayan commitlər varsa, push fast-forward olmadığı üçün rədd ediləcək."""
+    return preflight.behind != 0
+
+
+def describe_preflight(preflight):
+    if preflight is None: return "↑? ↓?"
+    ahead, behind = ("?" if value is None else value for value in (preflight.ahead, preflight.behind))
+    return f"↑{ahead} ↓{behind}"
+
+
+def remote_tip(repo, url, branch):
+    """`git ls-remote` ilə onlayn filialın ucu (heç bir obyekt endirilmir); filial yoxdursa None."""
+    output = repo.git.ls_remote(url, f"refs/heads/{branch}", env=NO_PROMPT_ENV)
+    for line in output.splitlines():
+        sha, _, ref = line.partition("\t")
+        if ref == f"refs/heads/{branch}": return sha
+    return None
+
+
+def _missing_commits(repo, shas):
+    """Lokal anbarda olmayan commitlərin siyahısı (bir `cat-file --batch-check` çağırışı ilə)."""
+    with tempfile.TemporaryFile() as stream:
+        stream.write("\n".join(shas).encode() + b"\n")
+        stream.seek(0)
+        output = repo.git.cat_file("--batch-check", istream=stream)
+    return {line.split()[0] for line in output.splitlines() if line.endswith(" missing")}
+
+
+def behind_from_history(repo, rows):
+    """Keşdəki onlayn tarixçə (yenidən köhnəyə) üzrə lokalda olmayan ilk commitləri sayır.
+
+    (say, lokalda olan ilk onlayn commit) qaytarır; ona çatmaq mümkün deyilsə (None, None)."""
+    rows = rows[:HISTORY_SCAN_LIMIT]
+    if not rows: return None, None
+    missing = _missing_commits(repo, [row.sha for row in rows])
+    for index, row in enumerate(rows):
+        if row.sha not in missing: return index, row.sha
+    return None, None
+
+
+def check_push(repo, url, branch, cached_rows=()):
+    """Push-dan əvvəl lokal HEAD-i onlayn filialla müqayisə edir.
+
+    Onlayn uc lokal anbarda varsa, sayılar `rev-list --left-right --count` ilə dəqiq hesablanır;
+    yoxdursa, keşdəki onlayn tarixçədən (ucu eyni olduqda) geridə qalma sayı təxmin edilir."""
+    with span("git", "preflight", branch=branch) as fields:
+        remote_sha = remote_tip(repo, url, branch)
+        local = repo.head.is_valid()
+        if remote_sha is None:
+            ahead = int(repo.git.rev_list("--count", "HEAD")) if local else 0
+            result = Preflight(None, ahead, 0)
+        elif not local:
+            result = Preflight(remote_sha, 0, None)
+        elif remote_sha not in _missing_commits(repo, [remote_sha]):
+            behind, ahead = repo.git.rev_list("--left-right", "--count", f"{remote_sha}...HEAD").split()
+            result = Preflight(remote_sha, int(ahead), int(behind))
+        else:
+            behind = ahead = None
+            if cached_rows and cached_rows[0].sha == remote_sha:
+                behind, base = behind_from_history(repo, list(cached_rows))
+                # Obyektin anbarda olması kifayət deyil - o, lokal tarixçənin bir hissəsi olmalıdır
+                if base and repo.is_ancestor(base, "HEAD"):
+                    ahead = int(repo.git.rev_list("--count", f"{base}..HEAD"))
+                else:
+                    behind = None
+            result = Preflight(remote_sha, ahead, behind)
+        fields.update(ahead=result.ahead, behind=result.behind)
+    log(f"Push yoxlaması: {describe_preflight(result)} (onlayn uc: {(remote_sha or '∅')[:8]})")
+    return result
@@ -0,0 +1,135 @@
+import time
+import random
+import threading
+from datetime import datetime
+from app_log import log
+
+# Fon sorğuları üçün toxunulmaz ehtiyat: limitin bu hissəsi yalnız istifadəçi əməliyyatlarına qalır
+RESERVE_FRACTION = 0.1
+RESERVE_MIN = 50
+# Qalıq limit bu hissədən az olanda fon sorğuları sıfırlanmaya qədər bərabər paylanır
+PACING_FRACTION = 0.5
+# İstifadəçi bundan uzun gözləməməlidir - əvəzində xəta göstərilir
+MAX_INLINE_WAIT = 60
+SECONDARY_BACKOFF = 60
+MAX_BACKOFF = 15 * 60
+
+
+class RateLimitError(Exception):
+    """Sorğu limit səbəbindən göndərilmədi (və ya rədd edildi)."""
+
+    def __init__(self, message, retry_at=None):
+        super().__init__(message)
+        self.retry_at = retry_at
+
+
+def _format_clock(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime('%H:%M:%S')
+
+
+class RateBudget:
+    """GitHub API limitinin (`X-RateLimit-*` başlıqları) izlənməsi və sorğuların ona uyğun tənzimlənməsi.
+
+    İstifadəçi sorğuları limit bitənə qədər gecikdirilmir; fon sorğuları isə ehtiyata toxunmadan,
+    sıfırlanma vaxtına qədər qalan limitə bərabər paylanır. 403/429 cavablarından sonra
+    `Retry-After` (yoxdursa eksponensial) gözləmə və təsadüfi sürüşmə tətbiq olunur."""
+
+    def __init__(self, on_change=None):
+        self.on_change = on_change
+        self.limit = None
+        self.remaining = None
+        self.reset_at = None
+        self._blocked_until = 0.0
+        self._strikes = 0
+        self._next_background = 0.0
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        with self._lock:
+            return self.limit, self.remaining, self.reset_at, self._blocked_until
+
+    def describe(self):
+        limit, remaining, reset_at, blocked_until = self.snapshot()
+        if blocked_until > time.time():
+            return f"API: gözlənilir ({_format_clock(blocked_until)}-dək)"
+        if remaining is None: return ""
+        text = f"API: {remaining}/{limit}"
+        if reset_at and remaining < limit: text += f" (yenilənmə {_format_clock(reset_at)})"
+        return text
+
+    def _reserve(self):
+        return max(RESERVE_MIN, int((self.limit or 0) * RESERVE_FRACTION))
+
+    # --- Sorğudan əvvəl ---
+    def acquire(self, interactive=True):
+        """Sorğuya icazə verilənə qədər gözləyir; gözləmə çox uzundursa RateLimitError atır."""
+        while True:
+            now = time.time()
+            with self._lock:
+                wait, retry_at = self._wait_time(now, interactive)
+                if wait <= 0:
+                    # Başlıqlar gələnə qədər paralel sorğular üçün təxmini hesab
+                    if self.remaining: self.remaining -= 1
+                    return
+            if wait > MAX_INLINE_WAIT:
+                raise RateLimitError(f"GitHub API limiti bitib, {_format_clock(retry_at)}-dən sonra yenidən cəhd edin.", retry_at)
+            time.sleep(wait)
+
+    def _wait_time(self, now, interactive):
+        if self._blocked_until > now:
+            return self._blocked_until - now, self._blocked_until
+        if self.remaining is None or self.reset_at is None or self.reset_at <= now:
+            return 0, None
+        if interactive:
+            return (0, None) if self.remaining > 0 else (self.reset_at - now, self.reset_at)
+        usable = self.remaining - self._reserve()
+        if usable <= 0:
+            return self.reset_at - now, self.reset_at
+        if self.remaining >= self.limit * PACING_FRACTION:
+            return 0, None
+        # Qalan fon sorğuları sıfırlanmaya qədər bərabər intervallarla göndərilir
+        interval = (self.reset_at - now) / usable
+        if self._next_background > now:
+            return self._next_background - now, self._next_background
+        self._next_background = now + interval
+        return 0, None
+
+    # --- Cavabdan sonra ---
+    def update(self, response):
+        """Cavab başlıqlarından limiti oxuyur; limitə görə rədd edilibsə True qaytarır."""
+        headers = response.headers
+        limited = False
+        with self._lock:
+            if "X-RateLimit-Remaining" in headers and headers.get("X-RateLimit-Resource", "core") == "core":
+                try:
+                    self.limit = int(headers.get("X-RateLimit-Limit", self.limit or 0))
+                    self.remaining = int(headers["X-RateLimit-Remaining"])
+                    self.reset_at = int(headers.get("X-RateLimit-Reset", 0)) or None
+                except ValueError:
+                    pass
+            if response.status_code in (403, 429) and self._is_rate_limited(response):
+                limited = True
+                self._strikes += 1
+                retry_after = headers.get("Retry-After")
+                if retry_after and retry_after.isdigit():
+                    delay = int(retry_after)
+                elif self.remaining == 0 and self.reset_at:
+                    delay = max(0, self.reset_at - time.time())
+                else:
+                    # İkinci dərəcəli limit: gözləmə hər təkrarda ikiqat artır
+                    delay = min(MAX_BACKOFF, SECONDARY_BACKOFF * 2 ** (self._strikes - 1))
+                delay += random.uniform(0, min(10, 1 + delay * 0.1))
+                self._blocked_until = max(self._blocked_until, time.time() + delay)
+                log(f"!!! GitHub limit cavabı ({response.status_code}), {int(delay)} san. gözlənilir.")
+            elif response.status_code < 400:
+                self._strikes = 0
+        if self.on_change: self.on_change(self)
+        return limited
+
+    def _is_rate_limited(self, response):
+        if response.status_code == 429 or "Retry-After" in response.headers: return True
+        if response.headers.get("X-RateLimit-Remaining") == "0": return True
+        try:
+            return "rate limit" in response.text.lower()
+        except Exception:
+            return False
@@ -0,0 +1,176 @@
+import bisect
+import customtkinter as ctk
+
+ROW_HEIGHT = 34
+NGRAM_SIZE = 3
+
+
+class RepoSearchIndex:
+    """Depo adları və sahibləri üzərində prefiks (sıralı siyahı) və alt-sətir (triqram) indeksi."""
+
+    def __init__(self):
+        self.repos = []
+        self._texts = []
+        self._names = []
+        self._order = []
+        self._prefixes = []
+        self._ngrams = {}
+        self._last_query = None
+        self._last_result = None
+
+    def __len__(self):
+        return len(self.repos)
+
+    def clear(self):
+        self.__init__()
+
+    def add(self, repos):
+        for repo in repos:
+            repo_id = len(self.repos)
+            self.repos.append(repo)
+            name = repo['name'].lower()
+            owner = repo.get('owner', {}).get('login', '').lower()
+            full_name = repo.get('full_name', name).lower()
+            text = full_name if name in full_name else f"{full_name}\n{name}"
+            self._texts.append(text)
+            self._names.append(name)
+            self._order.append(repo_id)
+            self._prefixes.extend((token, repo_id) for token in {name, owner, full_name})
+            # "sahib/ad" mətni həm adın, həm də sahibin bütün alt-sətirlərini əhatə edir
+            for gram in {text[start:start + NGRAM_SIZE] for start in range(len(text) - NGRAM_SIZE + 1)}:
+                self._ngrams.setdefault(gram, set()).add(repo_id)
+        # Artıq sıralı hissəyə əlavə olunan paket üçün timsort praktiki olaraq xətti işləyir
+        self._order.sort(key=self._names.__getitem__)
+        self._prefixes.sort()
+        self._last_query = self._last_result = None
+
+    def _prefix_matches(self, query):
+        start = bisect.bisect_left(self._prefixes, (query,))
+        matches = set()
+        for token, repo_id in self._prefixes[start:]:
+            if not token.startswith(query): break
+            matches.add(repo_id)
+        return matches
+
+    def search(self, query):
+        """Prefiks uyğunluqları əvvəl, sonra digər alt-sətir uyğunluqları - hər biri ad sırası ilə."""
+        query = query.strip().lower()
+        if not query: return list(self._order)
+        if self._last_query and query.startswith(self._last_query):
+            # Sorğu uzadılıbsa əvvəlki nəticəni süzmək kifayətdir
+            candidates = set(self._last_result)
+        elif len(query) < NGRAM_SIZE:
+            # 1-2 simvollu sorğular üçün triqram yoxdur, bütün mətnlər yoxlanılır
+            candidates = range(len(self.repos))
+        else:
+            grams = {query[i:i + NGRAM_SIZE] for i in range(len(query) - NGRAM_SIZE + 1)}
+            sets = sorted((self._ngrams.get(gram, set()) for gram in grams), key=len)
+            candidates = set.intersection(*sets)
+        matches = {repo_id for repo_id in candidates if query in self._texts[repo_id]}
+        prefixed = self._prefix_matches(query) & matches
+        result = [repo_id for repo_id in self._order if repo_id in prefixed]
+        result += [repo_id for repo_id in self._order if repo_id in matches and repo_id not in prefixed]
+        self._last_query, self._last_result = query, result
+        return result
+
+
+class VirtualRepoList(ctk.CTkFrame):
+    """Yalnız görünən sətirlər qədər düymə yaradan, süzgəcli depo siyahısı."""
+
+    def __init__(self, master, empty_text="", **kwargs):
+        super().__init__(master, **kwargs)
+        self.index = RepoSearchIndex()
+        self.visible_ids = []
+        self.offset = 0
+        self.on_select = None
+        self.empty_text = empty_text
+        self._pool = []
+
+        self.filter_entry = ctk.CTkEntry(self, placeholder_text="Depo axtar...")
+        self.filter_entry.pack(fill="x", padx=5, pady=(5, 3))
+        self.filter_entry.bind("<KeyRelease>", lambda e: self.apply_filter())
+
+        body = ctk.CTkFrame(self, fg_color="transparent")
+        body.pack(fill="both", expand=True)
+        self.scrollbar = ctk.CTkScrollbar(body, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.rows_frame = ctk.CTkFrame(body, fg_color="transparent")
+        self.rows_frame.pack(side="left", fill="both", expand=True)
+        self.rows_frame.bind("<Configure>", self._on_configure)
+        self.empty_label = ctk.CTkLabel(self.rows_frame, text=empty_text)
+        self.empty_label.place(relx=0.5, y=20, anchor="n")
+        self._bind_wheel(self.rows_frame)
+
+    # --- Məlumat ---
+    def set_repos(self, repos):
+        self.index.clear()
+        self.add_repos(repos)
+
+    def add_repos(self, repos):
+        self.index.add(repos)
+        self.apply_filter(keep_offset=True)
+
+    def apply_filter(self, keep_offset=False):
+        self.visible_ids = self.index.search(self.filter_entry.get())
+        if not keep_offset: self.offset = 0
+        self.offset = min(self.offset, self._max_offset())
+        if self.visible_ids:
+            self.empty_label.place_forget()
+        else:
+            self.empty_label.configure(text="Uyğun depo yoxdur" if len(self.index) else self.empty_text)
+            self.empty_label.place(relx=0.5, y=20, anchor="n")
+        self._render()
+
+    # --- Sürüşdürmə ---
+    def _max_offset(self):
+        return max(0, len(self.visible_ids) - len(self._pool))
+
+    def scroll_to(self, offset):
+        offset = min(max(0, int(offset)), self._max_offset())
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.scroll_to(float(args[0]) * len(self.visible_ids))
+        elif action == "scroll":
+            self.scroll_to(self.offset + int(args[0]) * (len(self._pool) if args[1] == "pages" else 1))
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda e: self.scroll_to(self.offset + (-3 if e.delta > 0 else 3)))
+        widget.bind("<Button-4>", lambda e: self.scroll_to(self.offset - 3))
+        widget.bind("<Button-5>", lambda e: self.scroll_to(self.offset + 3))
+
+    # --- Çəkmə ---
+    def _on_configure(self, event):
+        count = max(1, event.height // ROW_HEIGHT)
+        while len(self._pool) < count:
+            position = len(self._pool)
+            button = ctk.CTkButton(self.rows_frame, text="", fg_color="transparent", border_width=1, anchor="w",
+                                   command=lambda p=position: self._on_click(p))
+            self._bind_wheel(button)
+            self._pool.append(button)
+        while len(self._pool) > count:
+            self._pool.pop().destroy()
+        self.offset = min(self.offset, self._max_offset())
+        self._render()
+
+    def _on_click(self, position):
+        index = self.offset + position
+        if self.on_select and index < len(self.visible_ids):
+            self.on_select(self.index.repos[self.visible_ids[index]])
+
+    def _render(self):
+        for position, button in enumerate(self._pool):
+            index = self.offset + position
+            if index < len(self.visible_ids):
+                button.configure(text=self.index.repos[self.visible_ids[index]]['name'])
+                button.place(x=0, y=position * ROW_HEIGHT + 3, relwidth=1)
+            else:
+                button.place_forget()
+        total = len(self.visible_ids)
+        if total <= len(self._pool):
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + len(self._pool)) / total)
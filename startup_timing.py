@@ -0,0 +1,21 @@
+import time
+from app_log import log
+
+# Modul main.py-da ilk idxal olunur, ona görə bu an başlanğıc nöqtəsi sayılır
+_START = time.perf_counter()
+marks = []
+
+
+def mark(name):
+    marks.append((name, time.perf_counter() - _START))
+
+
+def report():
+    """Başlanğıc mərhələlərinin müddətlərini loga yazır və ümumi müddəti qaytarır."""
+    previous = 0.0
+    lines = []
+    for name, elapsed in marks:
+        lines.append(f"{name}: {elapsed * 1000:.0f} ms (+{(elapsed - previous) * 1000:.0f} ms)")
+        previous = elapsed
+    log("Başlanğıc vaxtları: " + ", ".join(lines))
+    return marks[-1][1] if marks else 0.0
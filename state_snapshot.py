@@ -0,0 +1,77 @@
+import os
+import json
+import atexit
+import threading
+from app_log import log
+
+STATE_FILE = "app_state_cache.json"
+# Ardıcıl yeniləmələr (hədəf seçimi, tarixçə mənbəyi) bu müddət ərzində bir yazmaya birləşir
+FLUSH_DELAY = 1.0
+
+# Depo lüğətlərindən yalnız proqramın istifadə etdiyi sahələr saxlanılır
+REPO_FIELDS = ("name", "full_name", "clone_url", "commits_url", "private", "default_branch", "pushed_at", "updated_at")
+
+
+def compact_repo(repo):
+    compact = {field: repo.get(field) for field in REPO_FIELDS}
+    compact["owner"] = {"login": repo.get("owner", {}).get("login", "")}
+    return compact
+
+
+class StateSnapshot:
+    """Son məlum vəziyyətin (depo siyahısı, seçilmiş hədəf, tarixçə mənbəyi) yığcam diskdə surəti.
+
+    Başlanğıcda dərhal göstərilir, sonra fonda yenilənir. Yeniləmələr yaddaşa yazılır və diskə
+    gecikdirilmiş, atomik şəkildə köçürülür (bax: config_store)."""
+
+    def __init__(self, path=STATE_FILE, delay=FLUSH_DELAY):
+        self.path = path
+        self.delay = delay
+        self.data = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._timer = None
+        self._dirty = False
+        atexit.register(self.flush)
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        except (OSError, ValueError) as e:
+            log(f"!!! VƏZİYYƏT SURƏTİ OXUNMADI: {e}")
+            data = {}
+        with self._lock:
+            self.data = data
+        return data
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def update(self, **fields):
+        with self._lock:
+            self.data.update(fields)
+            self._dirty = True
+            if self._timer is not None: return
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty: return
+                text = json.dumps(self.data, ensure_ascii=False, separators=(",", ":"))
+                self._dirty = False
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(text)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                log(f"!!! VƏZİYYƏT SURƏTİ YAZILMADI: {e}")
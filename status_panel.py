@@ -0,0 +1,55 @@
+import customtkinter as ctk
+from tkinter import ttk
+from worktree_status import STATUS_ORDER, STATUS_CONFLICT, STATUS_ADDED, STATUS_DELETED, STATUS_UNTRACKED
+
+# Treeview minlərlə sətirdə ləngiyir; qalan fayllar yalnız xülasədə sayılır
+MAX_ROWS = 5000
+
+
+class WorktreeStatusPanel(ctk.CTkFrame):
+    """Mənbə anbarındakı commit olunmamış dəyişikliklər. Sətirlər fərqə görə yerində əlavə/silinir."""
+
+    def __init__(self, master, height=6, **kwargs):
+        super().__init__(master, **kwargs)
+        self.grid_columnconfigure(0, weight=1)
+        self.summary_label = ctk.CTkLabel(self, text="İşçi qovluq: anbar seçilməyib", anchor="w", text_color="gray")
+        self.summary_label.grid(row=0, column=0, columnspan=2, sticky="ew", padx=10, pady=(5, 0))
+        self.tree = ttk.Treeview(self, columns=("status", "path"), show="headings", selectmode="browse", height=height)
+        self.tree.heading("status", text="Vəziyyət")
+        self.tree.heading("path", text="Fayl")
+        self.tree.column("status", width=110, stretch=False)
+        self.tree.column("path", width=500, stretch=True)
+        self.tree.grid(row=1, column=0, sticky="nsew", padx=(10, 0), pady=(5, 10))
+        scrollbar = ctk.CTkScrollbar(self, command=self.tree.yview)
+        scrollbar.grid(row=1, column=1, sticky="ns", padx=(0, 10), pady=(5, 10))
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.tag_configure(STATUS_CONFLICT, foreground="tomato")
+        self.tree.tag_configure(STATUS_ADDED, foreground="lightgreen")
+        self.tree.tag_configure(STATUS_DELETED, foreground="orange")
+        self.tree.tag_configure(STATUS_UNTRACKED, foreground="gray")
+        self._shown = set()
+
+    def clear(self, text="İşçi qovluq: anbar seçilməyib"):
+        self.tree.delete(*self._shown)
+        self._shown.clear()
+        self.summary_label.configure(text=text, text_color="gray")
+
+    def apply(self, changes, counts):
+        """`changes`: {yol: kateqoriya və ya None}; yalnız dəyişən sətirlərə toxunulur."""
+        for path, category in changes.items():
+            if category is None:
+                if path in self._shown:
+                    self.tree.delete(path)
+                    self._shown.discard(path)
+            elif path in self._shown:
+                self.tree.item(path, values=(category, path), tags=(category,))
+            elif len(self._shown) < MAX_ROWS:
+                self.tree.insert("", "end", iid=path, values=(category, path), tags=(category,))
+                self._shown.add(path)
+        total = sum(counts.values())
+        if not total:
+            self.summary_label.configure(text="İşçi qovluq təmizdir - commit olunmamış dəyişiklik yoxdur.", text_color="lightgreen")
+            return
+        parts = [f"{counts[category]} {category.lower()}" for category in STATUS_ORDER if counts.get(category)]
+        hidden = f" (ilk {MAX_ROWS} göstərilir)" if total > len(self._shown) else ""
+        self.summary_label.configure(text=f"Commit olunmamış dəyişikliklər: {', '.join(parts)}{hidden}", text_color="white")
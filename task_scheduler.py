@@ -0,0 +1,159 @@
+import time
+import heapq
+import itertools
+import threading
+from app_log import log
+from instrumentation import span
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+
+class Task:
+    def __init__(self, func, args, kwargs, key, priority, seq):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        self.priority = priority
+        self.seq = seq
+        self.created = time.perf_counter()
+        self._cancelled = threading.Event()
+
+    @property
+    def name(self):
+        return getattr(self.func, "__name__", repr(self.func))
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+
+class TaskScheduler:
+    """Məhdud sayda işçi thread-i olan prioritetli növbə.
+
+    Eyni açarlı yeni tapşırıq köhnəsini əvəz edir: növbədəki köhnə tapşırıq heç başlamır,
+    icra olunan isə ləğv işarəsi alır (`replace=False` ilə - məs. git yazmaları - heç biri ləğv olunmur,
+    tapşırıqlar göndərilmə sırası ilə növbəyə düzülür). Eyni açarlı iki tapşırıq heç vaxt paralel işləmir."""
+
+    def __init__(self, max_workers=4, on_queue_change=None):
+        self.max_workers = max_workers
+        self.on_queue_change = on_queue_change
+        self._heap = []
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._latest_by_key = {}
+        self._running_keys = set()
+        self._deferred = {}
+        self._running = 0
+        self._workers = []
+        self._local = threading.local()
+        self._shutdown = False
+
+    def submit(self, func, *args, key=None, priority=PRIORITY_INTERACTIVE, replace=True, **kwargs):
+        with self._cond:
+            task = Task(func, args, kwargs, key, priority, next(self._seq))
+            if key is not None:
+                previous = self._latest_by_key.get(key)
+                if previous is not None and replace:
+                    log(f"'{previous.name}' tapşırığı yenisi ilə əvəz olunur (açar: {key}).")
+                    previous.cancel()
+                self._latest_by_key[key] = task
+            heapq.heappush(self._heap, (priority, task.seq, task))
+            if len(self._workers) < min(self.max_workers, self._running + len(self._heap)):
+                worker = threading.Thread(target=self._worker_loop, name=f"task-worker-{len(self._workers)}", daemon=True)
+                self._workers.append(worker)
+                worker.start()
+            self._cond.notify()
+        self._notify_queue_change()
+        return task
+
+    def current_task(self):
+        return getattr(self._local, "task", None)
+
+    def is_cancelled(self):
+        """Cari thread-dəki tapşırıq daha yeni tapşırıqla əvəz olunubsa True qaytarır."""
+        task = self.current_task()
+        return task is not None and task.is_cancelled()
+
+    def is_pending(self, key):
+        """Bu açarlı tapşırıq növbədə gözləyirsə və ya icra olunursa True."""
+        with self._cond:
+            return key in self._latest_by_key or key in self._running_keys
+
+    def queue_depth(self):
+        with self._cond:
+            waiting = sum(1 for _, _, task in self._heap if not task.is_cancelled())
+            waiting += sum(1 for tasks in self._deferred.values() for task in tasks if not task.is_cancelled())
+            return waiting, self._running
+
+    def shutdown(self):
+        with self._cond:
+            self._shutdown = True
+            for _, _, task in self._heap: task.cancel()
+            self._cond.notify_all()
+
+    def _next_task(self):
+        with self._cond:
+            while True:
+                if self._shutdown: return None
+                while self._heap:
+                    _, _, task = heapq.heappop(self._heap)
+                    if task.is_cancelled():
+                        self._forget(task)
+                        continue
+                    if task.key is not None and task.key in self._running_keys:
+                        # Köhnə tapşırıq bitənə qədər gözləyir, sonra yenidən növbəyə qayıdır (gəlmə sırası ilə)
+                        self._deferred.setdefault(task.key, []).append(task)
+                        continue
+                    if task.key is not None: self._running_keys.add(task.key)
+                    self._running += 1
+                    return task
+                self._cond.wait()
+
+    def _forget(self, task):
+        if task.key is not None and self._latest_by_key.get(task.key) is task:
+            del self._latest_by_key[task.key]
+
+    def _finish(self, task):
+        with self._cond:
+            self._running -= 1
+            self._forget(task)
+            if task.key is not None:
+                self._running_keys.discard(task.key)
+                waiting = self._deferred.pop(task.key, [])
+                # Gözləyərkən əvəz olunmuş tapşırıqlar atılır; qalanlardan yalnız birincisi növbəyə qayıdır
+                for deferred in waiting:
+                    if deferred.is_cancelled(): self._forget(deferred)
+                waiting = [deferred for deferred in waiting if not deferred.is_cancelled()]
+                if waiting:
+                    deferred = waiting.pop(0)
+                    if waiting: self._deferred[task.key] = waiting
+                    heapq.heappush(self._heap, (deferred.priority, deferred.seq, deferred))
+                    self._cond.notify()
+        self._notify_queue_change()
+
+    def _worker_loop(self):
+        while True:
+            task = self._next_task()
+            if task is None: return
+            self._notify_queue_change()
+            self._local.task = task
+            log(f"Tapşırıq başladı: '{task.name}'.")
+            try:
+                wait_ms = f"{(time.perf_counter() - task.created) * 1000:.0f}"
+                with span("task", task.name, key=task.key, priority=task.priority, wait_ms=wait_ms):
+                    task.func(*task.args, **task.kwargs)
+                log(f"Tapşırıq tamamlandı: '{task.name}'.")
+            except Exception as e:
+                log(f"!!! TAPŞIRIQ XƏTASI '{task.name}': {e}")
+            finally:
+                self._local.task = None
+                self._finish(task)
+
+    def _notify_queue_change(self):
+        if self.on_queue_change:
+            waiting, running = self.queue_depth()
+            self.on_queue_change(waiting, running)
@@ -0,0 +1,88 @@
+import time
+import itertools
+import threading
+from collections import OrderedDict
+import logging
+from app_log import log
+from instrumentation import SPANS
+
+PUMP_INTERVAL_MS = 20
+FRAME_BUDGET_MS = 12
+
+
+def concat_merge(replace_func, compatible=None):
+    """Əvəzetmə/əlavə cütləri üçün birləşdirici.
+
+    Yeni əvəzetmə gözləyən hər şeyi silir; əlavə isə gözləyən yeniləmənin siyahısına
+    (birinci arqument) qoşulur, qalan arqumentlər yenisindən götürülür."""
+    def merge(old, new):
+        (old_func, old_args), (new_func, new_args) = old, new
+        if new_func == replace_func: return new
+        if compatible and not compatible(old_args, new_args): return new
+        return old_func, (list(old_args[0]) + list(new_args[0]),) + tuple(new_args[1:])
+    return merge
+
+
+class UIUpdatePump:
+    """İşçi thread-lərin UI yeniləmələrini bir növbədə toplayır və tək, dövri `after` ilə tətbiq edir.
+
+    Eyni açarlı yeniləmələr birləşdirilir (məs. status sətrinin yalnız son mətni qalır),
+    hər dövrədə isə yalnız bir kadr büdcəsi qədər iş görülür."""
+
+    def __init__(self, widget, interval_ms=PUMP_INTERVAL_MS, frame_budget_ms=FRAME_BUDGET_MS):
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self.frame_budget = frame_budget_ms / 1000
+        self._pending = OrderedDict()
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._running = False
+
+    def start(self):
+        if not self._running:
+            self._running = True
+            self.widget.after(self.interval_ms, self._drain)
+
+    def stop(self):
+        self._running = False
+
+    def post(self, func, *args, key=None, merge=None):
+        """Yeniləməni növbəyə qoyur; istənilən thread-dən çağırıla bilər."""
+        with self._lock:
+            if key is None:
+                self._pending[("_", next(self._seq))] = (func, args)
+                return
+            entry = (func, args)
+            previous = self._pending.pop(key, None)
+            if previous is not None and merge is not None:
+                entry = merge(previous, entry)
+            # Birləşdirilmiş yeniləmə növbənin sonuna keçir ki, digər yeniləmələrlə sırası pozulmasın
+            self._pending[key] = entry
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def _drain(self):
+        if not self._running: return
+        deadline = time.perf_counter() + self.frame_budget
+        while time.perf_counter() < deadline:
+            with self._lock:
+                if not self._pending: break
+                _, (func, args) = self._pending.popitem(last=False)
+            name = getattr(func, '__name__', repr(func))
+            started = time.perf_counter()
+            try:
+                func(*args)
+            except Exception as e:
+                log(f"!!! UI YENİLƏMƏ XƏTASI '{name}': {e}")
+            # UI yeniləmələri çox olduğu üçün yalnız kadr büdcəsini aşanlar jurnala yazılır
+            elapsed = time.perf_counter() - started
+            SPANS.record("ui", name, elapsed, {})
+            if elapsed > self.frame_budget:
+                log(f"span ui {name}", level=logging.DEBUG, ms=f"{elapsed * 1000:.1f}", slow=True)
+        try:
+            if self.widget.winfo_exists():
+                self.widget.after(self.interval_ms, self._drain)
+        except Exception:
+            self._running = False
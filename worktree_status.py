@@ -0,0 +1,118 @@
+import os
+import sys
+import threading
+from instrumentation import span
+
+STATUS_MODIFIED = "Dəyişdirilib"
+STATUS_ADDED = "Əlavə edilib"
+STATUS_DELETED = "Silinib"
+STATUS_UNTRACKED = "İzlənməyən"
+STATUS_CONFLICT = "Konflikt"
+STATUS_ORDER = (STATUS_CONFLICT, STATUS_MODIFIED, STATUS_ADDED, STATUS_DELETED, STATUS_UNTRACKED)
+
+# Bundan çox yol dəyişibsə, yolbayol yoxlama əvəzinə tam `git status` daha ucuzdur
+INCREMENTAL_LIMIT = 2000
+PATHS_PER_CALL = 500
+# Untracked-cache izlənməyən qovluqların təkrar oxunmasının qarşısını alır; daxili fsmonitor
+# demonu isə yalnız Windows və macOS-da mövcuddur (başqa sistemlərdə açılmır)
+STATUS_CONFIG = ["-c", "core.untrackedCache=true"]
+if sys.platform in ("win32", "darwin"): STATUS_CONFIG += ["-c", "core.fsmonitor=true"]
+STATUS_ARGS = ["status", "--porcelain=v1", "-z", "--untracked-files=all", "--no-renames"]
+
+_CONFLICT_CODES = {"DD", "AU", "UD", "UA", "DU", "AA", "UU"}
+
+
+def status_category(code):
+    """`git status --porcelain` XY kodunu panel kateqoriyasına çevirir."""
+    if code == "??": return STATUS_UNTRACKED
+    if code in _CONFLICT_CODES: return STATUS_CONFLICT
+    if "D" in code: return STATUS_DELETED
+    if code[0] in "ACR": return STATUS_ADDED
+    return STATUS_MODIFIED
+
+
+def parse_porcelain(output):
+    """`--porcelain=v1 -z` çıxışını {yol: kateqoriya} lüğətinə çevirir."""
+    entries = {}
+    tokens = iter(output.split("\0"))
+    for token in tokens:
+        if len(token) < 4: continue
+        code, path = token[:2], token[3:]
+        # Ad dəyişmə/kopyalamada növbəti element köhnə yoldur
+        if code[0] in "RC": next(tokens, None)
+        entries[path] = status_category(code)
+    return entries
+
+
+def _in_dirs(path, dirs):
+    """`path` verilmiş qovluqlardan birinin altındadırmı (ata qovluqlar bir-bir yoxlanılır)."""
+    index = path.rfind("/")
+    while index > 0:
+        path = path[:index]
+        if path in dirs: return True
+        index = path.rfind("/")
+    return False
+
+
+class WorktreeStatus:
+    """İşçi ağacın vəziyyəti: bir dəfə tam hesablanır, sonra yalnız dəyişmiş yollar üçün yenilənir.
+
+    Hər yeniləmə əvvəlki vəziyyətə görə fərqi qaytarır: {yol: kateqoriya və ya None (artıq təmizdir)}."""
+
+    def __init__(self, repo):
+        self.repo = repo
+        self.root = os.path.abspath(repo.working_tree_dir)
+        self.entries = {}
+        self._lock = threading.Lock()
+
+    def _run_status(self, paths=None):
+        command = [self.repo.git.GIT_PYTHON_GIT_EXECUTABLE] + STATUS_CONFIG + STATUS_ARGS
+        if paths is None:
+            return parse_porcelain(self.repo.git.execute(command, strip_newline_in_stdout=False))
+        entries = {}
+        for start in range(0, len(paths), PATHS_PER_CALL):
+            chunk = paths[start:start + PATHS_PER_CALL]
+            output = self.repo.git.execute(command + ["--"] + chunk, env={"GIT_LITERAL_PATHSPECS": "1"},
+                                           strip_newline_in_stdout=False)
+            entries.update(parse_porcelain(output))
+        return entries
+
+    def refresh(self):
+        """Tam `git status`; fərqi qaytarır."""
+        with self._lock, span("git", "status", full=True) as fields:
+            entries = self._run_status()
+            changes = {path: None for path in self.entries if path not in entries}
+            changes.update((path, category) for path, category in entries.items() if self.entries.get(path) != category)
+            self.entries = entries
+            fields.update(entries=len(entries), changes=len(changes))
+        return changes
+
+    def refresh_paths(self, paths):
+        """Yalnız verilmiş yolları (və qovluqdursa, altındakıları) yenidən yoxlayır; fərqi qaytarır."""
+        paths = sorted({path.replace(os.sep, "/") for path in paths})
+        if not paths: return {}
+        if len(paths) > INCREMENTAL_LIMIT: return self.refresh()
+        with self._lock, span("git", "status", paths=len(paths)) as fields:
+            fresh = self._run_status(paths)
+            changes = {}
+            # Fayl olmayan yollar (qovluqlar və silinmişlər) üçün altındakı köhnə qeydlər də yoxlanılır
+            dirs = {path for path in paths if not os.path.isfile(os.path.join(self.root, path))}
+            stale = {path for path in paths if path in self.entries}
+            if dirs: stale.update(path for path in self.entries if _in_dirs(path, dirs))
+            for path in stale:
+                if path not in fresh:
+                    del self.entries[path]
+                    changes[path] = None
+            for path, category in fresh.items():
+                if self.entries.get(path) != category:
+                    self.entries[path] = category
+                    changes[path] = category
+            fields.update(changes=len(changes))
+        return changes
+
+    def counts(self):
+        with self._lock:
+            counts = dict.fromkeys(STATUS_ORDER, 0)
+            for category in self.entries.values():
+                counts[category] += 1
+        return counts